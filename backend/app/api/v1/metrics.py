@@ -1,6 +1,7 @@
 """Metrics API endpoints for monitoring and observability"""
 from fastapi import APIRouter
-from app.core.metrics import metrics_collector
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import metrics_collector, OPENMETRICS_CONTENT_TYPE
 from typing import Dict, Any, List
 
 router = APIRouter()
@@ -19,6 +20,22 @@ async def get_metrics() -> Dict[str, Any]:
     return metrics_collector.get_summary()
 
 
+@router.get("/metrics/openmetrics", response_class=PlainTextResponse)
+async def get_openmetrics() -> PlainTextResponse:
+    """
+    Get metrics in OpenMetrics (Prometheus) text format
+
+    Exposes:
+    - HTTP request counters and latency histograms per route template
+    - OpenAI call counters and latency histograms per operation and model
+    - Token and cost counters, daily/monthly cost gauges
+    - Circuit breaker state and resource limiter queue depth
+
+    Quantiles are computed by the scraper (e.g. histogram_quantile in PromQL).
+    """
+    return PlainTextResponse(metrics_collector.render_openmetrics(), media_type=OPENMETRICS_CONTENT_TYPE)
+
+
 @router.get("/metrics/errors")
 async def get_recent_errors(limit: int = 10) -> List[Dict[str, Any]]:
     """
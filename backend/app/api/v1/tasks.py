@@ -2,10 +2,14 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request
 from pydantic import BaseModel
 from pydantic import BaseModel
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, List
+import asyncio
+import json
 import os
+import time
 import shutil
 import uuid
 
@@ -22,11 +26,17 @@ from app.schemas.estimate import EstimateResponse
 from app.schemas.task import TaskResultResponse
 from app.schemas.qa_pair import QAPairRequest
 from app.services.task_service import TaskService
+from app.models.task import TaskStatus
 from app.services.question_service import QuestionService
 from app.utils.reasoning_separator import auto_separate_reasoning
 from app.services.input_service import InputService
 from app.services.chat_service import ChatService
 from app.services.safety_service import SafetyService
+from app.services.job_queue import job_queue
+from app.services.storage_service import file_storage, UploadTooLargeError
+from app.services.proposal_store import proposal_store
+from app.services.question_prefetch import question_prefetcher
+from app.services.task_event_service import TaskEventService, TERMINAL_EVENTS
 from app.core.config import settings
 from app.schemas.chat import ChatRequest, ChatResponse
 from app.core.i18n import get_i18n, t
@@ -36,6 +46,7 @@ router = APIRouter()
 
 @router.post("/tasks", response_model=TaskResponse)
 async def create_task(
+    request: Request,
     file: Optional[UploadFile] = File(None),
     deliverables_json: Optional[str] = Form(None),
     system_requirements: Optional[str] = Form(None),
@@ -57,50 +68,42 @@ async def create_task(
 
     # ファイルアップロードの場合
     if file:
-        file_size = 0
-        chunk_size = 1024 * 1024  # 1MB
-        temp_file = f"{settings.UPLOAD_DIR}/temp_{file.filename}"
+        # ファイル形式チェック
+        if file.filename.endswith(".csv"):
+            # CSV処理
+            print(f"[API] CSV file uploaded: {file.filename}")
+        elif file.filename.endswith((".xlsx", ".xls")):
+            # Excel処理
+            print(f"[API] Excel file uploaded: {file.filename}")
+        else:
+            raise HTTPException(
+                status_code=400, detail=t('messages.invalid_file_type')
+            )
+
+        try:
+            # SHA-256で内容アドレス化して保存（同一内容のアップロードは1ファイルを共有）
+            upload_path = await file_storage.save_upload(file, settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024)
+        except UploadTooLargeError:
+            raise HTTPException(
+                status_code=413,
+                detail=f"ファイルサイズが{settings.MAX_UPLOAD_SIZE_MB}MBを超えています",
+            )
 
         try:
-            with open(temp_file, "wb") as buffer:
-                while chunk := await file.read(chunk_size):
-                    file_size += len(chunk)
-                    if file_size > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
-                        os.remove(temp_file)
-                        raise HTTPException(
-                            status_code=413,
-                            detail=f"ファイルサイズが{settings.MAX_UPLOAD_SIZE_MB}MBを超えています",
-                        )
-                    buffer.write(chunk)
-
-            # ファイル形式チェック
-            if file.filename.endswith(".csv"):
-                # CSV処理
-                print(f"[API] CSV file uploaded: {file.filename}")
-                pass  # CSVとして処理（後続でInputServiceが判断）
-            elif file.filename.endswith((".xlsx", ".xls")):
-                # Excel処理
-                print(f"[API] Excel file uploaded: {file.filename}")
-                pass  # Excelとして処理（後続でInputServiceが判断）
-            else:
-                os.remove(temp_file)
-                raise HTTPException(
-                    status_code=400, detail=t('messages.invalid_file_type')
-                )
-
-            # タスク作成
+            # タスク作成（create_taskでInputServiceが解析）
             task_service = TaskService(db)
-            task = task_service.create_task(temp_file, system_requirements)
+            task = task_service.create_task(upload_path, system_requirements)
+            _prefetch_questions(task_service, task, getattr(request.state, 'request_id', None))
 
             return task
 
         except Exception as e:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            _release_upload(db, upload_path)
             raise HTTPException(status_code=500, detail=str(e))
 
     # Webフォームの場合
     elif deliverables_json:
+        upload_path = None
         try:
             # JSONをパース
             deliverables_data = json.loads(deliverables_json)
@@ -108,26 +111,31 @@ async def create_task(
 
             # 一時的なExcelファイルを作成（既存のフローを流用）
             import pandas as pd
-            from datetime import datetime
 
             # DataFrameを作成
             df = pd.DataFrame(deliverables_data)
 
-            # 一時Excelファイルに保存
-            temp_file = f"{settings.UPLOAD_DIR}/temp_webform_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
+            # 一時Excelファイルに書き込んでからストレージに保存
+            temp_file = file_storage.temp_path(".xlsx")
             df.to_excel(temp_file, index=False, header=[t('excel.column_deliverable_name'), t('excel.column_description')], engine='openpyxl')
+            upload_path = file_storage.store_file(temp_file)
 
-            # タスク作成
+            # タスク作成（送信された成果物をそのまま保存し、一時ファイルは解析しない）
             task_service = TaskService(db)
-            task = task_service.create_task(temp_file, system_requirements)
+            task = task_service.create_task(
+                upload_path, system_requirements,
+                deliverables=InputService.parse_deliverables_json(deliverables_data),
+            )
+            _prefetch_questions(task_service, task, getattr(request.state, 'request_id', None))
 
             return task
 
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail=t('messages.json_parse_failed'))
         except Exception as e:
-            if 'temp_file' in locals() and os.path.exists(temp_file):
-                os.remove(temp_file)
+            if 'temp_file' in locals():
+                file_storage.discard(temp_file)
+            _release_upload(db, upload_path)
             raise HTTPException(status_code=500, detail=str(e))
 
     else:
@@ -137,11 +145,37 @@ async def create_task(
         )
 
 
+def _release_upload(db: Session, upload_path: Optional[str]) -> None:
+    """タスク作成に失敗したアップロードの blob を解放する
+
+    他のタスクが参照中、または直近に重複排除で再利用された blob は残す
+    （猶予期間内のものは sweep_blobs が後で回収する）。
+    """
+    if not upload_path:
+        return
+    try:
+        db.rollback()  # 失敗したトランザクションのままでは参照確認のクエリを実行できない
+        file_storage.release_blob(db, upload_path)
+    except Exception as e:
+        logger.warning("Failed to release upload blob", file_path=upload_path, error=str(e))
+
+
+def _prefetch_questions(task_service: TaskService, task, request_id: Optional[str] = None) -> None:
+    """質問の先行生成を開始（QUESTION_PREFETCH_ENABLED時、確認画面の間に生成しておく）"""
+    if not settings.QUESTION_PREFETCH_ENABLED:
+        return
+    question_prefetcher.start(
+        task.id, task_service.get_deliverables(task.id), task.system_requirements or "", request_id
+    )
+
+
 @router.get("/tasks/{task_id}/questions", response_model=List[str])
 async def get_questions(task_id: str, request: Request, db: Session = Depends(get_db)):
     """
     タスクに対する質問を生成
 
+    タスク作成時に先行生成した質問があればそれを返し、生成中なら完了を待つ。
+
     - **task_id**: タスクID
     """
     request_id = getattr(request.state, 'request_id', None)
@@ -152,17 +186,19 @@ async def get_questions(task_id: str, request: Request, db: Session = Depends(ge
         raise HTTPException(status_code=404, detail="タスクが見つかりません")
 
     try:
+        # タスク作成時に先行生成した質問があればそれを返す（生成中なら完了を待つ）
+        questions = await question_prefetcher.get_questions(task_service, task_id)
+        if questions:
+            logger.info("Returning prefetched questions", request_id=request_id, task_id=task_id, question_count=len(questions))
+            return questions
+
         logger.info("Starting question generation", request_id=request_id, task_id=task_id)
-        # ファイルから成果物読み込み (Excel/CSV auto-detect)
-        input_service = InputService()
-        if task.excel_file_path.endswith('.csv'):
-            deliverables = input_service.load_csv_data(task.excel_file_path)
-        else:
-            deliverables = input_service.load_excel_data(task.excel_file_path)
+        # タスク作成時に保存した成果物を使う
+        deliverables = task_service.get_deliverables(task_id)
 
         # 質問生成
         question_service = QuestionService()
-        questions = question_service.generate_questions(
+        questions = await question_service.generate_questions_async(
             deliverables, task.system_requirements or "", request_id
         )
 
@@ -181,6 +217,10 @@ async def submit_answers(
     """
     質問への回答を登録してタスク処理を開始
 
+    ワーカープールが起動していればジョブをキューに登録して202を即時返す。
+    ワーカーがいないプロセス（TASK_WORKERS=0 など）ではその場で処理する。
+    同じタスクのジョブが待機中・処理中なら新しいジョブは作らず、そのジョブIDを202で返す。
+
     - **task_id**: タスクID
     - **qa_pairs**: 質問と回答のペアリスト
     """
@@ -193,9 +233,9 @@ async def submit_answers(
 
     # Safety check for all answers
     safety_service = SafetyService()
-    for i, qa in enumerate(qa_pairs):
-        if qa.answer:
-            safety_service.validate_and_reject(qa.answer, f"answer_{i+1}")
+    safety_service.validate_many_and_reject({
+        f"answer_{i+1}": qa.answer for i, qa in enumerate(qa_pairs) if qa.answer
+    })
 
     try:
         logger.info("Starting answer submission", request_id=request_id, task_id=task_id, qa_count=len(qa_pairs))
@@ -204,12 +244,29 @@ async def submit_answers(
         answers = [qa.answer for qa in qa_pairs]
         task_service.save_qa_pairs(task_id, questions, answers)
 
-        # タスク処理を実行
-        task_service.process_task(task_id, request_id)
+        # タスク処理をジョブとして登録
+        job = job_queue.enqueue(db, task_id, request_id)
+        response_body = {"message": t('messages.task_processing_started'), "task_id": task_id, "job_id": job.id}
+
+        if job_queue.is_running:
+            logger.info("Answer submission queued", request_id=request_id, task_id=task_id, job_id=job.id)
+            return JSONResponse(status_code=202, content=response_body)
+
+        # ワーカー未起動: イベントループを塞がないようスレッドで処理
+        status = await run_in_threadpool(job_queue.run_job, job.id, db)
+        if status is None:
+            # 同じタスクのジョブを別のリクエストが処理中（二重送信・リトライ）
+            logger.info("Answer submission joined running job", request_id=request_id, task_id=task_id, job_id=job.id)
+            return JSONResponse(status_code=202, content=response_body)
+        if status == TaskStatus.FAILED.value:
+            db.refresh(job)
+            raise HTTPException(status_code=500, detail=job.error_message)
         logger.info("Answer submission completed", request_id=request_id, task_id=task_id)
 
-        return {"message": t('messages.task_processing_started'), "task_id": task_id}
+        return response_body
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Answer submission failed", request_id=request_id, task_id=task_id, error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -231,6 +288,83 @@ async def get_task_status(task_id: str, db: Session = Depends(get_db)):
     return task
 
 
+@router.get("/tasks/{task_id}/events")
+async def stream_task_events(task_id: str, request: Request, db: Session = Depends(get_db)):
+    """
+    見積り進捗をServer-Sent Eventsで配信
+
+    - status: 処理開始（total=成果物数）
+    - estimate: 成果物ごとの見積り確定（index, estimate, completed/total, 累計 totals）
+    - completed: 合計と download_url。ここでストリーム終了
+    - failed: error_message。ここでストリーム終了
+
+    切断後は Last-Event-ID ヘッダで続きから再開できる。
+
+    - **task_id**: タスクID
+    """
+    task_service = TaskService(db)
+    if not task_service.get_task(task_id):
+        raise HTTPException(status_code=404, detail="タスクが見つかりません")
+
+    try:
+        last_id = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        last_id = 0
+
+    events = TaskEventService(db)
+
+    def poll(after_id: int):
+        """タスク状態と新着イベントを読む（同期DBアクセスのためスレッドプールで実行）"""
+        db.expire_all()
+        # 終了イベントはステータス更新と同時にコミットされるので、
+        # 先にステータスを読めば終了済みの場合は必ず終了イベントも読める
+        task = task_service.get_task(task_id)
+        state = (task.status, task.error_message) if task else None
+        rows = [(e.id, e.event_type, e.data) for e in events.get_events(task_id, after_id=after_id)]
+        return state, rows
+
+    async def event_stream():
+        nonlocal last_id
+        last_sent = time.monotonic()
+
+        # get_db のセッションはレスポンス送信前に閉じられるため、ストリーム終了時に改めて閉じる
+        try:
+            while True:
+                # 同期クエリでイベントループ（他のリクエスト）を止めない
+                state, rows = await run_in_threadpool(poll, last_id)
+                for event_id, event_type, data in rows:
+                    last_id = event_id
+                    last_sent = time.monotonic()
+                    yield f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+                    if event_type in TERMINAL_EVENTS:
+                        return
+
+                # 終了イベントがないまま終了済み（機能追加前のタスク等）なら状態だけ返して終了
+                if state is None or state[0] in (TaskStatus.COMPLETED.value, TaskStatus.FAILED.value):
+                    status, error_message = state or (TaskStatus.FAILED.value, None)
+                    data = json.dumps({"status": status, "error_message": error_message}, ensure_ascii=False)
+                    yield f"event: {status}\ndata: {data}\n\n"
+                    return
+
+                if await request.is_disconnected():
+                    return
+
+                # プロキシのアイドル切断対策のコメント行
+                if time.monotonic() - last_sent >= settings.SSE_KEEPALIVE_SECONDS:
+                    last_sent = time.monotonic()
+                    yield ": keep-alive\n\n"
+
+                await asyncio.sleep(settings.SSE_POLL_INTERVAL)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/tasks/{task_id}/result", response_model=TaskResultResponse)
 async def get_task_result(task_id: str, db: Session = Depends(get_db)):
     """
@@ -403,7 +537,11 @@ async def chat_adjust(task_id: str, req: ChatRequest, db: Session = Depends(get_
         pass
 
     svc = ChatService(db)
-    result = svc.process(task_id, req.message, req.intent, req.params, provided_estimates=req.estimates)
+    # ChatService.process は同期処理のため、イベントループを塞がないようスレッドプールで実行
+    # （AsyncOpenAI の経路は見積り・質問生成のみ。チャットは対象外で同期クライアントのまま）
+    result = await run_in_threadpool(
+        svc.process, task_id, req.message, req.intent, req.params, provided_estimates=req.estimates
+    )
     # 整形
     estimates = result.get("estimates") or []
     resp_items = []
@@ -451,6 +589,7 @@ async def chat_adjust(task_id: str, req: ChatRequest, db: Session = Depends(get_
         estimates=resp_items,
         totals=result.get("totals"),
         version=result.get("version"),
+        resolution=result.get("resolution"),
     )
     try:
         print(f"[API] /chat done task_id={task_id} ests={len(resp_items)} subtotal={int(result.get('totals',{}).get('subtotal',0))}")
@@ -509,7 +648,7 @@ async def apply_adjusted_estimates(task_id: str, req: ApplyRequest, db: Session
     from app.services.export_service import ExportService
     exporter = ExportService()
     result_file_path = exporter.write_excel_output(
-        task.excel_file_path,
+        task_service.get_deliverables(task_id),
         [
             {
                 'name': x.get('deliverable_name'),
@@ -521,9 +660,12 @@ async def apply_adjusted_estimates(task_id: str, req: ApplyRequest, db: Session
         ],
         totals,
         qa_pairs,
-        settings.UPLOAD_DIR,
+        file_storage.task_dir(task_id),
     )
 
+    # 前回の結果ファイルは不要になるので削除
+    if task.result_file_path != result_file_path:
+        file_storage.discard(task.result_file_path)
     task.result_file_path = result_file_path
     db.commit()
 
@@ -591,8 +733,11 @@ async def delete_task(task_id: str, db: Session = Depends(get_db)):
     from app.models.task import Task
     from app.models.deliverable import Deliverable
     from app.models.qa_pair import QAPair
+    from app.models.task_question import TaskQuestion
     from app.models.estimate import Estimate
     from app.models.message import Message
+    from app.models.job import Job
+    from app.models.task_event import TaskEvent
 
     # Check if task exists
     task = db.query(Task).filter(Task.id == task_id).first()
@@ -603,28 +748,21 @@ async def delete_task(task_id: str, db: Session = Depends(get_db)):
     # Delete related data (cascade deletion)
     db.query(Deliverable).filter(Deliverable.task_id == task_id).delete()
     db.query(QAPair).filter(QAPair.task_id == task_id).delete()
+    db.query(TaskQuestion).filter(TaskQuestion.task_id == task_id).delete()
     db.query(Estimate).filter(Estimate.task_id == task_id).delete()
     db.query(Message).filter(Message.task_id == task_id).delete()
-
-    # Delete files (if exist)
-    if task.excel_file_path and os.path.exists(task.excel_file_path):
-        try:
-            os.remove(task.excel_file_path)
-            logger.info(f"Deleted file: {task.excel_file_path}", task_id=task_id)
-        except Exception as e:
-            logger.warning(f"Failed to delete file: {task.excel_file_path}", task_id=task_id, error=str(e))
-
-    if task.result_file_path and os.path.exists(task.result_file_path):
-        try:
-            os.remove(task.result_file_path)
-            logger.info(f"Deleted file: {task.result_file_path}", task_id=task_id)
-        except Exception as e:
-            logger.warning(f"Failed to delete file: {task.result_file_path}", task_id=task_id, error=str(e))
+    db.query(Job).filter(Job.task_id == task_id).delete()
+    db.query(TaskEvent).filter(TaskEvent.task_id == task_id).delete()
 
     # Delete task
+    upload_path, result_file_path = task.excel_file_path, task.result_file_path
     db.delete(task)
     db.commit()
 
+    # Delete files after commit (result directory, and the upload blob unless another task shares it)
+    file_storage.remove_task_files(db, task_id, upload_path, result_file_path)
+    proposal_store.delete_task(task_id)
+
     logger.info(f"Task and all related data deleted (GDPR compliance)", task_id=task_id)
 
     return {"message": t('messages.task_deleted_successfully'), "task_id": task_id}
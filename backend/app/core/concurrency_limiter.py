@@ -0,0 +1,179 @@
+"""Adaptive concurrency limiter
+
+A fixed concurrency cap is wrong in both directions: too low when OpenAI
+answers quickly, too high when it slows down and requests pile up. This
+limiter adjusts its limit from observed latency with AIMD:
+
+- a long-term EWMA of latency is the baseline ("no-load" latency)
+- a request slower than ``tolerance`` x baseline, or one that failed or
+  timed out, multiplies the limit by ``backoff`` (multiplicative decrease)
+- otherwise the limit grows by 1/limit per request, i.e. about one slot per
+  limit's worth of completed requests (additive increase)
+
+The limit only grows while it is actually being used, so an idle service
+does not drift to max_limit.
+
+Intended for a single event loop (one per worker process).
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Async concurrency limiter with a latency-driven limit
+
+    Attributes:
+        limit: Current (fractional) concurrency limit
+        inflight: Requests currently holding a slot
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 5,
+        min_limit: int = 1,
+        max_limit: int = 50,
+        tolerance: float = 2.0,
+        long_window: int = 600,
+        backoff: float = 0.9,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            initial_limit: Starting concurrency limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            tolerance: Latency growth over the baseline tolerated before shrinking
+            long_window: Samples averaged into the baseline latency
+            backoff: Factor applied to the limit on slow, failed or timed-out requests
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.long_window = long_window
+        self.backoff = backoff
+        self.clock = clock
+
+        self.limit = float(max(min_limit, min(max_limit, initial_limit)))
+        self.inflight = 0
+        self.baseline_latency: Optional[float] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self.accepted = 0
+        self.rejected = 0
+        self.dropped = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for a slot"""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a slot
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            asyncio.TimeoutError: If no slot became free within timeout
+        """
+        start = self.clock()
+        if not self._waiters and self.inflight < self._slots():
+            self.inflight += 1
+            self.accepted += 1
+            return 0.0
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just as we gave up: hand it on
+                self.inflight -= 1
+                self._wake()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            self.rejected += 1
+            raise
+
+        self.accepted += 1
+        return self.clock() - start
+
+    def release(self, latency: Optional[float] = None, dropped: bool = False):
+        """
+        Free a slot and update the limit
+
+        Args:
+            latency: Observed request latency in seconds (None = no sample)
+            dropped: True if the request failed or timed out (shrinks the limit)
+        """
+        inflight = self.inflight
+        self.inflight = max(0, self.inflight - 1)
+
+        if dropped:
+            self.dropped += 1
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif latency is not None and latency > 0:
+            self._on_sample(latency, inflight)
+
+        self._wake()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get limiter state
+
+        Returns:
+            Dictionary with limit, bounds, inflight, queue depth,
+            baseline latency and accepted/rejected/dropped counts
+        """
+        return {
+            "limit": round(self.limit, 2),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "inflight": self.inflight,
+            "queue_depth": self.queue_depth,
+            "baseline_latency": round(self.baseline_latency, 3) if self.baseline_latency is not None else None,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+        }
+
+    def _slots(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def _on_sample(self, latency: float, inflight: int):
+        """AIMD update from one latency sample"""
+        if self.baseline_latency is None:
+            self.baseline_latency = latency
+            return
+
+        if latency > self.tolerance * self.baseline_latency:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif inflight >= self.limit / 2:
+            # Don't grow a limit that isn't being used
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self.baseline_latency += (latency - self.baseline_latency) / self.long_window
+        # Let the baseline follow a sustained drop quickly (e.g. after an outage)
+        if self.baseline_latency > latency * 2:
+            self.baseline_latency *= 0.95
+
+    def _wake(self):
+        """Grant free slots to queued waiters in FIFO order"""
+        while self._waiters and self.inflight < self._slots():
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.inflight += 1
+            waiter.set_result(None)
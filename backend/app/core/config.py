@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -19,6 +19,8 @@ class Settings(BaseSettings):
     TAX_RATE_EN: int = 0
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE_MB: int = 10
+    UPLOAD_BLOB_GRACE_SECONDS: int = 600  # Unreferenced upload blobs reused (deduplicated) more recently than this are kept until a later sweep
+    MAX_INPUT_ROWS: int = 1000  # Maximum deliverable rows read from an uploaded Excel/CSV
 
     # Language Setting
     LANGUAGE: str = "ja"  # Default: Japanese (ja or en)
@@ -29,13 +31,68 @@ class Settings(BaseSettings):
     OPENAI_RETRY_INITIAL_DELAY: float = 1.0  # Initial retry delay in seconds
     OPENAI_RETRY_BACKOFF_FACTOR: float = 2.0  # Exponential backoff factor
 
+    # OpenAI Connection Pool Settings (shared clients, see app/services/llm_client.py)
+    OPENAI_POOL_MAX_CONNECTIONS: int = 20  # Max open connections per client pool
+    OPENAI_POOL_MAX_KEEPALIVE: int = 10  # Max idle keep-alive connections kept per pool
+    OPENAI_POOL_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept open
+    OPENAI_HTTP2: bool = False  # Use HTTP/2 (requires h2: pip install httpx[http2])
+
+    # LLM Response Cache Settings (estimate responses, see app/services/llm_cache.py)
+    LLM_CACHE_ENABLED: bool = True  # Reuse responses for identical estimate prompts
+    LLM_CACHE_DB_PATH: str = "llm_cache.db"  # SQLite file shared by all workers
+    LLM_CACHE_TTL_SECONDS: int = 604800  # Entry lifetime in seconds (7 days)
+    LLM_CACHE_MAX_ENTRIES: int = 10000  # Max entries in SQLite (LRU eviction)
+    LLM_CACHE_L1_MAX_ENTRIES: int = 512  # Max entries in the in-process memory layer
+
+    # Safety Verdict Cache Settings (input safety checks, see app/services/safety_cache.py)
+    SAFETY_CACHE_ENABLED: bool = True  # Reuse verdicts for identical inputs under the same ruleset
+    SAFETY_CACHE_MAX_ENTRIES: int = 2048  # Max cached verdicts per process (LRU eviction)
+    SAFETY_CACHE_TTL_SECONDS: int = 3600  # Verdict lifetime in seconds (1 hour)
+
+    # Chat Proposal Store Settings (adjustment proposals, see app/services/proposal_store.py)
+    PROPOSAL_STORE_DB_PATH: str = "proposals.db"  # SQLite file shared by all workers
+    PROPOSAL_STORE_TTL_SECONDS: int = 86400  # Proposal lifetime in seconds (1 day)
+    PROPOSAL_STORE_MAX_ENTRIES: int = 1000  # Max tasks with stored proposals (LRU eviction)
+    PROPOSAL_STORE_MAX_BYTES: int = 50 * 1024 * 1024  # Max total proposal JSON size (LRU eviction)
+
     # Circuit Breaker Settings
     CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5  # Number of failures before opening circuit
     CIRCUIT_BREAKER_TIMEOUT: int = 60  # Timeout in seconds before attempting half-open
 
     # Resource Limit Settings
-    MAX_CONCURRENT_ESTIMATES: int = 5  # Maximum number of concurrent estimate operations
+    MAX_CONCURRENT_ESTIMATES: int = 5  # Initial concurrency limit for expensive task requests (adapted at runtime)
+    ADAPTIVE_CONCURRENCY_MIN: int = 2  # Lower bound for the adaptive concurrency limit
+    ADAPTIVE_CONCURRENCY_MAX: int = 50  # Upper bound for the adaptive concurrency limit
+    ADAPTIVE_CONCURRENCY_TOLERANCE: float = 2.0  # Latency over baseline x this shrinks the limit
     MAX_ITERATIONS: int = 10  # Maximum iterations for loop detection
+    MAX_PARALLEL_ESTIMATES: int = 5  # Maximum concurrent LLM calls per estimation task
+    CHAT_CONCURRENT_ADJUSTMENT: bool = True  # Run chat intent analysis and the adjustment LLM call at the same time
+    CHAT_RULE_FAST_PATH_ENABLED: bool = True  # Apply unambiguous chat requests with the rule engine only (no LLM calls)
+    CHAT_RULE_FAST_PATH_MIN_CONFIDENCE: float = 0.9  # Rule confidence (0-1) required to skip the LLM
+
+    # Batched Estimation Settings (several deliverables per LLM call)
+    ESTIMATE_BATCH_ENABLED: bool = False  # Pack deliverables into shared-prefix batch requests
+    ESTIMATE_BATCH_MAX_ITEMS: int = 10  # Upper bound on deliverables per batch
+    ESTIMATE_BATCH_TOKEN_BUDGET: int = 8000  # Approx. input + output tokens per batch request
+    ESTIMATE_BATCH_OUTPUT_TOKENS_PER_ITEM: int = 400  # Output tokens reserved per deliverable
+
+    # Background Job Settings
+    TASK_WORKERS: int = 2  # Worker threads per process for estimation jobs (0 = run inline in the request)
+    TASK_POLL_INTERVAL: float = 1.0  # Seconds between job queue polls
+    TASK_JOB_STALE_SECONDS: int = 1800  # Jobs stuck in processing longer than this are re-queued at startup
+
+    # Question Prefetch Settings (generate questions in the background at task creation)
+    QUESTION_PREFETCH_ENABLED: bool = False  # Start question generation when a task is created (one LLM call per upload, even if abandoned)
+    QUESTION_PREFETCH_WORKERS: int = 4  # Background threads per process for question generation
+    QUESTION_PREFETCH_WAIT_SECONDS: float = 60.0  # Max seconds GET /questions waits for an in-flight generation before generating itself
+
+    # Progress Streaming Settings (GET /tasks/{task_id}/events)
+    SSE_POLL_INTERVAL: float = 0.5  # Seconds between server-side checks for new task events
+    SSE_KEEPALIVE_SECONDS: float = 15.0  # Send a keep-alive comment after this many idle seconds
+
+    # Metrics Settings
+    METRICS_RECENT_CAPACITY: int = 5000  # Recent API/OpenAI/error records kept per ring buffer (totals are kept as running aggregates)
+    METRICS_COST_LEDGER_PATH: str = "cost_ledger.db"  # SQLite file shared by all workers for daily/monthly cost totals ("" = per-process only)
 
     # Logging Settings (TODO-7)
     LOG_LEVEL: str = "INFO"  # Log level: DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -54,6 +111,14 @@ class Settings(BaseSettings):
     # Rate Limit Settings (TODO-9)
     RATE_LIMIT_MAX_REQUESTS: int = 100  # Maximum requests per window
     RATE_LIMIT_WINDOW_SECONDS: int = 3600  # Rate limit window in seconds (1 hour)
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "sqlite" (shared by all workers on the host)
+    RATE_LIMIT_DB_PATH: str = "rate_limit.db"  # SQLite file for the "sqlite" backend
+    RATE_LIMIT_ROUTE_COSTS: Dict[str, int] = {  # "METHOD path-glob" -> requests counted (others count 1)
+        "POST /api/v1/tasks": 3,
+        "POST /api/v1/tasks/*/answers": 5,
+        "POST /api/v1/tasks/*/chat": 2,
+        "POST /api/v1/tasks/*/apply": 2,
+    }
 
     def get_daily_unit_cost(self) -> int:
         """言語設定に応じた単価を取得"""
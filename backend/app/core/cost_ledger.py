@@ -0,0 +1,109 @@
+"""Shared OpenAI cost ledger
+
+``MetricsCollector`` lives in each worker process, so with
+``uvicorn --workers N`` every worker only sees its own spend and the
+daily/monthly cost limits would effectively be multiplied by N. This ledger
+keeps the running totals in one SQLite file (WAL mode) that all workers
+update: each call adds its cost and reads back the combined totals in a
+single short transaction.
+
+Totals are keyed by UTC period (``day:YYYY-MM-DD`` / ``month:YYYY-MM``), so a
+new day or month starts at zero without any explicit reset.
+"""
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+class CostLedger:
+    """Cross-process daily/monthly cost totals in SQLite
+
+    Attributes:
+        db_path: SQLite file path shared by all worker processes
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def add(self, cost: float, now: Optional[datetime] = None) -> Tuple[float, float]:
+        """Add a cost to today's and this month's totals
+
+        Args:
+            cost: Cost in USD
+            now: Current UTC time (default: datetime.utcnow())
+
+        Returns:
+            (daily_total, monthly_total) across all processes, including this cost
+
+        Raises:
+            sqlite3.Error: If the ledger cannot be updated
+        """
+        day_key, month_key = self._period_keys(now)
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if cost:
+                    conn.executemany(
+                        "INSERT INTO cost_ledger (period, cost_usd) VALUES (?, ?) "
+                        "ON CONFLICT(period) DO UPDATE SET cost_usd = cost_usd + excluded.cost_usd",
+                        [(day_key, cost), (month_key, cost)],
+                    )
+                totals = self._read(conn, day_key, month_key)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return totals
+
+    def totals(self, now: Optional[datetime] = None) -> Tuple[float, float]:
+        """Get (daily_total, monthly_total) across all processes
+
+        Raises:
+            sqlite3.Error: If the ledger cannot be read
+        """
+        day_key, month_key = self._period_keys(now)
+        with self._lock:
+            return self._read(self._connect(), day_key, month_key)
+
+    def clear(self) -> None:
+        """Remove all totals"""
+        with self._lock:
+            self._connect().execute("DELETE FROM cost_ledger")
+
+    def close(self) -> None:
+        """Close the connection (reopened on next use)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _period_keys(now: Optional[datetime]) -> Tuple[str, str]:
+        now = now or datetime.utcnow()
+        return f"day:{now:%Y-%m-%d}", f"month:{now:%Y-%m}"
+
+    @staticmethod
+    def _read(conn: sqlite3.Connection, day_key: str, month_key: str) -> Tuple[float, float]:
+        rows = dict(conn.execute(
+            "SELECT period, cost_usd FROM cost_ledger WHERE period IN (?, ?)",
+            (day_key, month_key),
+        ).fetchall())
+        return rows.get(day_key, 0.0), rows.get(month_key, 0.0)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite file on first use (called with _lock held)"""
+        if self._conn is None:
+            # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cost_ledger ("
+                "period TEXT PRIMARY KEY, cost_usd REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
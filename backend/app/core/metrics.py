@@ -1,11 +1,26 @@
-"""Metrics collection system for monitoring and observability"""
-from collections import defaultdict
+"""Metrics collection system for monitoring and observability
+
+Recent records are kept in fixed-capacity ring buffers (``deque(maxlen=...)``)
+for inspection, while everything reported by ``get_summary`` comes from
+aggregates updated on each record (counts, sums, per-operation breakdowns and
+a streaming quantile sketch). Memory stays bounded over long uptimes and a
+summary costs the same regardless of how much traffic has been served.
+
+The same hooks also feed fixed-bucket histograms and counters labelled by
+route / operation / model, exposed in OpenMetrics text format by
+``render_openmetrics()`` so a Prometheus scraper can compute quantiles itself.
+"""
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from itertools import islice
+from typing import Callable, Deque, Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, asdict, field
-import statistics
+import math
+import sqlite3
 import threading
 
+from app.core.cost_ledger import CostLedger
+
 
 @dataclass
 class APICallMetric:
@@ -43,6 +58,118 @@ class ErrorMetric:
     endpoint: Optional[str] = None
 
 
+class QuantileSketch:
+    """
+    Streaming quantile sketch with bounded relative error (DDSketch-style)
+
+    Values are counted in logarithmic buckets, so a quantile estimate is
+    within ``relative_accuracy`` of the true value. The number of buckets
+    depends only on the range of values (about 1,200 buckets span 1µs to
+    3 hours at 1%), never on how many values were added.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.clear()
+
+    def clear(self):
+        """Remove all values"""
+        self.count = 0
+        self.zero_count = 0  # values <= 0 (e.g. sub-resolution durations)
+        self.max = 0.0
+        self._buckets: Dict[int, int] = defaultdict(int)
+
+    def add(self, value: float):
+        """Add a value (O(1))"""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        self.max = max(self.max, value)
+        self._buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile (0 <= q <= 1)
+
+        Uses the same rank as ``sorted(values)[int(count * q)]``.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = min(int(self.count * q), self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        seen = self.zero_count
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                # Bucket midpoint: within relative_accuracy of every value in the bucket
+                return min(2 * self._gamma ** index / (self._gamma + 1), self.max)
+        return self.max
+
+
+# Histogram bucket upper bounds in seconds (+Inf is implicit)
+API_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+OPENAI_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+QUEUE_WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+OPENMETRICS_PREFIX = "ai_estimator"
+
+# Gauge callback result: a single value, or (labels, value) samples
+GaugeValue = Union[float, List[Tuple[Dict[str, str], float]]]
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus semantics: cumulative buckets, sum, count)"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)  # non-cumulative, cumulated on export
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Add an observation (O(number of buckets))"""
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs including +Inf"""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((_format_value(bound), total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value (integers as-is, floats via repr so no precision is lost)"""
+    if isinstance(value, int):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render a label set, escaping backslash, double quote and newline"""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
 class MetricsCollector:
     """
     Singleton metrics collector for system-wide monitoring
@@ -75,12 +202,33 @@ class MetricsCollector:
         if self._initialized:
             return
 
-        self.api_calls: List[APICallMetric] = []
-        self.openai_calls: List[OpenAICallMetric] = []
-        self.errors: List[ErrorMetric] = []
+        # Import here to avoid circular dependency
+        try:
+            from app.core.config import settings
+            capacity = settings.METRICS_RECENT_CAPACITY
+            ledger_path = settings.METRICS_COST_LEDGER_PATH
+        except ImportError:
+            capacity = 5000
+            ledger_path = ""
+
+        # Most recent records (oldest dropped when full)
+        self.api_calls: Deque[APICallMetric] = deque(maxlen=capacity)
+        self.openai_calls: Deque[OpenAICallMetric] = deque(maxlen=capacity)
+        self.errors: Deque[ErrorMetric] = deque(maxlen=capacity)
         self._data_lock = threading.Lock()
 
+        # Running aggregates since the last reset()
+        self._reset_aggregates()
+
+        # Extra stats sections contributed by other components (e.g. connection pools)
+        self._stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        # Gauges read at scrape time (name -> (help, callback))
+        self._gauges: Dict[str, Tuple[str, Callable[[], GaugeValue]]] = {}
+
         # Cost tracking (TODO-9)
+        # daily_cost / monthly_cost mirror the shared ledger when one is configured,
+        # so limits apply to the combined spend of all worker processes
+        self.cost_ledger: Optional[CostLedger] = CostLedger(ledger_path) if ledger_path else None
         self.daily_cost = 0.0
         self.monthly_cost = 0.0
         self.last_reset_date = datetime.utcnow().date()
@@ -89,8 +237,14 @@ class MetricsCollector:
         self._initialized = True
 
     def record_api_call(self, endpoint: str, method: str, status_code: int,
-                       duration: float, request_id: str):
-        """Record API call metric"""
+                       duration: float, request_id: str, route: Optional[str] = None):
+        """
+        Record API call metric
+
+        Args:
+            route: Route template (e.g. /api/v1/tasks/{task_id}) used as the
+                histogram label; defaults to endpoint
+        """
         with self._data_lock:
             metric = APICallMetric(
                 endpoint=endpoint,
@@ -102,6 +256,19 @@ class MetricsCollector:
             )
             self.api_calls.append(metric)
 
+            self._api_total += 1
+            self._api_duration_sum += duration
+            self._api_durations.add(duration)
+            if 200 <= status_code < 300:
+                self._api_success += 1
+
+            route_key = (method, route or endpoint)
+            histogram = self._api_latency.get(route_key)
+            if histogram is None:
+                histogram = self._api_latency[route_key] = Histogram(API_LATENCY_BUCKETS)
+            histogram.observe(duration)
+            self._api_requests[(method, route or endpoint, str(status_code))] += 1
+
     def record_openai_call(self, model: str, tokens: int, duration: float,
                            success: bool, request_id: str, operation: str = "unknown",
                            input_tokens: int = 0, output_tokens: int = 0):
@@ -126,8 +293,7 @@ class MetricsCollector:
             cost = self._calculate_cost(input_tokens, output_tokens)
 
             # Update cumulative costs
-            self.daily_cost += cost
-            self.monthly_cost += cost
+            self._add_cost(cost, request_id)
 
             # Record metric
             metric = OpenAICallMetric(
@@ -144,6 +310,23 @@ class MetricsCollector:
             )
             self.openai_calls.append(metric)
 
+            self._openai_total += 1
+            self._openai_tokens += tokens
+            if success:
+                self._openai_success += 1
+            self._openai_operations[operation]["count"] += 1
+            self._openai_operations[operation]["tokens"] += tokens
+
+            model_key = (operation, model)
+            histogram = self._openai_latency.get(model_key)
+            if histogram is None:
+                histogram = self._openai_latency[model_key] = Histogram(OPENAI_LATENCY_BUCKETS)
+            histogram.observe(duration)
+            self._openai_requests[(operation, model, "success" if success else "failure")] += 1
+            self._openai_token_counts[(operation, model, "input")] += input_tokens
+            self._openai_token_counts[(operation, model, "output")] += output_tokens
+            self._openai_cost[model_key] += cost
+
             # Cost limit check (TODO-9)
             self._check_cost_limit(request_id, cost)
 
@@ -159,6 +342,22 @@ class MetricsCollector:
                 endpoint=endpoint
             )
             self.errors.append(metric)
+            self._error_total += 1
+            self._error_counts[error_type] += 1
+
+    def record_queue_wait(self, route: str, wait_seconds: float):
+        """
+        Record time a request waited for a concurrency slot
+
+        Args:
+            route: Route class label (e.g. "POST /api/v1/tasks/*/answers")
+            wait_seconds: Seconds spent queued (0 if admitted immediately)
+        """
+        with self._data_lock:
+            histogram = self._queue_wait.get(route)
+            if histogram is None:
+                histogram = self._queue_wait[route] = Histogram(QUEUE_WAIT_BUCKETS)
+            histogram.observe(wait_seconds)
 
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -176,65 +375,177 @@ class MetricsCollector:
             - openai_operations: Operation breakdown (estimate/question/chat)
             - total_errors: Total number of errors
             - error_rate: Percentage of requests with errors
+            - one section per registered stats provider
+        """
+        summary = self._get_call_summary()
+        for name, provider in list(self._stats_providers.items()):
+            try:
+                summary[name] = provider()
+            except Exception:
+                summary[name] = {}
+        return summary
+
+    def register_stats_provider(self, name: str, provider: Callable[[], Dict[str, Any]]):
+        """
+        Register a callable whose result is included in get_summary() under `name`
+
+        Args:
+            name: Summary key
+            provider: Callable returning a JSON-serializable dictionary
+        """
+        self._stats_providers[name] = provider
+
+    def register_gauge(self, name: str, help_text: str, callback: Callable[[], GaugeValue]):
+        """
+        Register a gauge that is read when OpenMetrics output is rendered
+
+        Args:
+            name: Metric name without prefix (e.g. "circuit_breaker_state")
+            help_text: HELP line
+            callback: Returns a value, or a list of (labels, value) samples
+        """
+        self._gauges[name] = (help_text, callback)
+
+    def render_openmetrics(self) -> str:
+        """
+        Render counters, histograms and gauges in OpenMetrics text format
+
+        Returns:
+            Exposition text (ends with "# EOF")
         """
         with self._data_lock:
-            # OpenAI statistics (calculated independently of API calls)
-            openai_success = sum(1 for call in self.openai_calls if call.success)
-            openai_total = len(self.openai_calls)
-            total_tokens = sum(call.tokens for call in self.openai_calls)
-
-            # OpenAI operation breakdown
-            operation_stats = defaultdict(lambda: {"count": 0, "tokens": 0})
-            for call in self.openai_calls:
-                operation_stats[call.operation]["count"] += 1
-                operation_stats[call.operation]["tokens"] += call.tokens
-
-            # API call statistics
-            if not self.api_calls:
-                return {
-                    "total_api_calls": 0,
-                    "avg_response_time": 0.0,
-                    "p95_response_time": 0.0,
-                    "success_rate": 100.0,
-                    "total_openai_calls": openai_total,
-                    "openai_success_rate": round(openai_success / openai_total * 100, 2) if openai_total > 0 else 0.0,
-                    "total_tokens_used": total_tokens,
-                    "openai_operations": dict(operation_stats),
-                    "total_errors": len(self.errors),
-                    "error_rate": 0.0
-                }
-
-            durations = [call.duration for call in self.api_calls]
-            status_codes = [call.status_code for call in self.api_calls]
-            success_count = sum(1 for s in status_codes if 200 <= s < 300)
-
-            # Calculate P95
-            p95 = 0.0
-            if len(durations) >= 20:
-                sorted_durations = sorted(durations)
-                p95_index = int(len(sorted_durations) * 0.95)
-                p95 = sorted_durations[p95_index]
-            elif durations:
-                p95 = max(durations)
+            api_latency = {key: (h.cumulative(), h.sum, h.count) for key, h in self._api_latency.items()}
+            api_requests = dict(self._api_requests)
+            openai_latency = {key: (h.cumulative(), h.sum, h.count) for key, h in self._openai_latency.items()}
+            openai_requests = dict(self._openai_requests)
+            token_counts = dict(self._openai_token_counts)
+            openai_cost = dict(self._openai_cost)
+            error_counts = dict(self._error_counts)
+            queue_wait = {(route,): (h.cumulative(), h.sum, h.count) for route, h in self._queue_wait.items()}
+            self._sync_costs()
+            daily_cost = self.daily_cost
+            monthly_cost = self.monthly_cost
+
+        lines: List[str] = []
+
+        def family(name: str, metric_type: str, help_text: str, unit: str = ""):
+            lines.append(f"# TYPE {OPENMETRICS_PREFIX}_{name} {metric_type}")
+            if unit:
+                lines.append(f"# UNIT {OPENMETRICS_PREFIX}_{name} {unit}")
+            lines.append(f"# HELP {OPENMETRICS_PREFIX}_{name} {help_text}")
+
+        def sample(name: str, labels: Dict[str, str], value: float):
+            lines.append(f"{OPENMETRICS_PREFIX}_{name}{_format_labels(labels)} {_format_value(value)}")
+
+        def histograms(name: str, data: Dict[Tuple[str, ...], Any], label_names: Tuple[str, ...]):
+            for key, (buckets, total, count) in sorted(data.items()):
+                labels = dict(zip(label_names, key))
+                for le, cumulative in buckets:
+                    sample(f"{name}_bucket", {**labels, "le": le}, cumulative)
+                sample(f"{name}_count", labels, count)
+                sample(f"{name}_sum", labels, total)
+
+        family("http_requests", "counter", "HTTP requests by route and status")
+        for (method, route, status), count in sorted(api_requests.items()):
+            sample("http_requests_total", {"method": method, "route": route, "status": status}, count)
+
+        family("http_request_duration_seconds", "histogram", "HTTP request latency", "seconds")
+        histograms("http_request_duration_seconds", api_latency, ("method", "route"))
+
+        family("openai_requests", "counter", "OpenAI API calls by operation, model and result")
+        for (operation, model, result), count in sorted(openai_requests.items()):
+            sample("openai_requests_total", {"operation": operation, "model": model, "result": result}, count)
+
+        family("openai_request_duration_seconds", "histogram", "OpenAI API call latency", "seconds")
+        histograms("openai_request_duration_seconds", openai_latency, ("operation", "model"))
+
+        family("openai_tokens", "counter", "OpenAI tokens by operation, model and direction")
+        for (operation, model, kind), count in sorted(token_counts.items()):
+            sample("openai_tokens_total", {"operation": operation, "model": model, "type": kind}, count)
+
+        family("openai_cost_usd", "counter", "Estimated OpenAI cost in USD")
+        for (operation, model), cost in sorted(openai_cost.items()):
+            sample("openai_cost_usd_total", {"operation": operation, "model": model}, cost)
+
+        family("errors", "counter", "Recorded errors by type")
+        for error_type, count in sorted(error_counts.items()):
+            sample("errors_total", {"type": error_type}, count)
+
+        family("resource_limiter_queue_wait_seconds", "histogram", "Time waiting for a concurrency slot", "seconds")
+        histograms("resource_limiter_queue_wait_seconds", queue_wait, ("route",))
+
+        family("openai_daily_cost_usd", "gauge", "OpenAI cost accumulated today (UTC)")
+        sample("openai_daily_cost_usd", {}, daily_cost)
+        family("openai_monthly_cost_usd", "gauge", "OpenAI cost accumulated this month (UTC)")
+        sample("openai_monthly_cost_usd", {}, monthly_cost)
+
+        for name, (help_text, callback) in sorted(self._gauges.items()):
+            try:
+                value = callback()
+            except Exception:
+                continue
+            family(name, "gauge", help_text)
+            if isinstance(value, list):
+                for labels, sample_value in value:
+                    sample(name, labels, sample_value)
+            else:
+                sample(name, {}, value)
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _get_call_summary(self) -> Dict[str, Any]:
+        """Aggregate API / OpenAI / error metrics (see get_summary)"""
+        with self._data_lock:
+            openai_total = self._openai_total
+            api_total = self._api_total
+
+            # P95 (below 20 samples the slowest call is reported)
+            if api_total >= 20:
+                p95 = self._api_durations.quantile(0.95)
+            else:
+                p95 = self._api_durations.max
 
             return {
-                "total_api_calls": len(self.api_calls),
-                "avg_response_time": round(statistics.mean(durations), 3) if durations else 0.0,
+                "total_api_calls": api_total,
+                "avg_response_time": round(self._api_duration_sum / api_total, 3) if api_total else 0.0,
                 "p95_response_time": round(p95, 3),
-                "success_rate": round(success_count / len(status_codes) * 100, 2) if status_codes else 100.0,
+                "success_rate": round(self._api_success / api_total * 100, 2) if api_total else 100.0,
                 "total_openai_calls": openai_total,
-                "openai_success_rate": round(openai_success / openai_total * 100, 2) if openai_total > 0 else 0.0,
-                "total_tokens_used": total_tokens,
-                "openai_operations": dict(operation_stats),
-                "total_errors": len(self.errors),
-                "error_rate": round(len(self.errors) / len(self.api_calls) * 100, 2) if self.api_calls else 0.0
+                "openai_success_rate": round(self._openai_success / openai_total * 100, 2) if openai_total > 0 else 0.0,
+                "total_tokens_used": self._openai_tokens,
+                "openai_operations": {op: dict(stats) for op, stats in self._openai_operations.items()},
+                "total_errors": self._error_total,
+                "error_rate": round(self._error_total / api_total * 100, 2) if api_total else 0.0
             }
 
     def get_recent_errors(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent errors"""
+        """Get recent errors (oldest first)"""
         with self._data_lock:
-            recent = self.errors[-limit:]
-            return [asdict(err) for err in recent]
+            recent = list(islice(reversed(self.errors), limit))
+            return [asdict(err) for err in reversed(recent)]
+
+    def _reset_aggregates(self):
+        """Clear running aggregates (called from __init__ or with _data_lock held)"""
+        self._api_total = 0
+        self._api_success = 0
+        self._api_duration_sum = 0.0
+        self._api_durations = QuantileSketch()
+        self._openai_total = 0
+        self._openai_success = 0
+        self._openai_tokens = 0
+        self._openai_operations: Dict[str, Dict[str, int]] = defaultdict(lambda: {"count": 0, "tokens": 0})
+        self._error_total = 0
+
+        # Labelled series for OpenMetrics export
+        self._api_latency: Dict[Tuple[str, str], Histogram] = {}
+        self._api_requests: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._openai_latency: Dict[Tuple[str, str], Histogram] = {}
+        self._openai_requests: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._openai_token_counts: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._openai_cost: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._error_counts: Dict[str, int] = defaultdict(int)
+        self._queue_wait: Dict[str, Histogram] = {}
 
     def _calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
         """
@@ -253,6 +564,48 @@ class MetricsCollector:
         )
         return cost
 
+    def _add_cost(self, cost: float, request_id: str):
+        """
+        Add a call's cost to the daily/monthly totals
+
+        With a shared ledger the totals are read back from it, so they include
+        other workers' spend. If the ledger is unavailable the cost is added
+        to the local totals only.
+
+        This method should be called with _data_lock already acquired.
+        """
+        if self.cost_ledger is not None:
+            try:
+                self.daily_cost, self.monthly_cost = self.cost_ledger.add(cost)
+                return
+            except sqlite3.Error as e:
+                self._log_ledger_error("Cost ledger update failed", e, request_id=request_id)
+
+        self.daily_cost += cost
+        self.monthly_cost += cost
+
+    def _sync_costs(self):
+        """
+        Refresh daily/monthly totals from the shared ledger (if configured)
+
+        This method should be called with _data_lock already acquired.
+        """
+        if self.cost_ledger is None:
+            return
+        try:
+            self.daily_cost, self.monthly_cost = self.cost_ledger.totals()
+        except sqlite3.Error as e:
+            self._log_ledger_error("Cost ledger read failed", e)
+
+    @staticmethod
+    def _log_ledger_error(message: str, error: Exception, **kwargs):
+        # Import here to avoid circular dependency
+        try:
+            from app.core.logging_config import get_logger
+            get_logger(__name__).warning(message, error=str(error), **kwargs)
+        except ImportError:
+            pass
+
     def _auto_reset_if_needed(self):
         """
         Auto-reset daily/monthly costs if date/month changed (TODO-9)
@@ -331,6 +684,8 @@ class MetricsCollector:
             - monthly_usage_percent: Monthly usage percentage
         """
         with self._data_lock:
+            self._sync_costs()
+
             # Import here to avoid circular dependency
             try:
                 from app.core.config import settings
@@ -356,6 +711,7 @@ class MetricsCollector:
             self.api_calls.clear()
             self.openai_calls.clear()
             self.errors.clear()
+            self._reset_aggregates()
             # Note: Cost tracking is NOT reset here (only auto-reset by date/month change)
 
 
@@ -1,24 +1,218 @@
-"""Rate limiter for DoS attack prevention (TODO-9)"""
-from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import Optional, Tuple, Dict, Any
+"""Rate limiter for DoS attack prevention (TODO-9)
+
+Uses GCRA (generic cell rate algorithm), the timestamp form of a token
+bucket: each client is represented by a single "theoretical arrival time"
+(TAT), so checking a request is O(1) in time and memory regardless of the
+window size. Clients whose TAT has passed have a full allowance again and
+are dropped from the table.
+
+TATs are kept in a pluggable backend:
+- memory: per-process table (the limit applies per worker)
+- sqlite: one SQLite file (WAL) shared by all uvicorn workers on the host,
+  updated in a single transaction per request, so the configured limit is
+  enforced across workers without a network hop
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Callable, Optional, Tuple, Dict, Any
+import math
+import sqlite3
 import threading
+import time
+from app.core.config import settings
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+class RateLimitBackend(ABC):
+    """
+    Storage for per-client TATs
+
+    Implementations must make consume() atomic with respect to every other
+    limiter sharing the backend.
+
+    Attributes:
+        name: Backend name reported by get_status()
+        clock: Default time source; must be comparable across all sharers
+        blocking: True if calls may wait on I/O or locks, so async callers
+            must run them in a thread instead of on the event loop
+    """
+
+    name = "base"
+    clock: Callable[[], float] = staticmethod(time.monotonic)
+    blocking = False
+
+    @abstractmethod
+    def consume(self, client_id: str, now: float, increment: float, limit: float) -> Tuple[bool, float]:
+        """
+        Advance a client's TAT by `increment` unless it would exceed now + limit
+
+        Args:
+            client_id: Client identifier
+            now: Current time
+            increment: Seconds to add to the TAT (cost * emission interval)
+            limit: Maximum allowed TAT - now (the window)
+
+        Returns:
+            (allowed, new_tat) - new_tat is the TAT the request would have
+            needed, so callers can compute retry_after on rejection
+        """
+
+    @abstractmethod
+    def get_tat(self, client_id: str) -> Optional[float]:
+        """Get a client's stored TAT (None if not tracked)"""
+
+    @abstractmethod
+    def delete(self, client_id: str) -> bool:
+        """Forget a client. Returns True if it was tracked"""
+
+    @abstractmethod
+    def active_clients(self, now: float) -> int:
+        """Number of clients whose TAT is still in the future"""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """In-process TAT table, ordered by last access"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, client_id: str, now: float, increment: float, limit: float) -> Tuple[bool, float]:
+        with self._lock:
+            self._evict_idle(now)
+            new_tat = max(self._tat.get(client_id, now), now) + increment
+            if new_tat - now > limit:
+                return False, new_tat
+            self._tat[client_id] = new_tat
+            self._tat.move_to_end(client_id)
+            return True, new_tat
+
+    def get_tat(self, client_id: str) -> Optional[float]:
+        with self._lock:
+            return self._tat.get(client_id)
+
+    def delete(self, client_id: str) -> bool:
+        with self._lock:
+            return self._tat.pop(client_id, None) is not None
+
+    def active_clients(self, now: float) -> int:
+        with self._lock:
+            self._evict_idle(now)
+            return len(self._tat)
+
+    def _evict_idle(self, now: float):
+        """
+        Drop clients whose allowance has fully refilled (called with _lock held)
+
+        A client's TAT is at most one window after its last request, so an
+        entry untouched for a window is always expired; scanning from the
+        least recently used end makes this amortized O(1).
+        """
+        while self._tat:
+            client_id, tat = next(iter(self._tat.items()))
+            if tat > now:
+                break
+            del self._tat[client_id]
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    TAT table in a SQLite file shared by all worker processes
+
+    Uses wall-clock time so TATs written by different processes are
+    comparable. Expired rows are deleted at most once per sweep_interval.
+    consume() can wait up to the busy timeout for another worker's write
+    lock, so the middleware calls this backend from the threadpool.
+    """
+
+    name = "sqlite"
+    clock = staticmethod(time.time)
+    blocking = True
+
+    def __init__(self, db_path: str, sweep_interval: float = 60.0):
+        self.db_path = db_path
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_sweep = 0.0
+
+    def consume(self, client_id: str, now: float, increment: float, limit: float) -> Tuple[bool, float]:
+        with self._lock:
+            conn = self._connect()
+            # IMMEDIATE takes the write lock up front, so read-modify-write is atomic across processes
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tat FROM rate_limits WHERE client_id = ?", (client_id,)).fetchone()
+                new_tat = max(row[0] if row else now, now) + increment
+                allowed = new_tat - now <= limit
+                if allowed:
+                    conn.execute(
+                        "INSERT INTO rate_limits (client_id, tat) VALUES (?, ?) "
+                        "ON CONFLICT(client_id) DO UPDATE SET tat = excluded.tat",
+                        (client_id, new_tat),
+                    )
+                if now - self._last_sweep >= self.sweep_interval:
+                    conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+                    self._last_sweep = now
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return allowed, new_tat
+
+    def get_tat(self, client_id: str) -> Optional[float]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT tat FROM rate_limits WHERE client_id = ?", (client_id,)
+            ).fetchone()
+            return row[0] if row else None
+
+    def delete(self, client_id: str) -> bool:
+        with self._lock:
+            return self._connect().execute(
+                "DELETE FROM rate_limits WHERE client_id = ?", (client_id,)
+            ).rowcount > 0
+
+    def active_clients(self, now: float) -> int:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM rate_limits WHERE tat > ?", (now,)
+            ).fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite file on first use (called with _lock held)"""
+        if self._conn is None:
+            # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (client_id TEXT PRIMARY KEY, tat REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_tat ON rate_limits (tat)")
+            self._conn = conn
+        return self._conn
+
+
 class RateLimiter:
     """
-    Rate limiter using sliding window algorithm
+    Rate limiter using GCRA (token bucket equivalent)
 
-    Prevents DoS attacks by limiting requests per client (IP address)
+    Prevents DoS attacks by limiting requests per client (IP address).
+    A client may burst up to max_requests at once, after which capacity
+    refills at max_requests per window_seconds. Requests can have a cost
+    (e.g. an estimate counts as several status polls).
     """
 
     def __init__(
         self,
         max_requests: int = 100,
-        window_seconds: int = 3600
+        window_seconds: int = 3600,
+        clock: Optional[Callable[[], float]] = None,
+        backend: Optional[RateLimitBackend] = None
     ):
         """
         Initialize rate limiter
@@ -26,61 +220,62 @@ class RateLimiter:
         Args:
             max_requests: Maximum requests allowed per window
             window_seconds: Time window in seconds (default: 1 hour)
+            clock: Time source in seconds (default: the backend's clock; injectable for tests)
+            backend: TAT storage (default: in-process memory)
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, list] = defaultdict(list)
-        self.lock = threading.Lock()
+        self.emission_interval = window_seconds / max_requests  # seconds per request
+        self.backend = backend or MemoryRateLimitBackend()
+        self._clock = clock or self.backend.clock
 
         logger.info(
             "RateLimiter initialized",
             max_requests=max_requests,
-            window_seconds=window_seconds
+            window_seconds=window_seconds,
+            backend=self.backend.name
         )
 
-    def check_limit(self, client_id: str) -> Tuple[bool, Optional[int]]:
+    def check_limit(self, client_id: str, cost: int = 1) -> Tuple[bool, Optional[int]]:
         """
-        Check if client is within rate limit
+        Check if client is within rate limit, consuming `cost` requests if allowed
 
         Args:
             client_id: Client identifier (usually IP address)
+            cost: Number of requests this call counts as (default: 1,
+                capped at max_requests so it can always succeed eventually)
 
         Returns:
             Tuple of (is_allowed: bool, retry_after: Optional[int])
             - is_allowed: True if request is allowed, False if rate limit exceeded
             - retry_after: Seconds to wait before retry (None if allowed)
         """
-        with self.lock:
-            now = datetime.utcnow()
-            window_start = now - timedelta(seconds=self.window_seconds)
-
-            # Remove expired requests (sliding window)
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id]
-                if req_time > window_start
-            ]
-
-            # Check rate limit
-            if len(self.requests[client_id]) >= self.max_requests:
-                # Calculate retry_after from oldest request
-                oldest_request = self.requests[client_id][0]
-                retry_after = int(
-                    (oldest_request + timedelta(seconds=self.window_seconds) - now).total_seconds()
-                )
-
-                logger.warning(
-                    "Rate limit exceeded",
-                    client_id=client_id,
-                    requests_count=len(self.requests[client_id]),
-                    max_requests=self.max_requests,
-                    retry_after=retry_after
-                )
-
-                return False, max(0, retry_after)
-
-            # Record new request
-            self.requests[client_id].append(now)
+        now = self._clock()
+        cost = min(cost, self.max_requests)
+
+        # Allowed while the client is at most one window "ahead" of real time
+        try:
+            allowed, new_tat = self.backend.consume(
+                client_id, now, cost * self.emission_interval, self.window_seconds
+            )
+        except sqlite3.Error as e:
+            # Fail open: a storage problem should not take the API down
+            logger.error("Rate limit backend error, allowing request", client_id=client_id, error=str(e))
             return True, None
+        if allowed:
+            return True, None
+
+        retry_after = math.ceil(new_tat - now - self.window_seconds)
+
+        logger.warning(
+            "Rate limit exceeded",
+            client_id=client_id,
+            cost=cost,
+            max_requests=self.max_requests,
+            retry_after=retry_after
+        )
+
+        return False, max(1, retry_after)
 
     def reset_client(self, client_id: str):
         """
@@ -89,10 +284,8 @@ class RateLimiter:
         Args:
             client_id: Client identifier to reset
         """
-        with self.lock:
-            if client_id in self.requests:
-                del self.requests[client_id]
-                logger.info("Rate limit reset for client", client_id=client_id)
+        if self.backend.delete(client_id):
+            logger.info("Rate limit reset for client", client_id=client_id)
 
     def get_remaining(self, client_id: str) -> int:
         """
@@ -104,17 +297,11 @@ class RateLimiter:
         Returns:
             Number of remaining requests allowed
         """
-        with self.lock:
-            now = datetime.utcnow()
-            window_start = now - timedelta(seconds=self.window_seconds)
-
-            # Count recent requests
-            recent_requests = [
-                req_time for req_time in self.requests.get(client_id, [])
-                if req_time > window_start
-            ]
-
-            return max(0, self.max_requests - len(recent_requests))
+        now = self._clock()
+        tat = self.backend.get_tat(client_id)
+        used = max((tat if tat is not None else now) - now, 0.0)
+        remaining = math.floor((self.window_seconds - used) / self.emission_interval + 1e-9)
+        return max(0, min(self.max_requests, remaining))
 
     def get_status(self) -> Dict[str, Any]:
         """
@@ -125,13 +312,55 @@ class RateLimiter:
             - max_requests: Maximum requests per window
             - window_seconds: Time window in seconds
             - active_clients: Number of active clients being tracked
+            - algorithm: Rate limiting algorithm
+            - emission_interval: Seconds for one request of capacity to refill
+            - backend: TAT storage backend (memory/sqlite)
         """
-        with self.lock:
-            return {
-                "max_requests": self.max_requests,
-                "window_seconds": self.window_seconds,
-                "active_clients": len(self.requests)
-            }
+        return {
+            "max_requests": self.max_requests,
+            "window_seconds": self.window_seconds,
+            "active_clients": self.backend.active_clients(self._clock()),
+            "algorithm": "gcra",
+            "emission_interval": round(self.emission_interval, 3),
+            "backend": self.backend.name
+        }
+
+
+def match_route_cost(method: str, path: str, route_costs: Dict[str, int]) -> Tuple[Optional[str], int]:
+    """
+    Look up the cost of a request in a "METHOD path-glob" -> cost table
+
+    Args:
+        method: HTTP method
+        path: Request path
+        route_costs: e.g. settings.RATE_LIMIT_ROUTE_COSTS
+
+    Returns:
+        (matching pattern, cost) for the first match, otherwise (None, 1)
+    """
+    for pattern, cost in route_costs.items():
+        pattern_method, _, pattern_path = pattern.partition(" ")
+        if pattern_method == method and fnmatchcase(path, pattern_path):
+            return pattern, cost
+    return None, 1
+
+
+def create_rate_limit_backend(name: str = None) -> RateLimitBackend:
+    """
+    Create the configured rate limit backend
+
+    Args:
+        name: "memory" or "sqlite" (default: settings.RATE_LIMIT_BACKEND)
+
+    Returns:
+        RateLimitBackend instance
+    """
+    name = name or settings.RATE_LIMIT_BACKEND
+    if name == "sqlite":
+        return SQLiteRateLimitBackend(settings.RATE_LIMIT_DB_PATH)
+    if name != "memory":
+        logger.warning("Unknown rate limit backend, using memory", backend=name)
+    return MemoryRateLimitBackend()
 
 
 # Global instance (initialized with config in middleware)
@@ -151,5 +380,5 @@ def get_rate_limiter(max_requests: int = 100, window_seconds: int = 3600) -> Rat
     """
     global rate_limiter
     if rate_limiter is None:
-        rate_limiter = RateLimiter(max_requests, window_seconds)
+        rate_limiter = RateLimiter(max_requests, window_seconds, backend=create_rate_limit_backend())
     return rate_limiter
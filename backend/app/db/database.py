@@ -36,6 +36,7 @@ def init_db():
     # SQLiteはORMメタデータで作成、PostgreSQLはinit.sqlを実行
     if settings.DATABASE_URL.startswith("sqlite"):
         Base.metadata.create_all(bind=engine)
+        migrate_sqlite(engine)
     else:
         init_sql_path = Path(__file__).resolve().parents[2] / "database" / "init.sql"
         if not init_sql_path.exists():
@@ -45,3 +46,19 @@ def init_db():
         with engine.begin() as conn:
             for stmt in [s.strip() for s in sql.split(";\n") if s.strip()]:
                 conn.execute(text(stmt))
+
+
+# 既存のSQLite DB向けの追加カラム（create_all は既存テーブルを変更しないため）
+# (テーブル, カラム, ADD COLUMN の定義)
+SQLITE_ADDED_COLUMNS = [
+    ("deliverables", "order", '"order" INTEGER NOT NULL DEFAULT 0'),
+]
+
+
+def migrate_sqlite(bind) -> None:
+    """既存のSQLite DBに不足しているカラムを追加する（何度実行しても安全）"""
+    with bind.begin() as conn:
+        for table, column, definition in SQLITE_ADDED_COLUMNS:
+            columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+            if columns and column not in columns:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {definition}"))
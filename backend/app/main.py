@@ -8,6 +8,9 @@ import os
 from app.core.config import settings
 from app.api.v1 import tasks, metrics, admin  # TODO-9: added admin
 from app.db.database import init_db
+from app.services.job_queue import job_queue
+from app.services.guardrails_service import guard_registry
+from app.services.question_prefetch import question_prefetcher
 from app.middleware.resource_limiter import ResourceLimiterMiddleware, FileSizeLimiterMiddleware
 from app.middleware.request_id import RequestIDMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware  # TODO-9
@@ -61,6 +64,17 @@ async def startup_event():
     init_db()
     # アップロードディレクトリ作成
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    # 見積りジョブのワーカー起動
+    job_queue.start()
+    # Guardrails のガードを1度だけ構築（リクエスト間で共有、完了状況は /health で確認）
+    guard_registry.start_warm_up()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """アプリケーション終了時の処理"""
+    job_queue.stop()
+    question_prefetcher.shutdown()
 
 
 @app.get("/")
@@ -74,7 +88,7 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "guards": guard_registry.get_status()}
 
 
 # ルーター登録
@@ -1,8 +1,9 @@
 """Rate limit middleware for DoS attack prevention (TODO-9)"""
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
-from app.core.rate_limiter import get_rate_limiter
+from app.core.rate_limiter import get_rate_limiter, match_route_cost
 from app.core.config import settings
 from app.core.i18n import t
 from app.core.logging_config import get_logger
@@ -17,8 +18,14 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     Enforces rate limits per client IP address to prevent DoS attacks
     """
 
-    def __init__(self, app):
+    def __init__(self, app, route_costs: dict = None):
+        """
+        Args:
+            app: FastAPI application instance
+            route_costs: "METHOD path-glob" -> cost (default: settings.RATE_LIMIT_ROUTE_COSTS)
+        """
         super().__init__(app)
+        self.route_costs = route_costs if route_costs is not None else settings.RATE_LIMIT_ROUTE_COSTS
         # Initialize rate limiter with config
         self.rate_limiter = get_rate_limiter(
             max_requests=settings.RATE_LIMIT_MAX_REQUESTS,
@@ -44,8 +51,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Get client ID (IP address)
         client_id = request.client.host if request.client else "unknown"
 
-        # Check rate limit
-        is_allowed, retry_after = self.rate_limiter.check_limit(client_id)
+        # Check rate limit (expensive routes such as estimates count as several requests)
+        cost = self._route_cost(request.method, request.url.path)
+        is_allowed, retry_after = await self._call_limiter(self.rate_limiter.check_limit, client_id, cost)
 
         if not is_allowed:
             logger.warning(
@@ -53,6 +61,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 client_id=client_id,
                 path=request.url.path,
                 method=request.method,
+                cost=cost,
                 retry_after=retry_after
             )
 
@@ -73,9 +82,33 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
 
         # Add rate limit headers to response
-        remaining = self.rate_limiter.get_remaining(client_id)
+        remaining = await self._call_limiter(self.rate_limiter.get_remaining, client_id)
         response.headers["X-RateLimit-Limit"] = str(self.rate_limiter.max_requests)
         response.headers["X-RateLimit-Remaining"] = str(remaining)
         response.headers["X-RateLimit-Window"] = str(self.rate_limiter.window_seconds)
 
         return response
+
+    async def _call_limiter(self, func, *args):
+        """
+        Call a rate limiter method without blocking the event loop
+
+        Backends that may wait on a lock (e.g. SQLite shared by workers) are
+        called in the threadpool; the in-memory backend is called inline.
+        """
+        if self.rate_limiter.backend.blocking:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    def _route_cost(self, method: str, path: str) -> int:
+        """
+        Get the rate limit cost of a request
+
+        Args:
+            method: HTTP method
+            path: Request path
+
+        Returns:
+            Cost of the first matching "METHOD path-glob" entry, otherwise 1
+        """
+        return match_route_cost(method, path, self.route_costs)[1]
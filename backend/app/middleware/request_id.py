@@ -52,7 +52,9 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
                 method=request.method,
                 status_code=response.status_code,
                 duration=duration,
-                request_id=request_id
+                request_id=request_id,
+                # Route template keeps histogram labels bounded (no task IDs in paths)
+                route=getattr(request.scope.get("route"), "path", "unmatched")
             )
 
             # Add request ID to response headers
@@ -1,12 +1,16 @@
 """Resource limiter middleware to control concurrent requests"""
 import asyncio
 import logging
+import time
 from typing import Callable
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from app.core.concurrency_limiter import AdaptiveConcurrencyLimiter
 from app.core.config import settings
 from app.core.i18n import t
+from app.core.metrics import metrics_collector
+from app.core.rate_limiter import match_route_cost
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +18,11 @@ logger = logging.getLogger(__name__)
 class ResourceLimiterMiddleware(BaseHTTPMiddleware):
     """Middleware to limit concurrent resource-intensive requests
 
-    This middleware uses a semaphore to control the number of concurrent
-    requests to resource-intensive endpoints (e.g., estimate generation).
+    Only expensive routes (cost > 1 in the route cost table, e.g. creating a
+    task or submitting answers) go through the limiter; status polls, result
+    reads and other cheap requests bypass it and never queue behind
+    estimates. The concurrency limit starts at max_concurrent and is tuned
+    from observed latency by AdaptiveConcurrencyLimiter.
 
     Usage:
         app.add_middleware(
@@ -31,15 +38,18 @@ class ResourceLimiterMiddleware(BaseHTTPMiddleware):
         app,
         max_concurrent: int = None,
         timeout: float = 30.0,
-        limited_paths: list = None
+        limited_paths: list = None,
+        route_costs: dict = None
     ):
         """Initialize resource limiter middleware
 
         Args:
             app: FastAPI application instance
-            max_concurrent: Maximum number of concurrent requests (default from settings)
-            timeout: Timeout for acquiring semaphore in seconds (default 30.0)
+            max_concurrent: Initial concurrency limit (default from settings)
+            timeout: Timeout for acquiring a slot in seconds (default 30.0)
             limited_paths: List of path prefixes to limit (None = limit all)
+            route_costs: "METHOD path-glob" -> cost (default: settings.RATE_LIMIT_ROUTE_COSTS);
+                only routes with cost > 1 are limited
         """
         super().__init__(app)
         self.max_concurrent = max_concurrent or getattr(
@@ -47,11 +57,35 @@ class ResourceLimiterMiddleware(BaseHTTPMiddleware):
         )
         self.timeout = timeout
         self.limited_paths = limited_paths or []
-        self.semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.route_costs = route_costs if route_costs is not None else settings.RATE_LIMIT_ROUTE_COSTS
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=self.max_concurrent,
+            min_limit=min(settings.ADAPTIVE_CONCURRENCY_MIN, self.max_concurrent),
+            max_limit=max(settings.ADAPTIVE_CONCURRENCY_MAX, self.max_concurrent),
+            tolerance=settings.ADAPTIVE_CONCURRENCY_TOLERANCE
+        )
+
+        metrics_collector.register_gauge(
+            "resource_limiter_queue_depth",
+            "Requests waiting for a resource limiter slot",
+            lambda: self.limiter.queue_depth
+        )
+        metrics_collector.register_gauge(
+            "resource_limiter_active_requests",
+            "Requests holding a resource limiter slot",
+            lambda: self.limiter.inflight
+        )
+        metrics_collector.register_gauge(
+            "resource_limiter_concurrency_limit",
+            "Current adaptive concurrency limit",
+            lambda: self.limiter.limit
+        )
+        metrics_collector.register_stats_provider("resource_limiter", self.limiter.get_status)
 
         logger.info(
             f"ResourceLimiterMiddleware initialized: "
-            f"max_concurrent={self.max_concurrent}, "
+            f"max_concurrent={self.max_concurrent} (adaptive "
+            f"{self.limiter.min_limit}-{self.limiter.max_limit}), "
             f"timeout={self.timeout}s, "
             f"limited_paths={self.limited_paths}"
         )
@@ -72,6 +106,15 @@ class ResourceLimiterMiddleware(BaseHTTPMiddleware):
         # Check if path starts with any limited path prefix
         return any(path.startswith(prefix) for prefix in self.limited_paths)
 
+    def _route_class(self, method: str, path: str):
+        """Get the route cost pattern for an expensive request
+
+        Returns:
+            Matching "METHOD path-glob" pattern, or None for cheap requests
+        """
+        pattern, cost = match_route_cost(method, path, self.route_costs)
+        return pattern if cost > 1 else None
+
     async def dispatch(self, request: Request, call_next: Callable):
         """Process request with resource limiting
 
@@ -80,49 +123,22 @@ class ResourceLimiterMiddleware(BaseHTTPMiddleware):
             call_next: Next middleware/handler in chain
 
         Returns:
-            Response from next handler or 503 error if resource limit exceeded
+            Response from next handler or 503 error if no slot became free in time
         """
-        # Check if this path should be limited
-        if not self._should_limit(request.url.path):
-            # No limiting for this path, pass through
+        # Cheap requests (status polls, reads) are never queued
+        route_class = None
+        if self._should_limit(request.url.path):
+            route_class = self._route_class(request.method, request.url.path)
+        if route_class is None:
             return await call_next(request)
 
-        # Try to acquire semaphore with timeout
         try:
-            async with asyncio.timeout(self.timeout):
-                acquired = await self.semaphore.acquire()
-
-                if not acquired:
-                    logger.warning(
-                        f"Resource limit exceeded for {request.url.path} "
-                        f"(max_concurrent={self.max_concurrent})"
-                    )
-                    return JSONResponse(
-                        status_code=503,
-                        content={
-                            "detail": "Service temporarily unavailable due to high load. "
-                                     "Please retry after a moment.",
-                            "error": "resource_limit_exceeded"
-                        }
-                    )
-
-                try:
-                    # Process request
-                    logger.debug(
-                        f"Processing request: {request.method} {request.url.path} "
-                        f"(active={self.max_concurrent - self.semaphore._value}/"
-                        f"{self.max_concurrent})"
-                    )
-                    response = await call_next(request)
-                    return response
-                finally:
-                    # Release semaphore
-                    self.semaphore.release()
-
+            wait = await self.limiter.acquire(self.timeout)
         except asyncio.TimeoutError:
+            metrics_collector.record_queue_wait(route_class, self.timeout)
             logger.error(
                 f"Timeout waiting for resource availability: {request.url.path} "
-                f"(timeout={self.timeout}s)"
+                f"(timeout={self.timeout}s, limit={self.limiter.limit:.1f})"
             )
             return JSONResponse(
                 status_code=503,
@@ -131,15 +147,27 @@ class ResourceLimiterMiddleware(BaseHTTPMiddleware):
                     "error": "resource_timeout"
                 }
             )
-        except Exception as e:
-            logger.error(f"Error in resource limiter middleware: {e}", exc_info=True)
-            # On error, try to release semaphore if it was acquired
-            try:
-                self.semaphore.release()
-            except Exception:
-                pass
+
+        metrics_collector.record_queue_wait(route_class, wait)
+        logger.debug(
+            f"Processing request: {request.method} {request.url.path} "
+            f"(active={self.limiter.inflight}/{self.limiter.limit:.1f}, waited={wait:.3f}s)"
+        )
+
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        except Exception:
+            self.limiter.release(dropped=True)
             raise
 
+        # Server errors count as drops (shrink the limit); others feed the latency signal
+        if response.status_code >= 500:
+            self.limiter.release(dropped=True)
+        else:
+            self.limiter.release(latency=time.perf_counter() - start)
+        return response
+
 
 class FileSizeLimiterMiddleware(BaseHTTPMiddleware):
     """Middleware to check file size limits before processing
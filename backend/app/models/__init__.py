@@ -2,4 +2,7 @@ from .task import Task, TaskStatus
 from .deliverable import Deliverable
 from .estimate import Estimate
 from .qa_pair import QAPair
+from .task_question import TaskQuestion
 from .message import Message
+from .job import Job
+from .task_event import TaskEvent
@@ -1,5 +1,5 @@
 """成果物モデル"""
-from sqlalchemy import Column, String, Text, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, ForeignKey
 from app.db.database import Base
 
 
@@ -11,3 +11,4 @@ class Deliverable(Base):
     task_id = Column(String(36), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
+    order = Column(Integer, nullable=False, default=0)  # 入力ファイル上の並び順
@@ -0,0 +1,23 @@
+"""ジョブモデル（見積り処理のバックグラウンドキュー）"""
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.database import Base
+from app.models.task import TaskStatus
+
+
+class Job(Base):
+    """ジョブテーブル
+
+    status は TaskStatus と同じ値（pending/processing/completed/failed）を使う。
+    """
+    __tablename__ = "jobs"
+
+    id = Column(String(36), primary_key=True)
+    task_id = Column(String(36), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(20), default=TaskStatus.PENDING.value, index=True)
+    request_id = Column(String(36))
+    attempts = Column(Integer, nullable=False, default=0)
+    error_message = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
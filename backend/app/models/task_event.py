@@ -0,0 +1,19 @@
+"""タスクイベントモデル（見積り進捗のSSE配信用）"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class TaskEvent(Base):
+    """タスクイベントテーブル
+
+    id は単調増加で、SSE の event id（Last-Event-ID での再開）に使う。
+    data は JSON 文字列。
+    """
+    __tablename__ = "task_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(String(36), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_type = Column(String(20), nullable=False)  # status / estimate / completed / failed
+    data = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,13 @@
+"""生成済み質問モデル"""
+from sqlalchemy import Column, String, Text, Integer, ForeignKey
+from app.db.database import Base
+
+
+class TaskQuestion(Base):
+    """生成済み質問テーブル（タスク作成時に先行生成した質問）"""
+    __tablename__ = "task_questions"
+
+    id = Column(String(36), primary_key=True)
+    task_id = Column(String(36), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    question = Column(Text, nullable=False)
+    order = Column(Integer, nullable=False)
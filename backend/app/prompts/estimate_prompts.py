@@ -3,9 +3,8 @@ from app.core.i18n import t, get_i18n
 from app.prompts.safety_guidelines import get_safety_guidelines
 
 
-def get_estimate_prompt(deliverable: dict, system_requirements: str, qa_text: str) -> str:
-    """見積りプロンプトを生成"""
-    unit = t('prompts.estimate_unit')
+def _get_examples(unit: str) -> tuple:
+    """言語ごとの例文（reasoning_breakdown, reasoning_notes）"""
     language = get_i18n().language
 
     # 言語ごとの例文
@@ -23,6 +22,13 @@ def get_estimate_prompt(deliverable: dict, system_requirements: str, qa_text: st
 - テスト: 2.0 {unit}
 - ドキュメント作成: 1.0 {unit}"""
         notes_example = """本見積もりはECシステムの要件定義書作成に基づいています。要件定義にはシステム全体の要件を整理するための時間が必要です。設計は比較的シンプルであり、実装も潤沢な人員がいるため、工数を抑えています。テストは基本的な機能確認を行うための時間を見込んでいます。リスクとしては、要件の変更や追加が発生する可能性があるため、柔軟に対応できる体制が必要です。"""
+    return breakdown_example, notes_example
+
+
+def get_estimate_prompt(deliverable: dict, system_requirements: str, qa_text: str) -> str:
+    """見積りプロンプトを生成"""
+    unit = t('prompts.estimate_unit')
+    breakdown_example, notes_example = _get_examples(unit)
 
     return f"""
 {t('prompts.estimate_system')}
@@ -73,6 +79,72 @@ def get_estimate_prompt(deliverable: dict, system_requirements: str, qa_text: st
 """
 
 
+def get_batch_estimate_prompt(deliverables: list, system_requirements: str, qa_text: str) -> str:
+    """複数成果物をまとめて見積るプロンプトを生成（共通部分は1回だけ送る）"""
+    unit = t('prompts.estimate_unit')
+    breakdown_example, notes_example = _get_examples(unit)
+
+    items = "\n".join(
+        f"[id={i}] {t('ui.label_deliverable_name')}: {d['name']} / "
+        f"{t('ui.label_deliverable_desc')}: {d.get('description') or ''}"
+        for i, d in enumerate(deliverables)
+    )
+
+    return f"""
+{t('prompts.estimate_system')}
+{t('prompts.estimate_instruction')}
+以下の成果物それぞれについて、個別に見積りを行ってください。
+
+【成果物一覧】
+{items}
+
+【{t('ui.label_system_requirements')}】
+{system_requirements}
+
+【追加情報】
+{qa_text}
+
+【厳守事項】
+- 単位は必ず「{unit}」を使用し、数字の桁を間違えないこと（例: 4.5 {unit}を45と書かない）
+- reasoning_breakdown内のすべての数量表記も「{unit}」とし、小数1桁を維持する
+- 数値と単位の間には必ず半角スペースを入れること
+- すべての成果物について、一覧のidをそのまま使って1件ずつ回答すること
+
+【出力形式】
+次のJSONのみをコードブロックなしで返す：
+{{
+  "estimates": [
+    {{
+      "id": 成果物一覧のid（整数）,
+      "person_days": 小数1桁の数値（例: 4.5）,
+      "reasoning_breakdown": "工数内訳（Markdown可）。工程別の{unit}内訳を箇条書きで記載。",
+      "reasoning_notes": "根拠・備考（Markdown可）。見積りの前提条件、リスク、補足説明など。"
+    }}
+  ]
+}}
+
+【重要】reasoning_breakdownとreasoning_notesは明確に分離すること！
+
+【reasoning_breakdown の記載内容】
+工程別の数値内訳のみを箇条書きで記載。説明文や前提条件は含めない。
+例：
+{breakdown_example}
+
+【reasoning_notes の記載内容】
+見積りの前提条件、リスク、補足説明を記載。工程別の数値内訳は含めない。
+例：
+{notes_example}
+
+【見積り範囲】
+- 設計・実装・テスト・ドキュメント作成を含める
+- 成果物の複雑さを考慮した現実的な工数
+- reasoning_breakdownには工程別の数値内訳のみを統一フォーマットで記載（説明文は含めない）
+- reasoning_notesには前提条件、リスク、注意点、補足説明を記載（数値内訳は含めない）
+
+{t('prompts.language_instruction')}
+"""
+
+
 def get_system_prompt() -> str:
     """システムプロンプトを取得（安全ガイドライン・言語指示付き）"""
     base_prompt = t('prompts.estimate_system')
@@ -32,3 +32,5 @@ class ChatResponse(BaseModel):
     estimates: Optional[List[ChatEstimateItem]] = None
     totals: Optional[Dict[str, float]] = None
     version: Optional[int] = None
+    # 処理経路: quick_action / rule_fast_path（LLMなし） / llm / rules_only / proposals / apply_proposal
+    resolution: Optional[str] = None
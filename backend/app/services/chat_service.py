@@ -3,6 +3,7 @@
 - Quick actions: Immediate calculation with local logic
 - AI estimate adjustment: Generate proposals with OpenAI for free input (message) (synchronous)
 """
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Any, Tuple, Optional
 import uuid
 import time
@@ -12,6 +13,8 @@ from app.core.config import settings
 from app.core.i18n import t
 from app.services.retry_service import retry_with_exponential_backoff
 from app.services.circuit_breaker import openai_circuit_breaker
+from app.services.llm_client import llm_clients
+from app.services.proposal_store import proposal_store
 from app.core.logging_config import get_logger
 from app.core.metrics import metrics_collector
 import json
@@ -27,9 +30,6 @@ except Exception:
 
 
 class ChatService:
-    # 提案キャッシュ（クラス変数として全インスタンス共有）
-    _proposals_cache: Dict[str, List[Dict[str, Any]]] = {}
-
     def __init__(self, db: Session):
         self.db = db
 
@@ -296,10 +296,7 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
     @retry_with_exponential_backoff()
     def _call_intent_analysis_llm(self, prompt: str, request_id: Optional[str] = None) -> str:
         """Call LLM for intent analysis with retry logic"""
-        client = openai.OpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            timeout=10  # 10 seconds timeout for intent analysis
-        )
+        client = llm_clients.get_client(timeout=10)  # 10 seconds timeout for intent analysis
 
         # Use gpt-4o-mini for fast and cost-effective intent analysis
         model = "gpt-4o-mini"
@@ -365,16 +362,26 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
             raise
 
     # --- 自由入力の意図解析と適用（ルールベース） ---
-    def _analyze_and_apply(self, estimates: List[Dict[str, Any]], message: str) -> Tuple[List[Dict[str, Any]], str, bool, List[str]]:
+    def _analyze_and_apply(
+        self,
+        estimates: List[Dict[str, Any]],
+        message: str,
+        use_ai_intent: bool = True,
+        ai_intent: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], str, bool, List[str]]:
+        """
+        use_ai_intent=False: キーワードマッチングのみ（AI意図解析を呼ばない）
+        ai_intent: 取得済みの _analyze_intent_with_ai の結果（指定時は再度呼ばない）
+        """
         # Stage 0: AI Intent Analysis (NEW)
         intent = None
         targets_from_intent = None
         reduce_ratio_from_intent = None
         adjustment_type_from_intent = None
 
-        if _OPENAI_AVAILABLE and getattr(settings, 'OPENAI_API_KEY', None):
+        if ai_intent is not None or (use_ai_intent and _OPENAI_AVAILABLE and getattr(settings, 'OPENAI_API_KEY', None)):
             try:
-                intent = self._analyze_intent_with_ai(message, estimates)
+                intent = ai_intent if ai_intent is not None else self._analyze_intent_with_ai(message, estimates)
                 if intent and intent.get('target_items'):
                     targets_from_intent = [item.lower() for item in intent['target_items']]
                     reduce_ratio_from_intent = intent.get('reduction_ratio')
@@ -384,79 +391,19 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
                     print(f"[Intent] ✗ AI intent analysis returned no target items, fallback to keyword matching")
             except Exception as e:
                 print(f"[Intent] ✗ AI intent analysis failed: {e}, fallback to keyword matching")
-        else:
+        elif use_ai_intent:
             print(f"[Intent] OpenAI unavailable, fallback to keyword matching")
 
         # Stage 1: Keyword-based analysis (fallback if AI intent analysis failed)
-        m = (message or "").lower()
-        targets: list[str] = []
-        # 全体適用フラグ（「全体」「合計」「すべて」などの語彙を検出）
-        # English keywords: 'all', 'total', 'overall', 'entire', 'everything'
-        apply_to_all = any(x in m for x in [
-            '全体', '合計', '全部', 'すべて', '全て', 'トータル', '総額', '総計', '全項目', '全成果物',
-            'all', 'total', 'overall', 'entire', 'everything', 'whole'
-        ])
+        rule_intent = self._parse_rule_intent(message)
+        apply_to_all = rule_intent['apply_to_all']
 
         # Fallback to keyword-based matching if AI intent analysis failed
         if targets_from_intent is None:
             print(f"[RB] Using keyword-based matching (AI intent analysis unavailable)")
-            # ターゲット辞書（大幅に拡張）
-            mapping = {
-                '管理画面': ['管理', '管理画面', 'admin', 'フロント', 'ui', '画面', 'ダッシュボード'],
-                'レポート': ['レポート', '帳票', '出力', '印刷', 'エクスポート'],
-                'api': ['api', 'エンドポイント', 'rest', 'graphql', 'バックエンド', 'サーバ', 'サーバー'],
-                'テスト': ['テスト', '試験', 'test', '検証', 'qa', '品質保証'],
-                '認証': ['認証', 'ログイン', 'login', 'auth', 'セキュリティ', 'セッション', 'パスワード'],
-                'デザイン': ['デザイン', 'design', 'ui', 'ux', 'css', 'スタイル', '見た目'],
-                'インフラ': ['インフラ', 'デプロイ', 'deploy', '環境', '構築', 'サーバ', 'aws', 'クラウド'],
-                'ドキュメント': ['ドキュメント', '資料', '説明', 'マニュアル', '手順書', 'readme'],
-                'データベース': ['データベース', 'db', 'database', 'sql', 'rdb', 'テーブル', 'スキーマ'],
-                '検索': ['検索', 'search', 'サーチ', '全文検索', 'elasticsearch'],
-                '通知': ['通知', 'notification', 'メール', 'mail', 'プッシュ', 'アラート'],
-                '決済': ['決済', 'payment', '課金', '支払', 'クレジット', 'カード'],
-                'バッチ': ['バッチ', 'batch', '定期処理', 'cron', 'ジョブ'],
-            }
-            for key, kws in mapping.items():
-                if any(k in m for k in kws):
-                    targets.extend(kws)
-            # デバッグ出力
-            try:
-                print(f"[RB] message='{message}' norm='{m}' targets={targets} apply_to_all={apply_to_all}")
-            except Exception:
-                pass
-            # 変更率の推定
-            reduce_ratio = None
-            # 明示的なパーセンテージ指定（例: 20%下げる/安く）に対応
-            pct_match = re.search(r"([1-9]\d?)\s*[%％]", m)
-            if pct_match and any(k in m for k in ['下げ', '安く', '削減', '減ら', '縮小', '少なく', '減額', 'カット', 'ダウン']):
-                try:
-                    p = float(pct_match.group(1))
-                    if 0 < p < 100:
-                        reduce_ratio = max(0.1, 1.0 - (p/100.0))
-                except Exception:
-                    pass
-            # 言い回しに応じた既定比率（語彙を大幅に拡張 + English keywords）
-            if reduce_ratio is None and any(x in m for x in [
-                '簡便', '簡易', '簡単', 'シンプル', 'ライト', '軽量', 'ミニマム', '最小限', '必要最小',
-                'simple', 'simpler', 'simplified', 'light', 'lightweight', 'minimal', 'minimum', 'basic'
-            ]):
-                reduce_ratio = 0.7  # 30%削減
-            if reduce_ratio is None and any(x in m for x in [
-                '安く', '安価', 'コストダウン', '費用抑', 'コスト削減', 'コストカット', '予算削減', '節約', 'もう少し安', '少し安', '価格を下げ', '値下げ',
-                'affordable', 'cheaper', 'cheap', 'cost down', 'reduce cost', 'cut cost', 'lower cost', 'save money', 'budget friendly', 'economical'
-            ]):
-                reduce_ratio = 0.8  # 20%削減
-            if reduce_ratio is None and any(x in m for x in ['大幅', 'かなり', 'もっと下げ', '大きく下げ', '大きく削減', '大胆', '思い切']):
-                reduce_ratio = 0.6  # 40%削減
-            # 軽度の削減を示す語彙
-            if reduce_ratio is None and any(x in m for x in ['少し下げ', '若干下げ', 'ちょっと下げ', '少しだけ', 'わずかに', '微調整']):
-                reduce_ratio = 0.9  # 10%削減
-            # 中度の削減を示す語彙
-            if reduce_ratio is None and any(x in m for x in ['ある程度', '適度', '程々', 'そこそこ', 'まあまあ']):
-                reduce_ratio = 0.85  # 15%削減
-
-            # 完全除外
-            full_remove = any(x in m for x in ['除外', '外す', '不要'])
+            targets = rule_intent['targets']
+            reduce_ratio = rule_intent['reduce_ratio']
+            full_remove = rule_intent['full_remove']
         else:
             # Use AI intent analysis results
             print(f"[Intent] Using AI intent analysis results (skipping keyword matching)")
@@ -609,6 +556,429 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
 
         return new_ests, note, has_changes, changed_item_names
 
+    # 全体適用を示す語彙
+    _RULE_WHOLE_ESTIMATE_WORDS = [
+        '全体', '合計', '全部', 'すべて', '全て', 'トータル', '総額', '総計', '全項目', '全成果物',
+        'all', 'total', 'overall', 'entire', 'everything', 'whole'
+    ]
+    # ルールエンジンのターゲット辞書（カテゴリ → マッチング用キーワード）
+    _RULE_TARGET_KEYWORDS = {
+        '管理画面': ['管理', '管理画面', 'admin', 'フロント', 'ui', '画面', 'ダッシュボード'],
+        'レポート': ['レポート', '帳票', '出力', '印刷', 'エクスポート'],
+        'api': ['api', 'エンドポイント', 'rest', 'graphql', 'バックエンド', 'サーバ', 'サーバー'],
+        'テスト': ['テスト', '試験', 'test', '検証', 'qa', '品質保証'],
+        '認証': ['認証', 'ログイン', 'login', 'auth', 'セキュリティ', 'セッション', 'パスワード'],
+        'デザイン': ['デザイン', 'design', 'ui', 'ux', 'css', 'スタイル', '見た目'],
+        'インフラ': ['インフラ', 'デプロイ', 'deploy', '環境', '構築', 'サーバ', 'aws', 'クラウド'],
+        'ドキュメント': ['ドキュメント', '資料', '説明', 'マニュアル', '手順書', 'readme'],
+        'データベース': ['データベース', 'db', 'database', 'sql', 'rdb', 'テーブル', 'スキーマ'],
+        '検索': ['検索', 'search', 'サーチ', '全文検索', 'elasticsearch'],
+        '通知': ['通知', 'notification', 'メール', 'mail', 'プッシュ', 'アラート'],
+        '決済': ['決済', 'payment', '課金', '支払', 'クレジット', 'カード'],
+        'バッチ': ['バッチ', 'batch', '定期処理', 'cron', 'ジョブ'],
+    }
+
+    def _parse_rule_intent(self, message: str) -> Dict[str, Any]:
+        """
+        キーワード辞書による意図解析（LLMを使わない）
+
+        Returns:
+            {
+                "targets": [...],           # マッチング用キーワード
+                "categories": [...],        # マッチしたターゲット辞書のキー
+                "apply_to_all": bool,
+                "reduce_ratio": 0.8 | None,
+                "ratio_source": "explicit_percent" | "vocabulary" | None,
+                "full_remove": bool,
+            }
+        """
+        m = (message or "").lower()
+        targets: list[str] = []
+        categories: list[str] = []
+        # 全体適用フラグ（「全体」「合計」「すべて」などの語彙を検出）
+        # English keywords: 'all', 'total', 'overall', 'entire', 'everything'
+        apply_to_all = any(x in m for x in self._RULE_WHOLE_ESTIMATE_WORDS)
+
+        for key, kws in self._RULE_TARGET_KEYWORDS.items():
+            if any(k in m for k in kws):
+                targets.extend(kws)
+                categories.append(key)
+        # デバッグ出力
+        try:
+            print(f"[RB] message='{message}' norm='{m}' categories={categories} apply_to_all={apply_to_all}")
+        except Exception:
+            pass
+        # 変更率の推定
+        reduce_ratio = None
+        ratio_source = None
+        # 明示的なパーセンテージ指定（例: 20%下げる/安く、reduce by 20%）に対応
+        pct_match = re.search(r"([1-9]\d?)\s*[%％]", m)
+        if pct_match and any(k in m for k in [
+            '下げ', '安く', '削減', '減ら', '縮小', '少なく', '減額', 'カット', 'ダウン',
+            'reduce', 'cut', 'lower', 'decrease'
+        ]):
+            try:
+                p = float(pct_match.group(1))
+                if 0 < p < 100:
+                    reduce_ratio = max(0.1, 1.0 - (p/100.0))
+                    ratio_source = 'explicit_percent'
+            except Exception:
+                pass
+        # 言い回しに応じた既定比率（語彙を大幅に拡張 + English keywords）
+        if reduce_ratio is None and any(x in m for x in [
+            '簡便', '簡易', '簡単', 'シンプル', 'ライト', '軽量', 'ミニマム', '最小限', '必要最小',
+            'simple', 'simpler', 'simplified', 'light', 'lightweight', 'minimal', 'minimum', 'basic'
+        ]):
+            reduce_ratio = 0.7  # 30%削減
+        if reduce_ratio is None and any(x in m for x in [
+            '安く', '安価', 'コストダウン', '費用抑', 'コスト削減', 'コストカット', '予算削減', '節約', 'もう少し安', '少し安', '価格を下げ', '値下げ',
+            'affordable', 'cheaper', 'cheap', 'cost down', 'reduce cost', 'cut cost', 'lower cost', 'save money', 'budget friendly', 'economical'
+        ]):
+            reduce_ratio = 0.8  # 20%削減
+        if reduce_ratio is None and any(x in m for x in ['大幅', 'かなり', 'もっと下げ', '大きく下げ', '大きく削減', '大胆', '思い切']):
+            reduce_ratio = 0.6  # 40%削減
+        # 軽度の削減を示す語彙
+        if reduce_ratio is None and any(x in m for x in ['少し下げ', '若干下げ', 'ちょっと下げ', '少しだけ', 'わずかに', '微調整']):
+            reduce_ratio = 0.9  # 10%削減
+        # 中度の削減を示す語彙
+        if reduce_ratio is None and any(x in m for x in ['ある程度', '適度', '程々', 'そこそこ', 'まあまあ']):
+            reduce_ratio = 0.85  # 15%削減
+
+        # 完全除外
+        full_remove = any(x in m for x in ['除外', '外す', '不要'])
+        if reduce_ratio is not None and ratio_source is None:
+            ratio_source = 'vocabulary'
+
+        return {
+            'targets': targets,
+            'categories': categories,
+            'apply_to_all': apply_to_all,
+            'reduce_ratio': reduce_ratio,
+            'ratio_source': ratio_source,
+            'full_remove': full_remove,
+        }
+
+    # 増額・追加・質問など、ルールエンジン（削減・除外のみ）では扱えない依頼の語彙
+    _RULE_OUT_OF_SCOPE_WORDS = [
+        '増', '追加', 'アップ', '上げ', '強化', '充実', '？', '?',
+        'increase', 'add', 'more', 'enhance', 'improve', 'extend', 'raise',
+    ]
+    # 除外・相対指定（「〜以外」「残り」）。ルールは対象を反転できないためLLMに任せる
+    _RULE_EXCLUSION_WORDS = [
+        '以外', '除く', '除いて', '除き', 'のぞく', '残り', 'ほか', '他の', 'そのまま', '維持',
+        'except', 'excluding', 'other than', 'besides', 'but', 'keep', 'rest', 'others', 'remaining',
+    ]
+    # 目標値としての%指定（「20%に」「20%まで」「to 20%」）。ルールは削減率として扱うためLLMに任せる
+    _RULE_TARGET_PERCENT_PATTERNS = [
+        r"\d+(?:\.\d+)?\s*[%％]\s*(?:に|まで|程度に)",
+        r"\bto\s+\d+(?:\.\d+)?\s*%",
+        r"\d+(?:\.\d+)?\s*%\s*of\b",
+    ]
+
+    @staticmethod
+    def _contains_word(text: str, word: str) -> bool:
+        """
+        語の出現判定。英数字の語は単語境界で判定（複数形・-ing/-ed は許容）、
+        日本語など空白で区切らない語は部分一致で判定する
+        """
+        if not word.isascii():
+            return word in text
+        return re.search(
+            rf"(?<![a-z0-9]){re.escape(word)}(?:s|es|ing|ed)?(?![a-z0-9])", text
+        ) is not None
+
+    def _score_rule_intent(self, message: str, rule_intent: Dict[str, Any]) -> Tuple[float, List[str]]:
+        """
+        キーワード解析結果の確信度（0.0〜1.0）を算出する
+
+        対象（単一のカテゴリ、または全体指定）と変更量（明示的な%指定、または除外）が
+        いずれも一意に決まる場合に 1.0 になる。
+
+        Returns:
+            (confidence, 減点・加点の理由)
+        """
+        m = (message or "").lower()
+        reasons = []
+        score = 0.0
+
+        # 変更量
+        if rule_intent['full_remove'] and rule_intent['ratio_source'] == 'explicit_percent':
+            reasons.append("conflicting remove and percentage")
+        elif rule_intent['full_remove']:
+            score += 0.5
+            reasons.append("remove")
+        elif rule_intent['ratio_source'] == 'explicit_percent':
+            score += 0.5
+            reasons.append("explicit percentage")
+        elif rule_intent['ratio_source'] == 'vocabulary':
+            score += 0.2
+            reasons.append("ratio from vague wording")
+        else:
+            reasons.append("no amount")
+
+        # 除外・目標値の指定はルールでは正しく解釈できない → LLMに任せる
+        if any(self._contains_word(m, w) for w in self._RULE_EXCLUSION_WORDS):
+            return 0.0, reasons + ["exclusion or relative wording"]
+        if any(re.search(p, m) for p in self._RULE_TARGET_PERCENT_PATTERNS):
+            return 0.0, reasons + ["target percentage wording"]
+
+        # 対象（英語キーワードは単語として一致した場合のみ確定した対象とみなす。
+        # 「testing」は可、「restaurant」の rest のような語中の一致は不可）
+        categories = rule_intent['categories']
+        word_matched = [
+            c for c in categories
+            if any(self._contains_word(m, k) for k in self._RULE_TARGET_KEYWORDS.get(c, []))
+        ]
+        if len(word_matched) != len(categories) or (
+            rule_intent['apply_to_all']
+            and not any(self._contains_word(m, w) for w in self._RULE_WHOLE_ESTIMATE_WORDS)
+        ):
+            score -= 0.3
+            reasons.append("keyword matched inside another word")
+        if len(categories) == 1 and not rule_intent['apply_to_all']:
+            score += 0.5
+            reasons.append(f"single target '{categories[0]}'")
+        elif rule_intent['apply_to_all'] and not categories:
+            score += 0.5
+            reasons.append("whole estimate")
+        elif categories or rule_intent['apply_to_all']:
+            score += 0.2
+            reasons.append("several possible targets")
+        else:
+            reasons.append("no target")
+
+        # ルールでは表現できない依頼・長文の複合依頼
+        if any(w in m for w in self._RULE_OUT_OF_SCOPE_WORDS):
+            score -= 0.5
+            reasons.append("increase or question wording")
+        if len(m) > 120:
+            score -= 0.2
+            reasons.append("long message")
+
+        return max(0.0, min(1.0, score)), reasons
+
+    def _resolve_locally(
+        self, estimates: List[Dict[str, Any]], message: str
+    ) -> Optional[Tuple[Tuple[List[Dict[str, Any]], str, bool, List[str]], float]]:
+        """
+        ルールエンジンだけで確定できる依頼をLLMなしで処理する
+
+        Returns:
+            (_analyze_and_apply と同じ戻り値, 確信度)、確定できない場合は None
+        """
+        if not settings.CHAT_RULE_FAST_PATH_ENABLED:
+            return None
+
+        confidence, reasons = self._score_rule_intent(message, self._parse_rule_intent(message))
+        if confidence < settings.CHAT_RULE_FAST_PATH_MIN_CONFIDENCE:
+            print(f"[RB] Fast path skipped: confidence={confidence:.2f} reasons={reasons}")
+            return None
+
+        result = self._analyze_and_apply(estimates, message, use_ai_intent=False)
+        if not result[2]:
+            # 確信度は高いが該当する成果物がない → LLMに任せる
+            print(f"[RB] Fast path skipped: no matching deliverables (confidence={confidence:.2f})")
+            return None
+
+        print(f"[RB] ✓ Fast path: resolved locally without LLM (confidence={confidence:.2f} reasons={reasons})")
+        return result, confidence
+
+    # --- AI調整（自由入力） ---
+    def _build_adjustment_prompt(self, estimates: List[Dict[str, Any]], message: str, changed_item_names: List[str]) -> Dict[str, str]:
+        """
+        ルール適用後の見積りを基準にAI調整プロンプトを組み立てる
+
+        トークン削減のため、見積りは項目名と数値（人日・金額）のみを送り、
+        応答には変更した項目だけ（差分）を返させる。根拠などの長文は送らず、
+        差分は _merge_adjustment_delta でローカルの見積りにマージする。
+        """
+        # 言語指示を取得
+        language_instruction = t('prompts.chat_language_instruction')
+
+        # Build list of items adjusted by rule-based processing
+        rule_adjusted_items_text = ""
+        if changed_item_names:
+            rule_adjusted_items_text = f"\n\n**Items adjusted by rule-based processing**: {', '.join(changed_item_names)}\n"
+
+        # 名前と数値のみのコンパクトな表現（idは1始まりの位置）
+        compact_items = [
+            {
+                "id": i + 1,
+                "name": e.get("deliverable_name") or "",
+                "person_days": round(float(e.get("person_days") or 0.0), 1),
+                "amount": round(float(e.get("amount") or 0.0)),
+            }
+            for i, e in enumerate(estimates)
+        ]
+
+        # daily unit cost は設定値を伝え、金額整合を要求
+        return {
+            "role": "user",
+            "content": (
+                f"{language_instruction}\n\n"
+                "**CRITICAL INSTRUCTION**:\n"
+                "1. Only adjust the values (person_days, amount) for items specifically mentioned in the user's request below.\n"
+                "2. Return ONLY the items you changed in the changes array. Omit unchanged items; return an empty array if nothing changes.\n"
+                "3. Identify each changed item by its id from the current estimate.\n"
+                f"{rule_adjusted_items_text}"
+                "以下は現在の見積です。指定された項目のみの人日(person_days)と金額(amount)を単価"
+                f"{settings.get_daily_unit_cost()}{t('ui.unit_yen')}/人日で整合がとれるように調整し、依頼文に沿って改善案を出してください。\n"
+                "JSONのみ、コードブロックなしで返してください。フィールドは reply_md, changes(配列) のみ。\n"
+                "changes の各要素は {id, deliverable_name, person_days(小数1桁), amount(数値), reasoning(短いMarkdown可)} とします。合計はこちらで計算します。\n\n"
+                "依頼文:\n" + (message or "") + "\n\n"
+                "現在の見積(JSON):\n" + json.dumps(compact_items, ensure_ascii=False, separators=(",", ":"))
+            ),
+        }
+
+    @staticmethod
+    def _to_number(val, default=0.0):
+        """LLM応答の数値を寛容に変換する（null・カンマ・円・%を含む文字列に対応）"""
+        try:
+            # JSONでnullが来る場合もある
+            if val is None:
+                return float(default)
+            # 文字列が来た場合の簡易パース（カンマや全角記号除去）
+            if isinstance(val, str):
+                v = val.replace(',', '').replace('円', '').replace('％', '').replace('%', '')
+                return float(v)
+            return float(val)
+        except Exception:
+            return float(default)
+
+    def _merge_adjustment_delta(
+        self, estimates: List[Dict[str, Any]], data: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        AI調整の差分応答を現在の見積りにマージする
+
+        changes の各要素は id（1始まりの位置）で、無ければ項目名で照合する。
+        id と項目名が別の項目を指す要素や、照合できない要素は無視し、
+        応答に含まれない項目は変更しない。
+        changes が無く従来形式の estimates（全件）が返った場合も同様に差分として扱う。
+
+        Returns:
+            (マージ後の見積り（全件）, 実際に変更された項目数)
+        """
+        changes = data.get("changes")
+        if changes is None:
+            changes = data.get("estimates") or []
+        if not isinstance(changes, list):
+            return [dict(e) for e in estimates], 0
+
+        merged = [dict(e) for e in estimates]
+        index_by_name = {
+            (e.get('deliverable_name') or '').lower(): i for i, e in enumerate(merged)
+        }
+        adjustment_note = t('messages.adjustment_note_ai_proposal')
+        changed = set()
+        for change in changes:
+            if not isinstance(change, dict):
+                continue
+            idx = None
+            try:
+                item_id = int(change.get("id"))
+                if 1 <= item_id <= len(merged):
+                    idx = item_id - 1
+            except (TypeError, ValueError):
+                pass
+            name_idx = index_by_name.get((change.get("deliverable_name") or change.get("name") or '').lower())
+            if idx is not None and name_idx is not None and idx != name_idx:
+                # id と項目名が別の項目を指す場合、どちらが正しいか判断できないので適用しない
+                try:
+                    print(f"[AI] Ignoring change with conflicting id and name: {change.get('id')} {change.get('deliverable_name') or change.get('name')}")
+                except Exception:
+                    pass
+                logger.warning(
+                    "Adjustment change id and name disagree, skipped",
+                    item_id=change.get("id"),
+                    deliverable_name=change.get("deliverable_name") or change.get("name")
+                )
+                continue
+            if idx is None:
+                idx = name_idx
+            if idx is None:
+                try:
+                    print(f"[AI] Ignoring change for unknown item: {change.get('id')} {change.get('deliverable_name')}")
+                except Exception:
+                    pass
+                continue
+
+            current = estimates[idx]
+            pd = self._to_number(change.get("person_days"), current.get("person_days", 0.0))
+            amt = self._to_number(change.get("amount"), pd * settings.get_daily_unit_cost())
+            if (abs(pd - float(current.get("person_days") or 0.0)) < 0.05
+                    and abs(amt - float(current.get("amount") or 0.0)) < 0.5):
+                continue
+
+            # 根拠（reasoning_breakdown）は現在の見積りのものを保持し、備考に調整注記を追加
+            reasoning_notes = current.get("reasoning_notes") or ""
+            if reasoning_notes and adjustment_note not in reasoning_notes:
+                reasoning_notes = f"{reasoning_notes}\n\n{adjustment_note}"
+            elif not reasoning_notes:
+                reasoning_notes = adjustment_note
+            merged[idx] = {
+                **current,
+                "person_days": pd,
+                "amount": amt,
+                "reasoning": change.get("reasoning") or current.get("reasoning") or "",
+                "reasoning_breakdown": current.get("reasoning_breakdown") or change.get("reasoning") or "",
+                "reasoning_notes": reasoning_notes,
+            }
+            changed.add(idx)
+
+        return merged, len(changed)
+
+    def _analyze_and_adjust_concurrently(
+        self, estimates: List[Dict[str, Any]], message: str
+    ) -> Tuple[Tuple[List[Dict[str, Any]], str, bool, List[str]], Future, Dict[str, str]]:
+        """
+        意図解析LLMとAI調整LLMを同時に実行する
+
+        AI調整のプロンプトはルール適用後の見積りに依存するため、キーワード
+        マッチングによるルール適用結果を基準に投機的に開始する。意図解析の
+        結果が返ったら、それに基づくルール適用結果を改めて計算する。
+
+        - 基準が一致（意図解析失敗も含む）: 逐次実行と同じプロンプトなのでそのまま使う
+        - 基準が異なる: 投機的な応答は別の数値に対する調整なので使わず、意図解析ベースの
+          ルール適用結果からプロンプトを作り直してAI調整を再実行する（逐次実行と同じ結果）
+
+        Returns:
+            (_analyze_and_apply と同じ戻り値, AI調整の応答を返す Future, 実際に送信したプロンプト)
+        """
+        keyword_result = self._analyze_and_apply(estimates, message, use_ai_intent=False)
+        prompt = self._build_adjustment_prompt(keyword_result[0], message, keyword_result[3])
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-llm") as ex:
+            intent_future = ex.submit(self._analyze_intent_with_ai, message, estimates)
+            adjustment_future = ex.submit(self._call_adjustment_llm_with_retry, prompt)
+            intent = intent_future.result()  # 例外は _analyze_intent_with_ai 内で None に変換済み
+
+            if intent and intent.get('target_items'):
+                result = self._analyze_and_apply(estimates, message, ai_intent=intent)
+            else:
+                print(f"[Intent] ✗ AI intent analysis returned no target items, fallback to keyword matching")
+                result = keyword_result
+
+            speculation_hit = result is keyword_result or (
+                result[0] == keyword_result[0] and result[3] == keyword_result[3]
+            )
+            if not speculation_hit:
+                # 意図解析の空いたワーカーで再実行する（投機的な呼び出しと並行して走る）
+                prompt = self._build_adjustment_prompt(result[0], message, result[3])
+                adjustment_future = ex.submit(self._call_adjustment_llm_with_retry, prompt)
+
+        try:
+            print(f"[AI] Concurrent intent/adjustment calls finished in {time.perf_counter() - start:.2f}s (speculative base {'matched' if speculation_hit else 'differed, re-issued adjustment'})")
+        except Exception:
+            pass
+        logger.info(
+            "Chat adjustment pipeline completed",
+            speculation_hit=speculation_hit,
+            duration=round(time.perf_counter() - start, 3)
+        )
+        return result, adjustment_future, prompt
+
     # --- 金額調整検出（2ステップフロー用） ---
     def _detect_adjustment_request(self, message: str) -> Dict[str, Any] | None:
         """
@@ -814,10 +1184,7 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
     @retry_with_exponential_backoff()
     def _call_proposal_llm_with_retry(self, prompt: str, request_id: Optional[str] = None) -> str:
         """Call LLM for proposal generation with retry logic"""
-        client = openai.OpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            timeout=settings.OPENAI_TIMEOUT
-        )
+        client = llm_clients.get_client()
 
         # System prompt with language instruction
         system_prompt = f"{t('prompts.chat_system')}\n\n{t('prompts.chat_language_instruction')}\n\nあなたは厳密なフォーマットで応答する上級PMです。JSON形式のみで返答してください。"
@@ -886,10 +1253,7 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
     @retry_with_exponential_backoff()
     def _call_adjustment_llm_with_retry(self, prompt: dict, request_id: Optional[str] = None) -> str:
         """Call LLM for general adjustment with retry logic"""
-        client = openai.OpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            timeout=settings.OPENAI_TIMEOUT
-        )
+        client = llm_clients.get_client()
 
         # System prompt with language instruction
         system_prompt = f"{t('prompts.chat_system')}\n\n{t('prompts.chat_language_instruction')}\n\nあなたは厳密なフォーマットで応答する上級PMです。"
@@ -1020,12 +1384,12 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
 
     # --- キャッシュ管理 ---
     def _cache_proposals(self, task_id: str, proposals: List[Dict[str, Any]]) -> None:
-        """提案をキャッシュに保存"""
-        self._proposals_cache[task_id] = proposals
+        """提案を共有ストアに保存（別ワーカーでの適用リクエストからも参照できる）"""
+        proposal_store.set(task_id, proposals)
 
     def _get_cached_proposals(self, task_id: str) -> List[Dict[str, Any]]:
-        """キャッシュから提案を取得"""
-        return self._proposals_cache.get(task_id, [])
+        """共有ストアから提案を取得（期限切れ・追い出し済みなら空）"""
+        return proposal_store.get(task_id)
 
     def process(self, task_id: str, message: str | None, intent: str | None, params: Dict[str, Any] | None, provided_estimates: List[Dict[str, Any]] | None = None) -> Dict[str, Any]:
         # 読み込み
@@ -1095,6 +1459,7 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
                     "estimates": final_estimates,
                     "totals": totals,
                     "version": 2,
+                    "resolution": "apply_proposal",
                 }
             except Exception as e:
                 print(f"[ChatService] 提案適用エラー: {e}")
@@ -1150,6 +1515,7 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
                     "estimates": separated_ests,  # 現在の見積を保持
                     "totals": self._calc_totals(separated_ests),
                     "version": 2,
+                    "resolution": "proposals",
                 }
             else:
                 # 提案生成失敗時は従来の処理にフォールバック
@@ -1174,6 +1540,7 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
                     "estimates": separated_ests,
                     "totals": self._calc_totals(separated_ests),
                     "version": 2,
+                    "resolution": "proposals",
                 }
 
         # --- 従来の処理（クイックアクション、ルールベース、AI調整） ---
@@ -1185,19 +1552,9 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
         updated = ests
         note = None
 
-        def _num(val, default=0.0):
-            try:
-                # JSONでnullが来る場合もある
-                if val is None:
-                    return float(default)
-                # 文字列が来た場合の簡易パース（カンマや全角記号除去）
-                if isinstance(val, str):
-                    v = val.replace(',', '').replace('円', '').replace('％', '').replace('%', '')
-                    return float(v)
-                return float(val)
-            except Exception:
-                return float(default)
+        _num = self._to_number
 
+        resolution = "quick_action"  # 処理経路（レスポンスの resolution）
         if intent == "fit_budget":
             cap = _num((params or {}).get("cap", 0))
             updated, note = self._fit_budget(updated, cap)
@@ -1211,45 +1568,33 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
             keywords = (params or {}).get("keywords", [])
             updated, note = self._scope_reduce(updated, keywords)
         else:
-            # 自由入力: まずはルールで適用 → さらにAI案が取れれば上書き
-            updated, rule_note, has_rule_changes, changed_item_names = self._analyze_and_apply(updated, message or "")
+            # 自由入力: ルールで確定できればLLMを呼ばずに終了
+            llm_enabled = bool(_OPENAI_AVAILABLE and getattr(settings, 'OPENAI_API_KEY', None))
+            local = self._resolve_locally(updated, message or "")
+            adjustment_future = None
+            sent_prompt = None
+            if local is not None:
+                (updated, rule_note, has_rule_changes, changed_item_names), confidence = local
+                rule_note += "\n\n" + t('messages.adjustment_resolved_locally').replace('{confidence}', f'{confidence * 100:.0f}')
+                resolution = "rule_fast_path"
+                llm_enabled = False
+            # それ以外: まずはルールで適用 → さらにAI案が取れれば上書き
+            elif llm_enabled and settings.CHAT_CONCURRENT_ADJUSTMENT:
+                # 意図解析とAI調整を同時に開始（2回の往復を待たない）
+                (updated, rule_note, has_rule_changes, changed_item_names), adjustment_future, sent_prompt = \
+                    self._analyze_and_adjust_concurrently(updated, message or "")
+                resolution = "llm"
+            else:
+                updated, rule_note, has_rule_changes, changed_item_names = self._analyze_and_apply(updated, message or "")
+                resolution = "llm" if llm_enabled else "rules_only"
             note = rule_note
             # AI調整前の状態を保存（例外発生時に復元するため）
             updated_before_ai = [dict(e) for e in updated]
             ai_adjusted = False  # AI調整が成功したかどうかのフラグ
-            if _OPENAI_AVAILABLE and getattr(settings, 'OPENAI_API_KEY', None):
+            if llm_enabled:
                 try:
-                    # 言語指示を取得
-                    language_instruction = t('prompts.chat_language_instruction')
-
-                    # Build list of items adjusted by rule-based processing
-                    rule_adjusted_items_text = ""
-                    if changed_item_names:
-                        rule_adjusted_items_text = f"\n\n**Items adjusted by rule-based processing**: {', '.join(changed_item_names)}\n"
-
-                    # daily unit cost は設定値を伝え、金額整合を要求
-                    # Count total items to inform AI
-                    total_items_count = len(updated)
-
-                    prompt = {
-                        "role": "user",
-                        "content": (
-                            f"{language_instruction}\n\n"
-                            "**CRITICAL INSTRUCTION**:\n"
-                            f"1. You MUST return ALL {total_items_count} items in the estimates array.\n"
-                            "2. Only adjust the values (person_days, amount) for items specifically mentioned in the user's request below.\n"
-                            "3. For items NOT mentioned in the request, keep their original values UNCHANGED.\n"
-                            "4. Do NOT remove, exclude, or omit any items from the estimates array.\n"
-                            f"{rule_adjusted_items_text}"
-                            "以下は現在の見積です。指定された項目のみの人日(person_days)と金額(amount)を単価"
-                            f"{settings.get_daily_unit_cost()}{t('ui.unit_yen')}/人日で整合がとれるように調整し、依頼文に沿って改善案を出してください。\n"
-                            "JSONのみ、コードブロックなしで返してください。フィールドは reply_md, estimates(配列), totals のみ。\n"
-                            "estimates の各要素は {deliverable_name, deliverable_description, person_days(小数1桁), amount(数値), reasoning(短いMarkdown可)} とします。\n"
-                            f"totals は {{subtotal, tax, total}}（税率{settings.get_tax_rate()*100:.0f}%）です。\n\n"
-                            "依頼文:\n" + (message or "") + "\n\n"
-                            "現在の見積(JSON):\n" + json.dumps(updated, ensure_ascii=False)
-                        ),
-                    }
+                    # 並行実行済みなら実際に送信したプロンプトをログに出す
+                    prompt = sent_prompt or self._build_adjustment_prompt(updated, message or "", changed_item_names)
 
                     # Debug: Print AI prompt
                     try:
@@ -1259,8 +1604,11 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
                     except Exception:
                         pass
 
-                    # Call LLM with retry
-                    content = self._call_adjustment_llm_with_retry(prompt)
+                    # Call LLM with retry (並行実行済みならその結果を使う)
+                    if adjustment_future is not None:
+                        content = adjustment_future.result()
+                    else:
+                        content = self._call_adjustment_llm_with_retry(prompt)
 
                     # Debug: Print AI response
                     try:
@@ -1272,115 +1620,63 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
                     m = re.search(r"\{.*\}\s*$", content, re.DOTALL)
                     if m:
                         data = json.loads(m.group(0))
-                        ai_estimates = data.get("estimates") or []
-
-                        # Debug: Count changed items in AI response
+                        # 変更された項目だけを受け取り、現在の見積りにマージする（件数の不一致は起きない）
+                        norm, ai_changed_count = self._merge_adjustment_delta(updated, data)
                         try:
-                            ai_changed_count = 0
-                            for ai_est in ai_estimates:
-                                ai_name = (ai_est.get("deliverable_name") or "").lower()
-                                for orig_est in updated_before_ai:
-                                    orig_name = (orig_est.get("deliverable_name") or "").lower()
-                                    if ai_name == orig_name:
-                                        ai_pd = float(ai_est.get("person_days", 0.0))
-                                        orig_pd = float(orig_est.get("person_days", 0.0))
-                                        if abs(ai_pd - orig_pd) >= 0.05:
-                                            ai_changed_count += 1
-                                        break
                             print(f"[AI] AI changed {ai_changed_count} items")
                             print(f"[AI] Rule-based changed {len(changed_item_names)} items")
-                        except Exception as e:
-                            print(f"[AI] Failed to count changed items: {e}")
+                        except Exception:
                             pass
-                        if ai_estimates:
-                            # Validate: AI must return the same number of items
-                            if len(ai_estimates) != len(updated):
+                        if ai_changed_count:
+                            # AI案がルール適用結果と実質同じなら、ルール結果を保持
+                            def _differs(a, b):
+                                if len(a) != len(b):
+                                    return True
+                                amap = { (x.get('deliverable_name') or '').lower(): x for x in a }
+                                for y in b:
+                                    k = (y.get('deliverable_name') or '').lower()
+                                    x = amap.get(k)
+                                    if not x:
+                                        return True
+                                    if abs(float(x.get('person_days',0.0)) - float(y.get('person_days',0.0))) >= 0.05:
+                                        return True
+                                    if abs(float(x.get('amount',0.0)) - float(y.get('amount',0.0))) >= 0.5:
+                                        return True
+                                return False
+                            if _differs(norm, updated):
+                                # Debug: Log AI adoption decision
                                 try:
-                                    print(f"[AI] ✗ AI response REJECTED: Item count mismatch (AI returned {len(ai_estimates)} items, expected {len(updated)} items)")
+                                    print(f"[AI] AI adoption decision:")
+                                    print(f"[AI]   has_rule_changes={has_rule_changes}")
+                                    print(f"[AI]   ai_changed_count={ai_changed_count}")
+                                    print(f"[AI]   rule_changed_count={len(changed_item_names)}")
                                 except Exception:
                                     pass
-                                # Do not adopt AI proposal, keep rule-based result
-                            else:
-                                # 正規化
-                                # Create a map from current estimates to preserve reasoning_breakdown and reasoning_notes
-                                current_map = {
-                                    (est.get('deliverable_name') or '').lower(): est
-                                    for est in updated
-                                }
-                                norm = []
-                                for e in ai_estimates:
-                                    pd = _num(e.get("person_days", 0.0), 0.0)
-                                    amt = _num(e.get("amount", pd * settings.get_daily_unit_cost()), 0.0)
-                                    # Preserve reasoning_breakdown and reasoning_notes from current estimate
-                                    deliverable_name = e.get("deliverable_name")
-                                    current_est = current_map.get((deliverable_name or '').lower())
-                                    reasoning_breakdown = e.get("reasoning_breakdown") or (current_est.get("reasoning_breakdown") if current_est else None) or e.get("reasoning") or ""
-                                    reasoning_notes = e.get("reasoning_notes") or (current_est.get("reasoning_notes") if current_est else None) or ""
-                                    # Add AI adjustment note
-                                    adjustment_note = t('messages.adjustment_note_ai_proposal')
-                                    # Check if adjustment note already exists to avoid duplicates
-                                    if reasoning_notes and adjustment_note not in reasoning_notes:
-                                        reasoning_notes = f"{reasoning_notes}\n\n{adjustment_note}"
-                                    elif not reasoning_notes:
-                                        reasoning_notes = adjustment_note
-                                    norm.append({
-                                        "deliverable_name": deliverable_name,
-                                        "deliverable_description": e.get("deliverable_description"),
-                                        "person_days": pd,
-                                        "amount": amt,
-                                        "reasoning": e.get("reasoning") or "",
-                                        "reasoning_breakdown": reasoning_breakdown,
-                                        "reasoning_notes": reasoning_notes,
-                                    })
-                                # AI案がルール適用結果と実質同じなら、ルール結果を保持
-                                def _differs(a, b):
-                                    if len(a) != len(b):
-                                        return True
-                                    amap = { (x.get('deliverable_name') or '').lower(): x for x in a }
-                                    for y in b:
-                                        k = (y.get('deliverable_name') or '').lower()
-                                        x = amap.get(k)
-                                        if not x:
-                                            return True
-                                        if abs(float(x.get('person_days',0.0)) - float(y.get('person_days',0.0))) >= 0.05:
-                                            return True
-                                        if abs(float(x.get('amount',0.0)) - float(y.get('amount',0.0))) >= 0.5:
-                                            return True
-                                    return False
-                                if _differs(norm, updated):
-                                    # Debug: Log AI adoption decision
+
+                                # ルールベースで変更がない場合はAI案を無条件で採用
+                                # ルールベースで変更がある場合は、AI案の総額が下がる場合のみ採用
+                                if not has_rule_changes:
+                                    updated = norm
+                                    ai_adjusted = True  # AI調整成功フラグ
                                     try:
-                                        print(f"[AI] AI adoption decision:")
-                                        print(f"[AI]   has_rule_changes={has_rule_changes}")
-                                        print(f"[AI]   ai_changed_count={ai_changed_count if 'ai_changed_count' in locals() else 'unknown'}")
-                                        print(f"[AI]   rule_changed_count={len(changed_item_names)}")
+                                        print(f"[AI] ✓ AI proposal ADOPTED (no rule-based changes)")
                                     except Exception:
                                         pass
-
-                                    # ルールベースで変更がない場合はAI案を無条件で採用
-                                    # ルールベースで変更がある場合は、AI案の総額が下がる場合のみ採用
-                                    if not has_rule_changes:
+                                else:
+                                    ai_tot = self._calc_totals(norm).get('total', 0.0)
+                                    rb_tot = self._calc_totals(updated).get('total', 0.0)
+                                    if ai_tot < rb_tot - 1e-3:
                                         updated = norm
                                         ai_adjusted = True  # AI調整成功フラグ
                                         try:
-                                            print(f"[AI] ✓ AI proposal ADOPTED (no rule-based changes)")
+                                            print(f"[AI] ✓ AI proposal ADOPTED (total cost improved: ¥{int(rb_tot):,} → ¥{int(ai_tot):,})")
                                         except Exception:
                                             pass
                                     else:
-                                        ai_tot = self._calc_totals(norm).get('total', 0.0)
-                                        rb_tot = self._calc_totals(updated).get('total', 0.0)
-                                        if ai_tot < rb_tot - 1e-3:
-                                            updated = norm
-                                            ai_adjusted = True  # AI調整成功フラグ
-                                            try:
-                                                print(f"[AI] ✓ AI proposal ADOPTED (total cost improved: ¥{int(rb_tot):,} → ¥{int(ai_tot):,})")
-                                            except Exception:
-                                                pass
-                                        else:
-                                            try:
-                                                print(f"[AI] ✗ AI proposal REJECTED (no total cost improvement: ¥{int(rb_tot):,} vs ¥{int(ai_tot):,})")
-                                            except Exception:
-                                                pass
+                                        try:
+                                            print(f"[AI] ✗ AI proposal REJECTED (no total cost improvement: ¥{int(rb_tot):,} vs ¥{int(ai_tot):,})")
+                                        except Exception:
+                                            pass
                         ai_note = (data.get("reply_md") or "AIからの提案を反映しました。")
                         # AI調整が成功した場合、rule_noteの数値は古くなるので使わない
                         if ai_adjusted:
@@ -1396,7 +1692,7 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
                     except:
                         pass
                     # note は rule_note のままでOK（AI調整を行わなかった状態）
-            else:
+            elif local is None:
                 if not note:
                     note = "（AI提案は無効化されているため、見積値は変更していません）"
 
@@ -1459,4 +1755,5 @@ Output: {{"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "red
             "totals": totals,
             "version": 2,
             "suggestions": suggestions,
+            "resolution": resolution,
         }
@@ -13,6 +13,7 @@ from typing import Callable, Any
 import logging
 from app.core.config import settings
 from app.core.i18n import t
+from app.core.metrics import metrics_collector
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +68,47 @@ class CircuitBreaker:
         Raises:
             Exception: If circuit is open or function fails
         """
+        self._before_call()
+
+        try:
+            result = func(*args, **kwargs)
+            self.on_success()
+            return result
+        except Exception as e:
+            self.on_failure()
+            raise
+
+    async def call_async(self, func: Callable, *args, **kwargs) -> Any:
+        """Execute coroutine function through circuit breaker
+
+        Shares state with call(), so sync and async callers trip the same breaker.
+
+        Args:
+            func: Coroutine function to execute
+            *args: Positional arguments for function
+            **kwargs: Keyword arguments for function
+
+        Returns:
+            Awaited function result
+
+        Raises:
+            Exception: If circuit is open or function fails
+        """
+        self._before_call()
+
+        try:
+            result = await func(*args, **kwargs)
+            self.on_success()
+            return result
+        except Exception as e:
+            self.on_failure()
+            raise
+
+    def _before_call(self):
+        """Reject the call if the circuit is OPEN
+
+        Transitions to HALF_OPEN once the timeout has elapsed.
+        """
         if self.state == "OPEN":
             # Check if timeout has elapsed, transition to HALF_OPEN
             if self.last_failure_time and \
@@ -77,14 +119,6 @@ class CircuitBreaker:
                 logger.warning(f"Circuit breaker '{self.name}' is OPEN")
                 raise Exception(t('messages.circuit_breaker_open'))
 
-        try:
-            result = func(*args, **kwargs)
-            self.on_success()
-            return result
-        except Exception as e:
-            self.on_failure()
-            raise
-
     def on_success(self):
         """Handle successful call
 
@@ -139,3 +173,16 @@ class CircuitBreaker:
 
 # Global circuit breaker instance for OpenAI API
 openai_circuit_breaker = CircuitBreaker(name="OpenAI_API")
+metrics_collector.register_gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (1 for the current state)",
+    lambda: [
+        ({"name": openai_circuit_breaker.name, "state": state}, int(openai_circuit_breaker.state == state))
+        for state in ("CLOSED", "OPEN", "HALF_OPEN")
+    ]
+)
+metrics_collector.register_gauge(
+    "circuit_breaker_failures",
+    "Consecutive failures counted by the circuit breaker",
+    lambda: [({"name": openai_circuit_breaker.name}, openai_circuit_breaker.failures)]
+)
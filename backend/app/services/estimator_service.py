@@ -1,5 +1,5 @@
-import openai
-from typing import List, Dict, Any, Tuple, Optional
+import asyncio
+from typing import Callable, List, Dict, Any, Tuple, Optional
 import json
 import re
 from app.core.config import settings
@@ -8,9 +8,11 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 import traceback
 import time
-from app.prompts.estimate_prompts import get_estimate_prompt, get_system_prompt
-from app.services.retry_service import retry_with_exponential_backoff
+from app.prompts.estimate_prompts import get_estimate_prompt, get_batch_estimate_prompt, get_system_prompt
+from app.services.retry_service import retry_with_exponential_backoff, async_retry_with_exponential_backoff
 from app.services.circuit_breaker import openai_circuit_breaker
+from app.services.llm_client import llm_clients
+from app.services.llm_cache import llm_response_cache
 from app.core.logging_config import get_logger
 from app.core.metrics import metrics_collector
 from app.utils.reasoning_separator import auto_separate_reasoning
@@ -18,21 +20,66 @@ from app.utils.reasoning_separator import auto_separate_reasoning
 logger = get_logger(__name__)
 
 
+def _format_qa_text(qa_pairs: List[Dict[str, str]]) -> str:
+    """Format Q&A pairs for estimate prompts"""
+    return "\n".join([
+        f"質問: {qa['question']}\n回答: {qa['answer']}"
+        for qa in qa_pairs
+    ])
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (about one token per Japanese character or three ASCII bytes)"""
+    return max(1, len(text.encode("utf-8")) // 3)
+
+
+def _iter_estimate_items(content: str):
+    """Yield estimate item objects found in a (possibly truncated) batch response"""
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        start = content.find('{', pos)
+        if start == -1:
+            return
+        try:
+            obj, end = decoder.raw_decode(content, start)
+        except ValueError:
+            # Not a complete object here (e.g. truncated wrapper); try the next brace
+            pos = start + 1
+            continue
+        if isinstance(obj, dict) and isinstance(obj.get('estimates'), list):
+            for item in obj['estimates']:
+                if isinstance(item, dict):
+                    yield item
+            pos = end
+        elif isinstance(obj, dict) and 'person_days' in obj:
+            yield obj
+            pos = end
+        else:
+            pos = start + 1
+
+
 class EstimatorService:
+    # Sampling parameters for estimate calls (also part of the response cache key)
+    MAX_TOKENS = 800
+    TEMPERATURE = 0.3
+
     def __init__(self):
-        self.client = openai.OpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            timeout=settings.OPENAI_TIMEOUT  # Add timeout setting
-        )
+        self.client = llm_clients.get_client()
         self.model = settings.OPENAI_MODEL
         self.daily_unit_cost = settings.get_daily_unit_cost()
-        
+
+    @property
+    def async_client(self):
+        """Shared AsyncOpenAI client for the current event loop"""
+        return llm_clients.get_async_client()
+
     def generate_estimates(self, deliverables: List[Dict[str, str]],
                           system_requirements: str,
                           qa_pairs: List[Dict[str, str]],
                           request_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """成果物ごとの見積りを生成する（並列実行で高速化）"""
-        max_workers =  int(getattr(settings, 'MAX_PARALLEL_ESTIMATES', 5)) if hasattr(settings, 'MAX_PARALLEL_ESTIMATES') else 5
+        max_workers = settings.MAX_PARALLEL_ESTIMATES
         results: List[Tuple[int, Dict[str, Any]]] = []
 
         total_start = time.perf_counter()
@@ -108,11 +155,276 @@ class EstimatorService:
         )
         return [e for _, e in results]
     
+    async def generate_estimates_async(self, deliverables: List[Dict[str, str]],
+                                       system_requirements: str,
+                                       qa_pairs: List[Dict[str, str]],
+                                       request_id: Optional[str] = None,
+                                       on_estimate: Optional[Callable[[int, Dict[str, Any]], None]] = None
+                                       ) -> List[Dict[str, Any]]:
+        """成果物ごとの見積りを生成する（asyncio.gather で並列実行）
+
+        スレッドを使わず AsyncOpenAI で並列に呼び出す。同時実行数は
+        MAX_PARALLEL_ESTIMATES のセマフォで制限する。結果は入力と同じ順序。
+        on_estimate を渡すと、成果物ごとに見積りが確定した時点で
+        (入力順のindex, 見積り) で呼ばれる（完了順）。
+        """
+        max_concurrency = settings.MAX_PARALLEL_ESTIMATES
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        total_start = time.perf_counter()
+        logger.info(
+            "Starting batch estimation",
+            request_id=request_id,
+            deliverable_count=len(deliverables),
+            max_concurrency=max_concurrency,
+            model=self.model,
+            daily_unit_cost=self.daily_unit_cost
+        )
+
+        def emit(idx: int, est: Dict[str, Any]) -> None:
+            if on_estimate is None:
+                return
+            try:
+                on_estimate(idx, est)
+            except Exception as e:
+                logger.warning("on_estimate callback failed", request_id=request_id, error=str(e))
+
+        async def worker(idx: int, d: Dict[str, str]) -> Dict[str, Any]:
+            est = await estimate_one(idx, d)
+            emit(idx, est)
+            return est
+
+        async def estimate_one(idx: int, d: Dict[str, str]) -> Dict[str, Any]:
+            name = d.get('name')
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    est = await self._estimate_single_deliverable_async(d, system_requirements, qa_pairs, request_id)
+                    logger.info(
+                        "Completed deliverable estimation",
+                        request_id=request_id,
+                        deliverable_index=idx,
+                        deliverable_name=name,
+                        person_days=est.get('person_days'),
+                        amount=int(est.get('amount', 0)),
+                        duration=round(time.perf_counter() - start, 2)
+                    )
+                    return est
+                except Exception as e:
+                    logger.error(
+                        "Deliverable estimation failed",
+                        request_id=request_id,
+                        deliverable_index=idx,
+                        deliverable_name=name,
+                        error=str(e),
+                        duration=round(time.perf_counter() - start, 2)
+                    )
+                    logger.warning(
+                        "Using fallback estimation",
+                        request_id=request_id,
+                        deliverable_index=idx,
+                        deliverable_name=name
+                    )
+                    return self._fallback_estimation(d, e)
+
+        if settings.ESTIMATE_BATCH_ENABLED and len(deliverables) > 1:
+            estimates = await self._generate_batched_estimates_async(
+                deliverables, system_requirements, qa_pairs, semaphore, worker, request_id, emit
+            )
+        else:
+            estimates = await asyncio.gather(*(worker(i, d) for i, d in enumerate(deliverables)))
+
+        total_dur = time.perf_counter() - total_start
+        logger.info(
+            "Batch estimation completed",
+            request_id=request_id,
+            total_deliverables=len(deliverables),
+            total_duration=round(total_dur, 2)
+        )
+        return list(estimates)
+
+    async def _generate_batched_estimates_async(self, deliverables: List[Dict[str, str]],
+                                                system_requirements: str,
+                                                qa_pairs: List[Dict[str, str]],
+                                                semaphore: asyncio.Semaphore,
+                                                single_worker: Callable,
+                                                request_id: Optional[str] = None,
+                                                emit: Optional[Callable[[int, Dict[str, Any]], None]] = None
+                                                ) -> List[Dict[str, Any]]:
+        """複数の成果物を1回のLLM呼び出しにまとめて見積る
+
+        バッチで返らなかった・不正だった成果物は single_worker（1件ずつの経路）で見積り直す。
+        バッチで得られた見積りは emit で通知する（single_worker 側は自身で通知する）。
+        """
+        batches = self._plan_batches(deliverables, system_requirements, qa_pairs)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(deliverables)
+
+        logger.info(
+            "Planned estimation batches",
+            request_id=request_id,
+            deliverable_count=len(deliverables),
+            batch_sizes=[len(b) for b in batches]
+        )
+
+        async def run_batch(indices: List[int]) -> None:
+            batch = [deliverables[i] for i in indices]
+            async with semaphore:
+                parsed = await self._estimate_batch_async(batch, system_requirements, qa_pairs, request_id)
+
+            missing = []
+            for pos, idx in enumerate(indices):
+                if pos in parsed:
+                    results[idx] = parsed[pos]
+                    if emit is not None:
+                        emit(idx, parsed[pos])
+                else:
+                    missing.append(idx)
+
+            if missing and len(indices) > 1:
+                logger.warning(
+                    "Falling back to single-deliverable estimation",
+                    request_id=request_id,
+                    batch_size=len(indices),
+                    missing_count=len(missing)
+                )
+            singles = await asyncio.gather(*(single_worker(i, deliverables[i]) for i in missing))
+            for idx, est in zip(missing, singles):
+                results[idx] = est
+
+        await asyncio.gather(*(run_batch(indices) for indices in batches))
+        return results
+
+    def _plan_batches(self, deliverables: List[Dict[str, str]],
+                      system_requirements: str,
+                      qa_pairs: List[Dict[str, str]]) -> List[List[int]]:
+        """Group deliverable indices into batches that fit the token budget
+
+        The shared prefix (system prompt, requirements, Q&A) is counted once
+        per batch; each item adds its own text plus its expected output.
+        """
+        budget = settings.ESTIMATE_BATCH_TOKEN_BUDGET
+        max_items = max(1, settings.ESTIMATE_BATCH_MAX_ITEMS)
+        output_per_item = settings.ESTIMATE_BATCH_OUTPUT_TOKENS_PER_ITEM
+        prefix_tokens = sum(
+            _estimate_tokens(m["content"])
+            for m in self._build_batch_messages([], system_requirements, qa_pairs)
+        )
+
+        batches: List[List[int]] = []
+        current: List[int] = []
+        used = prefix_tokens
+        for idx, d in enumerate(deliverables):
+            cost = _estimate_tokens(f"{d.get('name', '')} {d.get('description', '')}") + output_per_item
+            if current and (len(current) >= max_items or used + cost > budget):
+                batches.append(current)
+                current, used = [], prefix_tokens
+            current.append(idx)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _estimate_batch_async(self, batch: List[Dict[str, str]],
+                                    system_requirements: str,
+                                    qa_pairs: List[Dict[str, str]],
+                                    request_id: Optional[str] = None) -> Dict[int, Dict[str, Any]]:
+        """Estimate a batch of deliverables with one LLM call
+
+        Returns:
+            Estimates keyed by position in the batch. Items the response did
+            not cover (or covered with invalid values) are omitted.
+        """
+        if len(batch) < 2:
+            # A batch of one is just the single-deliverable path
+            return {}
+
+        messages = self._build_batch_messages(batch, system_requirements, qa_pairs)
+        max_tokens = settings.ESTIMATE_BATCH_OUTPUT_TOKENS_PER_ITEM * len(batch)
+        cache_key = llm_response_cache.make_key(
+            self.model, messages, max_tokens=max_tokens, temperature=self.TEMPERATURE
+        )
+
+        content = llm_response_cache.get(cache_key) if settings.LLM_CACHE_ENABLED else None
+        if content is None:
+            try:
+                content = await openai_circuit_breaker.call_async(
+                    self._call_batch_llm_with_retry_async, messages, max_tokens, request_id
+                )
+            except Exception as e:
+                logger.error(
+                    "Batch estimation failed",
+                    request_id=request_id,
+                    batch_size=len(batch),
+                    error=str(e)
+                )
+                return {}
+            cache_content = True
+        else:
+            cache_content = False
+
+        parsed = self._parse_batch_content(content, batch)
+        # Only cache complete answers so partial ones are retried next time
+        if cache_content and settings.LLM_CACHE_ENABLED and len(parsed) == len(batch):
+            llm_response_cache.set(cache_key, content)
+        return parsed
+
+    @async_retry_with_exponential_backoff()
+    async def _call_batch_llm_with_retry_async(self, messages: List[Dict[str, str]],
+                                               max_tokens: int,
+                                               request_id: Optional[str] = None) -> str:
+        """Call LLM for a batch estimate with retry logic (exponential backoff)"""
+        start_time = time.perf_counter()
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=self.TEMPERATURE,
+                timeout=settings.OPENAI_TIMEOUT
+            )
+            self._record_llm_success(response, time.perf_counter() - start_time, request_id, "estimate_batch")
+            return response.choices[0].message.content
+        except Exception as e:
+            self._record_llm_failure(e, time.perf_counter() - start_time, request_id, "estimate_batch")
+            raise
+
+    def _build_batch_messages(self, batch: List[Dict[str, str]],
+                              system_requirements: str,
+                              qa_pairs: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Build chat messages for a batch estimate"""
+        prompt = get_batch_estimate_prompt(batch, system_requirements, _format_qa_text(qa_pairs))
+        return [
+            {"role": "system", "content": get_system_prompt()},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _parse_batch_content(self, content: str, batch: List[Dict[str, str]]) -> Dict[int, Dict[str, Any]]:
+        """Parse a batch response item by item
+
+        Each item object is decoded on its own, so a truncated or partly
+        malformed response still yields the items that came through intact.
+        """
+        parsed: Dict[int, Dict[str, Any]] = {}
+        for item in _iter_estimate_items(content):
+            try:
+                idx = int(item.get('id'))
+                person_days = float(item.get('person_days'))
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= idx < len(batch) or idx in parsed or person_days <= 0:
+                continue
+            parsed[idx] = self._estimate_from_result(item, batch[idx])
+        return parsed
+
     def _estimate_single_deliverable(self, deliverable: Dict[str, str],
                                    system_requirements: str,
                                    qa_pairs: List[Dict[str, str]],
                                    request_id: Optional[str] = None) -> Dict[str, Any]:
         """Generate estimate for single deliverable with circuit breaker protection"""
+        cached = self._get_cached_estimate(deliverable, system_requirements, qa_pairs, request_id)
+        if cached is not None:
+            return cached
+
         try:
             # Call through circuit breaker
             return openai_circuit_breaker.call(
@@ -131,84 +443,190 @@ class EstimatorService:
             # Use fallback estimation
             return self._fallback_estimation(deliverable, e)
 
+    async def _estimate_single_deliverable_async(self, deliverable: Dict[str, str],
+                                                 system_requirements: str,
+                                                 qa_pairs: List[Dict[str, str]],
+                                                 request_id: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of _estimate_single_deliverable"""
+        cached = self._get_cached_estimate(deliverable, system_requirements, qa_pairs, request_id)
+        if cached is not None:
+            return cached
+
+        try:
+            return await openai_circuit_breaker.call_async(
+                self._call_llm_with_retry_async,
+                deliverable,
+                system_requirements,
+                qa_pairs,
+                request_id
+            )
+        except Exception as e:
+            logger.error(
+                f"Estimation failed for {deliverable.get('name')}: {e}",
+                request_id=request_id,
+                deliverable_name=deliverable.get('name')
+            )
+            return self._fallback_estimation(deliverable, e)
+
     @retry_with_exponential_backoff()
     def _call_llm_with_retry(self, deliverable: Dict[str, str],
                             system_requirements: str,
                             qa_pairs: List[Dict[str, str]],
                             request_id: Optional[str] = None) -> Dict[str, Any]:
         """Call LLM with retry logic (exponential backoff)"""
-        # Format Q&A pairs
-        qa_text = "\n".join([
-            f"質問: {qa['question']}\n回答: {qa['answer']}"
-            for qa in qa_pairs
-        ])
-
-        prompt = get_estimate_prompt(deliverable, system_requirements, qa_text)
+        messages = self._build_messages(deliverable, system_requirements, qa_pairs)
 
         # Measure OpenAI API call duration
         start_time = time.perf_counter()
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": get_system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=800,
-                temperature=0.3,
+                messages=messages,
+                max_tokens=self.MAX_TOKENS,
+                temperature=self.TEMPERATURE,
                 timeout=settings.OPENAI_TIMEOUT
             )
-            duration = time.perf_counter() - start_time
+            self._record_llm_success(response, time.perf_counter() - start_time, request_id)
+            return self._parse_and_cache_response(messages, response, deliverable)
+        except Exception as e:
+            self._record_llm_failure(e, time.perf_counter() - start_time, request_id)
+            raise
 
-            # Record successful OpenAI API call metrics (TODO-9: added input/output tokens for cost tracking)
-            metrics_collector.record_openai_call(
-                model=self.model,
-                tokens=response.usage.total_tokens,
-                duration=duration,
-                success=True,
-                request_id=request_id or "unknown",
-                operation="estimate",
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens
-            )
+    @async_retry_with_exponential_backoff()
+    async def _call_llm_with_retry_async(self, deliverable: Dict[str, str],
+                                         system_requirements: str,
+                                         qa_pairs: List[Dict[str, str]],
+                                         request_id: Optional[str] = None) -> Dict[str, Any]:
+        """Call LLM asynchronously with retry logic (exponential backoff)"""
+        messages = self._build_messages(deliverable, system_requirements, qa_pairs)
 
-            logger.debug(
-                "OpenAI API call successful",
-                request_id=request_id,
+        start_time = time.perf_counter()
+        try:
+            response = await self.async_client.chat.completions.create(
                 model=self.model,
-                tokens=response.usage.total_tokens,
-                duration=round(duration, 3)
+                messages=messages,
+                max_tokens=self.MAX_TOKENS,
+                temperature=self.TEMPERATURE,
+                timeout=settings.OPENAI_TIMEOUT
             )
+            self._record_llm_success(response, time.perf_counter() - start_time, request_id)
+            return self._parse_and_cache_response(messages, response, deliverable)
+        except Exception as e:
+            self._record_llm_failure(e, time.perf_counter() - start_time, request_id)
+            raise
 
-            return self._parse_llm_response(response, deliverable)
+    def _build_messages(self, deliverable: Dict[str, str],
+                        system_requirements: str,
+                        qa_pairs: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Build chat messages for a single deliverable estimate"""
+        prompt = get_estimate_prompt(deliverable, system_requirements, _format_qa_text(qa_pairs))
+        return [
+            {"role": "system", "content": get_system_prompt()},
+            {"role": "user", "content": prompt}
+        ]
 
-        except Exception as e:
-            duration = time.perf_counter() - start_time
+    def _cache_key(self, messages: List[Dict[str, str]]) -> str:
+        """Response cache key for the exact request"""
+        return llm_response_cache.make_key(
+            self.model, messages, max_tokens=self.MAX_TOKENS, temperature=self.TEMPERATURE
+        )
 
-            # Record failed OpenAI API call metrics (TODO-9: added input/output tokens for cost tracking)
-            metrics_collector.record_openai_call(
-                model=self.model,
-                tokens=0,
-                duration=duration,
-                success=False,
-                request_id=request_id or "unknown",
-                operation="estimate",
-                input_tokens=0,
-                output_tokens=0
-            )
+    def _get_cached_estimate(self, deliverable: Dict[str, str],
+                             system_requirements: str,
+                             qa_pairs: List[Dict[str, str]],
+                             request_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the estimate from the response cache, or None on miss"""
+        if not settings.LLM_CACHE_ENABLED:
+            return None
 
-            logger.error(
-                "OpenAI API call failed",
-                request_id=request_id,
-                model=self.model,
-                error=str(e),
-                duration=round(duration, 3)
+        messages = self._build_messages(deliverable, system_requirements, qa_pairs)
+        content = llm_response_cache.get(self._cache_key(messages))
+        if content is None:
+            return None
+
+        logger.debug(
+            "LLM response cache hit",
+            request_id=request_id,
+            deliverable_name=deliverable.get('name')
+        )
+        return self._parse_llm_content(content, deliverable)
+
+    def _parse_and_cache_response(self, messages: List[Dict[str, str]], response,
+                                  deliverable: Dict[str, str]) -> Dict[str, Any]:
+        """Parse a response, caching it only if it parsed (fallback estimates are not pinned)"""
+        content = response.choices[0].message.content
+        estimate = self._try_parse_llm_content(content, deliverable)
+        if estimate is None:
+            logger.warning(
+                "Unparseable LLM response, using fallback estimate (not cached)",
+                deliverable_name=deliverable.get('name')
             )
-            raise
+            return self._fallback_estimate(content, deliverable)
+        if settings.LLM_CACHE_ENABLED:
+            llm_response_cache.set(self._cache_key(messages), content)
+        return estimate
+
+    def _record_llm_success(self, response, duration: float, request_id: Optional[str],
+                            operation: str = "estimate") -> None:
+        """Record metrics and log a successful OpenAI API call"""
+        # Record successful OpenAI API call metrics (TODO-9: added input/output tokens for cost tracking)
+        metrics_collector.record_openai_call(
+            model=self.model,
+            tokens=response.usage.total_tokens,
+            duration=duration,
+            success=True,
+            request_id=request_id or "unknown",
+            operation=operation,
+            input_tokens=response.usage.prompt_tokens,
+            output_tokens=response.usage.completion_tokens
+        )
+
+        logger.debug(
+            "OpenAI API call successful",
+            request_id=request_id,
+            model=self.model,
+            tokens=response.usage.total_tokens,
+            duration=round(duration, 3)
+        )
+
+    def _record_llm_failure(self, error: Exception, duration: float, request_id: Optional[str],
+                            operation: str = "estimate") -> None:
+        """Record metrics and log a failed OpenAI API call"""
+        # Record failed OpenAI API call metrics (TODO-9: added input/output tokens for cost tracking)
+        metrics_collector.record_openai_call(
+            model=self.model,
+            tokens=0,
+            duration=duration,
+            success=False,
+            request_id=request_id or "unknown",
+            operation=operation,
+            input_tokens=0,
+            output_tokens=0
+        )
+
+        logger.error(
+            "OpenAI API call failed",
+            request_id=request_id,
+            model=self.model,
+            error=str(error),
+            duration=round(duration, 3)
+        )
 
     def _parse_llm_response(self, response, deliverable: Dict[str, str]) -> Dict[str, Any]:
         """Parse LLM response and extract estimate data"""
-        content = response.choices[0].message.content.strip()
+        return self._parse_llm_content(response.choices[0].message.content, deliverable)
+
+    def _parse_llm_content(self, content: str, deliverable: Dict[str, str]) -> Dict[str, Any]:
+        """Parse LLM response content and extract estimate data"""
+        estimate = self._try_parse_llm_content(content, deliverable)
+        if estimate is None:
+            # Fallback if JSON not found or invalid
+            return self._fallback_estimate(content, deliverable)
+        return estimate
+
+    def _try_parse_llm_content(self, content: str, deliverable: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Parse LLM response content, or None if it has no valid estimate JSON"""
+        content = content.strip()
 
         # Parse JSON response
         try:
@@ -217,32 +635,37 @@ class EstimatorService:
             if json_match:
                 json_str = json_match.group()
                 result = json.loads(json_str)
+                return self._estimate_from_result(result, deliverable)
 
-                person_days = float(result.get('person_days', 5.0))
-                reasoning_breakdown = result.get('reasoning_breakdown', '')
-                reasoning_notes = result.get('reasoning_notes', '')
+        except (json.JSONDecodeError, ValueError, TypeError, AttributeError):
+            pass
 
-                # Auto-separation: If reasoning_notes is empty but reasoning_breakdown contains paragraphs,
-                # split them into breakdown (bulleted lists) and notes (paragraphs)
-                reasoning_breakdown, reasoning_notes = auto_separate_reasoning(
-                    reasoning_breakdown, reasoning_notes
-                )
+        return None
+
+    def _fallback_estimate(self, content: str, deliverable: Dict[str, str]) -> Dict[str, Any]:
+        """Default estimate (5.0 days) when the response could not be parsed"""
+        content = content.strip()
+        return self._build_estimate(deliverable, 5.0, content, content, '')
+
+    def _estimate_from_result(self, result: Dict[str, Any], deliverable: Dict[str, str]) -> Dict[str, Any]:
+        """Build an estimate from a parsed JSON result object"""
+        person_days = float(result.get('person_days', 5.0))
+        reasoning_breakdown = result.get('reasoning_breakdown', '')
+        reasoning_notes = result.get('reasoning_notes', '')
+
+        # Auto-separation: If reasoning_notes is empty but reasoning_breakdown contains paragraphs,
+        # split them into breakdown (bulleted lists) and notes (paragraphs)
+        reasoning_breakdown, reasoning_notes = auto_separate_reasoning(
+            reasoning_breakdown, reasoning_notes
+        )
 
-                # Backward compatibility: keep reasoning field
-                reasoning = result.get('reasoning', f"{reasoning_breakdown}\n\n{reasoning_notes}")
-            else:
-                # Fallback if JSON not found
-                person_days = 5.0
-                reasoning_breakdown = content
-                reasoning_notes = ''
-                reasoning = content
-
-        except (json.JSONDecodeError, ValueError):
-            person_days = 5.0
-            reasoning_breakdown = content
-            reasoning_notes = ''
-            reasoning = content
+        # Backward compatibility: keep reasoning field
+        reasoning = result.get('reasoning', f"{reasoning_breakdown}\n\n{reasoning_notes}")
+        return self._build_estimate(deliverable, person_days, reasoning, reasoning_breakdown, reasoning_notes)
 
+    def _build_estimate(self, deliverable: Dict[str, str], person_days: float, reasoning: str,
+                        reasoning_breakdown: str, reasoning_notes: str) -> Dict[str, Any]:
+        """Build the estimate dictionary (amount = person_days x daily unit cost)"""
         # Calculate amount
         amount = person_days * self.daily_unit_cost
 
@@ -1,12 +1,38 @@
-"""Excel出力サービス"""
-import pandas as pd
+"""Excel出力サービス
+
+openpyxl の write_only ワークブックに1行ずつ追記して出力する。
+DataFrame やセル単位の書式ループは使わず、書式はワークブック作成時に
+登録した名前付きスタイルを各セルに割り当てるだけなので、
+メモリ使用量は行数によらずほぼ1行分で済む。
+"""
 import openpyxl
-from openpyxl.styles import Font, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, Border, Side, NamedStyle
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import os
+import uuid
 from app.core.i18n import t
 from app.core.config import settings
+from app.services.storage_service import atomic_path
+
+
+# 名前付きスタイル（名前, フォント, 配置, 表示形式, 罫線）
+# ヘッダーの罫線は従来の pandas.to_excel が付けていた既定の書式（全辺 thin）と同じ
+_THIN = Side(style="thin")
+_STYLES = [
+    ("estimate_header", Font(bold=True), Alignment(horizontal="center"), "General",
+     Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)),
+    ("estimate_days", Font(), Alignment(horizontal="right"), "0.0", Border()),
+    ("estimate_amount", Font(), Alignment(horizontal="right"), "#,##0", Border()),
+    ("estimate_text", Font(), Alignment(horizontal="left", vertical="top", wrap_text=True), "General", Border()),
+    ("estimate_total_label", Font(bold=True), Alignment(horizontal="right"), "General", Border()),
+    ("estimate_grand_total", Font(bold=True), Alignment(horizontal="right"), "#,##0", Border(top=_THIN)),
+    ("estimate_section_label", Font(bold=True), Alignment(), "General", Border()),
+]
+
+# 列幅（A: 成果物名称, B: 説明, C: 工数, D: 金額, E: 工数内訳, F: 根拠・備考）
+_COLUMN_WIDTHS = {"A": 30, "B": 50, "C": 15, "D": 15, "E": 40, "F": 40}
 
 
 class ExportService:
@@ -17,46 +43,43 @@ class ExportService:
 
     def write_excel_output(
         self,
-        original_excel_path: str,
+        deliverables: List[Dict[str, str]],
         estimates: List[Dict[str, Any]],
         totals: Dict[str, float],
         qa_pairs: List[Dict[str, str]],
         output_dir: str,
     ) -> str:
-        """Excel形式で見積り結果を出力する"""
+        """Excel形式で見積り結果を出力する
+
+        成果物はタスク作成時に保存済みのもの（TaskService.get_deliverables）を使い、
+        元のアップロードファイルは読み直さない。
+        """
 
-        # 出力ファイル名を生成
-        output_filename = f"{self.timestamp}.xlsx"
+        # 出力ファイル名を生成（同じ秒の出力と衝突しないようランダム部分を付ける）
+        output_filename = f"{self.timestamp}-{uuid.uuid4().hex[:8]}.xlsx"
         output_path = os.path.join(output_dir, output_filename)
 
         try:
-            # 元のファイルを読み込み (Excel/CSV auto-detect)
-            if original_excel_path.endswith('.csv'):
-                df = pd.read_csv(original_excel_path, encoding='utf-8')
-            else:
-                df = pd.read_excel(original_excel_path, engine="openpyxl")
-
-            # 見積りデータを追加
-            df = self._add_estimate_columns(df, estimates)
-
-            # Excelファイルを作成
-            sheet_name = t('excel.sheet_name')
-            with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-                # ワークシートを取得
-                worksheet = writer.sheets[sheet_name]
-
-                # 書式設定
-                self._format_worksheet(worksheet, len(df))
-
-                # 合計情報を追加
-                self._add_totals_to_worksheet(worksheet, totals, len(df))
-
-                # セッション情報を追加
-                self._add_session_info_to_worksheet(
-                    worksheet, qa_pairs, len(df)
-                )
+            workbook = openpyxl.Workbook(write_only=True)
+            for name, font, alignment, number_format, border in _STYLES:
+                workbook.add_named_style(NamedStyle(
+                    name=name, font=font, alignment=alignment, number_format=number_format, border=border
+                ))
+
+            worksheet = workbook.create_sheet(t('excel.sheet_name'))
+            for column, width in _COLUMN_WIDTHS.items():
+                worksheet.column_dimensions[column].width = width
+
+            # 見積り明細
+            self._write_estimate_rows(worksheet, deliverables, estimates)
+            # 合計情報
+            self._write_totals(worksheet, totals)
+            # セッション情報
+            self._write_session_info(worksheet, qa_pairs)
+
+            # 書き込み完了後にリネームするので、ダウンロード側が書きかけのファイルを見ることはない
+            with atomic_path(output_path) as tmp_path:
+                workbook.save(tmp_path)
 
             print(f"\n見積り結果をExcelファイルに出力しました: {output_path}")
             return output_path
@@ -65,156 +88,87 @@ class ExportService:
             print(f"Excelファイル出力でエラーが発生しました: {e}")
             raise
 
-    def _add_estimate_columns(
-        self, df: pd.DataFrame, estimates: List[Dict[str, Any]]
-    ) -> pd.DataFrame:
-        """見積り列（C列：工数、D列：金額、E列：工数内訳、F列：根拠・備考）を追加する"""
-
-        # 既存の列名を翻訳
-        df.columns = [t('excel.column_deliverable_name'), t('excel.column_description')]
+    def _write_estimate_rows(
+        self, worksheet, deliverables: List[Dict[str, str]], estimates: List[Dict[str, Any]]
+    ) -> None:
+        """ヘッダーと見積り行（C列：工数、D列：金額、E列：工数内訳、F列：根拠・備考）を書き込む"""
+        headers = [
+            t('excel.column_deliverable_name'),
+            t('excel.column_description'),
+            t('excel.column_effort'),
+            t('excel.column_amount'),
+            t('excel.column_breakdown'),
+            t('excel.column_notes'),
+        ]
+        worksheet.append([self._cell(worksheet, h, "estimate_header") for h in headers])
 
         # 見積りデータを辞書として整理
         estimate_dict = {est["name"]: est for est in estimates}
 
-        # 新しい列を追加
-        person_days_list = []
-        amounts_list = []
-        breakdown_list = []
-        notes_list = []
-
-        for index, row in df.iterrows():
-            deliverable_name = str(row.iloc[0])
-
-            if deliverable_name in estimate_dict:
-                estimate = estimate_dict[deliverable_name]
-                person_days_list.append(estimate["person_days"])
-                amounts_list.append(estimate["amount"])
-                breakdown_list.append(estimate.get("reasoning_breakdown", estimate.get("reasoning", "")))
-                notes_list.append(estimate.get("reasoning_notes", ""))
+        for deliverable in deliverables:
+            estimate = estimate_dict.get(deliverable["name"])
+            if estimate is not None:
+                person_days = estimate["person_days"]
+                amount = estimate["amount"]
+                breakdown = estimate.get("reasoning_breakdown", estimate.get("reasoning", ""))
+                notes = estimate.get("reasoning_notes", "")
             else:
-                person_days_list.append(0)
-                amounts_list.append(0)
-                breakdown_list.append("")
-                notes_list.append("")
-
-        # 列を追加
-        df[t('excel.column_effort')] = person_days_list
-        df[t('excel.column_amount')] = amounts_list
-        df[t('excel.column_breakdown')] = breakdown_list
-        df[t('excel.column_notes')] = notes_list
-
-        return df
-
-    def _format_worksheet(self, worksheet, data_rows: int):
-        """ワークシートの書式設定を行う"""
-
-        # ヘッダー行の書式設定
-        header_font = Font(bold=True)
-        header_alignment = Alignment(horizontal="center")
-
-        for col in range(1, 7):  # A列からF列まで
-            cell = worksheet.cell(row=1, column=col)
-            cell.font = header_font
-            cell.alignment = header_alignment
-
-        # データ行の書式設定
-        for row in range(2, data_rows + 2):
-            # 工数列（C列）の書式設定
-            cell = worksheet.cell(row=row, column=3)
-            cell.number_format = "0.0"
-            cell.alignment = Alignment(horizontal="right")
-
-            # 金額列（D列）の書式設定
-            cell = worksheet.cell(row=row, column=4)
-            cell.number_format = "#,##0"
-            cell.alignment = Alignment(horizontal="right")
-
-            # 工数内訳列（E列）の書式設定
-            cell = worksheet.cell(row=row, column=5)
-            cell.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
-
-            # 根拠・備考列（F列）の書式設定
-            cell = worksheet.cell(row=row, column=6)
-            cell.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
-
-        # 列幅の調整
-        worksheet.column_dimensions["A"].width = 30
-        worksheet.column_dimensions["B"].width = 50
-        worksheet.column_dimensions["C"].width = 15
-        worksheet.column_dimensions["D"].width = 15
-        worksheet.column_dimensions["E"].width = 40  # 工数内訳
-        worksheet.column_dimensions["F"].width = 40  # 根拠・備考
-
-    def _add_totals_to_worksheet(
-        self, worksheet, totals: Dict[str, float], data_rows: int
-    ):
-        """合計情報をワークシートに追加する"""
-
-        # 合計情報を追加する開始行
-        start_row = data_rows + 3
+                person_days, amount, breakdown, notes = 0, 0, "", ""
+
+            worksheet.append([
+                deliverable["name"],
+                deliverable.get("description", ""),
+                self._cell(worksheet, person_days, "estimate_days"),
+                self._cell(worksheet, amount, "estimate_amount"),
+                self._cell(worksheet, breakdown, "estimate_text"),
+                self._cell(worksheet, notes, "estimate_text"),
+            ])
+
+    def _write_totals(self, worksheet, totals: Dict[str, float]) -> None:
+        """合計情報（小計・税額・総額）を空行1行を挟んで書き込む"""
 
         # 税率を取得して置換
         tax_rate = int(settings.get_tax_rate() * 100)  # 0.1 → 10, 0.0 → 0
         tax_label = t('excel.label_tax').replace('{tax_rate}', str(tax_rate))
 
-        # 小計
-        worksheet.cell(row=start_row, column=3, value=t('excel.label_subtotal'))
-        worksheet.cell(row=start_row, column=4, value=totals["subtotal"])
-
-        # 税額
-        worksheet.cell(row=start_row + 1, column=3, value=tax_label)
-        worksheet.cell(row=start_row + 1, column=4, value=totals["tax"])
-
-        # 総額
-        worksheet.cell(row=start_row + 2, column=3, value=t('excel.label_total'))
-        worksheet.cell(row=start_row + 2, column=4, value=totals["total"])
-
-        # 合計行の書式設定
-        for row in range(start_row, start_row + 3):
-            # ラベル列（C列）
-            cell = worksheet.cell(row=row, column=3)
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal="right")
-
-            # 金額列（D列）
-            cell = worksheet.cell(row=row, column=4)
-            cell.number_format = "#,##0"
-            cell.alignment = Alignment(horizontal="right")
-            if row == start_row + 2:  # 総額行
-                cell.font = Font(bold=True)
-                cell.border = Border(top=Side(style="thin"))
-
-    def _add_session_info_to_worksheet(
-        self, worksheet, qa_pairs: List[Dict[str, str]], data_rows: int
-    ):
-        """セッション情報をワークシートに追加する"""
-
-        # セッション情報を追加する開始行
-        start_row = data_rows + 7
+        worksheet.append([])
+        rows = [
+            (t('excel.label_subtotal'), totals["subtotal"], "estimate_amount"),
+            (tax_label, totals["tax"], "estimate_amount"),
+            (t('excel.label_total'), totals["total"], "estimate_grand_total"),
+        ]
+        for label, value, style in rows:
+            worksheet.append([
+                None,
+                None,
+                self._cell(worksheet, label, "estimate_total_label"),
+                self._cell(worksheet, value, style),
+            ])
+
+    def _write_session_info(self, worksheet, qa_pairs: List[Dict[str, str]]) -> None:
+        """セッション情報（質問と回答、出力日時）を空行1行を挟んで書き込む"""
 
         # 質問と回答
-        worksheet.cell(row=start_row, column=1, value=t('excel.label_qa_section'))
-        worksheet.cell(row=start_row, column=1).font = Font(bold=True)
-
-        current_row = start_row + 1
+        worksheet.append([])
+        worksheet.append([self._cell(worksheet, t('excel.label_qa_section'), "estimate_section_label")])
 
         for i, qa in enumerate(qa_pairs, 1):
-            worksheet.cell(row=current_row, column=1, value=f"{t('excel.label_question')}{i}")
-            worksheet.cell(row=current_row, column=2, value=qa["question"])
-            current_row += 1
-
-            worksheet.cell(row=current_row, column=1, value=f"{t('excel.label_answer')}{i}")
-            worksheet.cell(row=current_row, column=2, value=qa["answer"])
-            current_row += 1
-
+            worksheet.append([f"{t('excel.label_question')}{i}", qa["question"]])
+            worksheet.append([f"{t('excel.label_answer')}{i}", qa["answer"]])
             # 空行
-            current_row += 1
+            worksheet.append([])
 
         # 出力日時
-        worksheet.cell(row=current_row + 1, column=1, value=t('excel.label_output_time'))
-        worksheet.cell(row=current_row + 1, column=1).font = Font(bold=True)
-        worksheet.cell(
-            row=current_row + 1,
-            column=2,
-            value=datetime.now().strftime(t('excel.datetime_format')),
-        )
+        worksheet.append([])
+        worksheet.append([
+            self._cell(worksheet, t('excel.label_output_time'), "estimate_section_label"),
+            datetime.now().strftime(t('excel.datetime_format')),
+        ])
+
+    @staticmethod
+    def _cell(worksheet, value: Any, style: Optional[str] = None) -> WriteOnlyCell:
+        """名前付きスタイルを割り当てた write_only 用セル"""
+        cell = WriteOnlyCell(worksheet, value=value)
+        if style:
+            cell.style = style
+        return cell
@@ -1,38 +1,119 @@
-"""Guardrails service for input/output validation using Guardrails AI"""
+"""Guardrails service for input/output validation using Guardrails AI
+
+Building a Guard loads the toxicity model, so the guards are built once per
+process by ``guard_registry`` (warmed up from the app's startup event) and
+shared by every GuardrailsService instance.
+"""
+import sys
+import threading
+import time
 from typing import Any, Dict, Optional
 from app.core.i18n import t
 
 
-class GuardrailsService:
+class GuardRegistry:
     """
-    Service for validating user inputs and LLM outputs using Guardrails AI
+    Process-wide Guardrails guards
 
-    This service provides:
-    - Input validation (toxic language, PII detection, length validation)
-    - Output validation (LLM response safety checks)
-    - Business rule validation (deliverable names, person-days, amounts)
+    Guards are built at most once, under a lock: callers arriving while the
+    warm-up is in progress wait for it instead of building their own. A
+    failed initialization is not retried per request; validation falls back
+    to the basic checks.
+
+    Attributes:
+        state: cold / warming / ready / unavailable (library missing) / failed
+        input_guard: Guard for user inputs (None unless state == "ready")
+        output_guard: Guard for LLM outputs (None unless state == "ready")
     """
 
+    # Guard configuration (part of fingerprint(); change it here, not inline)
+    INPUT_TOXICITY_THRESHOLD = 0.8  # 80% confidence threshold
+    OUTPUT_TOXICITY_THRESHOLD = 0.9  # Higher threshold for outputs
+    MAX_INPUT_LENGTH = 10000
+
     def __init__(self):
+        self._lock = threading.Lock()
+        self.state = "cold"
+        self.library_version: Optional[str] = None
+        self.input_guard = None
+        self.output_guard = None
+        self.error: Optional[str] = None
+        self.init_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has finished (successfully or with the fallback)"""
+        return self.state not in ("cold", "warming")
+
+    def warm_up(self) -> bool:
         """
-        Initialize the Guardrails service
+        Build the guards if not already done
 
-        Note: Guardrails AI library initialization is deferred to avoid
-        import errors if the library is not properly installed.
+        Also compiles the prompt-injection rules so the first request does
+        not pay for that either.
+
+        Returns:
+            bool: True if the Guardrails guards are available
         """
-        self._guards_initialized = False
-        self.input_guard = None
-        self.output_guard = None
+        if self.ready:
+            return self.state == "ready"
 
-    def _initialize_guards(self):
+        with self._lock:
+            if not self.ready:
+                self._build()
+        return self.state == "ready"
+
+    def fingerprint(self) -> str:
         """
-        Lazy initialization of Guardrails guards
+        Identify the guards that judge inputs (configuration, state, library version)
 
-        This method initializes the guards only when needed to avoid
-        startup errors if Guardrails AI is not properly configured.
+        Warms up first, so the result describes the guards actually used.
         """
-        if self._guards_initialized:
-            return
+        self.warm_up()
+        return (
+            f"in={self.INPUT_TOXICITY_THRESHOLD},out={self.OUTPUT_TOXICITY_THRESHOLD},"
+            f"len={self.MAX_INPUT_LENGTH},{self.state},{self.library_version}"
+        )
+
+    def start_warm_up(self) -> threading.Thread:
+        """Run warm_up() in a background thread so startup is not blocked"""
+        if self.state == "cold":
+            self.state = "warming"
+        thread = threading.Thread(target=self.warm_up, name="guard-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get warm-up status (reported on /health)
+
+        Returns:
+            Dictionary with ready, state, init_seconds and error
+        """
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "init_seconds": round(self.init_seconds, 3) if self.init_seconds is not None else None,
+            "error": self.error,
+        }
+
+    def reset(self):
+        """Drop the guards (tests)"""
+        with self._lock:
+            self.state = "cold"
+            self.input_guard = None
+            self.output_guard = None
+            self.library_version = None
+            self.error = None
+            self.init_seconds = None
+
+    def _build(self):
+        """Build the guards (called with _lock held)"""
+        from app.services.security_service import SecurityService
+
+        self.state = "warming"
+        start = time.perf_counter()
+        SecurityService.compiled_rules()
 
         try:
             from guardrails import Guard
@@ -44,12 +125,12 @@ class GuardrailsService:
             # Input guard: strict validation for user inputs
             self.input_guard = Guard().use_many(
                 ToxicLanguage(
-                    threshold=0.8,  # 80% confidence threshold
+                    threshold=self.INPUT_TOXICITY_THRESHOLD,
                     on_fail="exception"
                 ),
                 ValidLength(
                     min=1,
-                    max=10000,
+                    max=self.MAX_INPUT_LENGTH,
                     on_fail="exception"
                 )
             )
@@ -57,20 +138,74 @@ class GuardrailsService:
             # Output guard: more lenient for LLM outputs
             self.output_guard = Guard().use_many(
                 ToxicLanguage(
-                    threshold=0.9,  # Higher threshold for outputs
+                    threshold=self.OUTPUT_TOXICITY_THRESHOLD,
                     on_fail="exception"
                 ),
             )
 
-            self._guards_initialized = True
+            self.library_version = getattr(sys.modules.get("guardrails"), "__version__", None)
+            self.state = "ready"
             print("[GUARD] Guardrails guards initialized successfully")
 
         except ImportError as e:
             print(f"[GUARD] Warning: Guardrails AI not available: {e}")
-            self._guards_initialized = False
+            self.state = "unavailable"
+            self.error = str(e)
         except Exception as e:
             print(f"[GUARD] Warning: Failed to initialize guards: {e}")
-            self._guards_initialized = False
+            self.state = "failed"
+            self.error = str(e)
+
+        self.init_seconds = time.perf_counter() - start
+
+
+# Global instance (warmed up in main.startup_event)
+guard_registry = GuardRegistry()
+
+
+class GuardrailsService:
+    """
+    Service for validating user inputs and LLM outputs using Guardrails AI
+
+    This service provides:
+    - Input validation (toxic language, PII detection, length validation)
+    - Output validation (LLM response safety checks)
+    - Business rule validation (deliverable names, person-days, amounts)
+    """
+
+    def __init__(self, registry: Optional[GuardRegistry] = None):
+        """
+        Initialize the Guardrails service
+
+        Note: Guardrails AI library initialization is deferred to avoid
+        import errors if the library is not properly installed.
+
+        Args:
+            registry: Guard registry to use (default: the process-wide guard_registry)
+        """
+        self._registry = registry or guard_registry
+        self._guards_initialized = False
+        self.input_guard = None
+        self.output_guard = None
+
+    def _initialize_guards(self):
+        """
+        Attach the shared guards from the registry
+
+        The registry builds them once per process (normally at startup), so
+        this is cheap after the first call.
+        """
+        if self._guards_initialized:
+            return
+
+        if self._registry.warm_up():
+            self.input_guard = self._registry.input_guard
+            self.output_guard = self._registry.output_guard
+            self._guards_initialized = True
+
+    def fingerprint(self) -> str:
+        """Identify the guards used by this service (see GuardRegistry.fingerprint)"""
+        return self._registry.fingerprint()
 
     def validate_input(self, text: str) -> str:
         """
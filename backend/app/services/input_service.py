@@ -1,7 +1,18 @@
-"""入力処理サービス"""
-import pandas as pd
-from typing import List, Dict
-from app.schemas.deliverable import Deliverable
+"""入力処理サービス
+
+Excel/CSV は DataFrame を介さずに1行ずつ読み出す。
+- Excel: openpyxl の read_only モード + iter_rows(values_only=True)
+- CSV: 標準ライブラリの csv.reader
+
+どちらも成果物をジェネレータで返し、MAX_INPUT_ROWS を超えた時点で読み込みを打ち切るため、
+アップロード上限（MAX_UPLOAD_SIZE_MB）付近のファイルでもメモリ使用量はほぼ一定。
+"""
+import csv
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from openpyxl import load_workbook
+
+from app.core.config import settings
 from app.core.i18n import t
 
 
@@ -9,29 +20,26 @@ class InputService:
     """Excel・CSV入力処理サービス"""
 
     @staticmethod
-    def load_excel_data(excel_path: str) -> List[Dict[str, str]]:
-        """Excelファイルから成果物データを読み込む"""
+    def iter_excel_deliverables(excel_path: str, max_rows: Optional[int] = None) -> Iterator[Dict[str, str]]:
+        """Excelファイルから成果物を1件ずつ読み出す（1行目はヘッダー）"""
+        workbook = load_workbook(excel_path, read_only=True, data_only=True)
         try:
-            df = pd.read_excel(excel_path, engine='openpyxl')
-
-            # A列: 成果物名称, B列: 説明
-            if len(df.columns) < 2:
-                raise ValueError(t('messages.excel_min_columns'))
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            yield from InputService._iter_rows(rows, t('messages.excel_min_columns'), max_rows)
+        finally:
+            workbook.close()
 
-            # NaN値を空文字で置換
-            df = df.fillna('')
-
-            # 成果物リストを作成
-            deliverables = []
-            for index, row in df.iterrows():
-                if row.iloc[0]:  # 成果物名称が空でない場合のみ追加
-                    deliverables.append({
-                        'name': str(row.iloc[0]),
-                        'description': str(row.iloc[1])
-                    })
-
-            return deliverables
+    @staticmethod
+    def iter_csv_deliverables(csv_path: str, max_rows: Optional[int] = None) -> Iterator[Dict[str, str]]:
+        """CSVファイルから成果物を1件ずつ読み出す（1行目はヘッダー、UTF-8）"""
+        with open(csv_path, encoding='utf-8-sig', newline='') as f:
+            yield from InputService._iter_rows(csv.reader(f), t('messages.csv_min_columns'), max_rows)
 
+    @staticmethod
+    def load_excel_data(excel_path: str) -> List[Dict[str, str]]:
+        """Excelファイルから成果物データを読み込む"""
+        try:
+            return list(InputService.iter_excel_deliverables(excel_path))
         except FileNotFoundError:
             raise FileNotFoundError(f"Excelファイル '{excel_path}' が見つかりません。")
         except Exception as e:
@@ -41,32 +49,19 @@ class InputService:
     def load_csv_data(csv_path: str) -> List[Dict[str, str]]:
         """CSVファイルから成果物データを読み込む"""
         try:
-            # UTF-8で読み込み、ヘッダー行ありと想定
-            df = pd.read_csv(csv_path, encoding='utf-8')
-
-            # 列数チェック
-            if len(df.columns) < 2:
-                raise ValueError(t('messages.csv_min_columns'))
-
-            # NaN値を空文字で置換
-            df = df.fillna('')
-
-            # 成果物リストを作成
-            deliverables = []
-            for index, row in df.iterrows():
-                if row.iloc[0]:  # 成果物名称が空でない場合のみ追加
-                    deliverables.append({
-                        'name': str(row.iloc[0]),
-                        'description': str(row.iloc[1])
-                    })
-
-            return deliverables
-
+            return list(InputService.iter_csv_deliverables(csv_path))
         except FileNotFoundError:
             raise FileNotFoundError(f"CSVファイル '{csv_path}' が見つかりません。")
         except Exception as e:
             raise ValueError(t('messages.csv_load_failed').replace('{error}', str(e)))
 
+    @staticmethod
+    def load_deliverables(file_path: str) -> List[Dict[str, str]]:
+        """ファイルから成果物データを読み込む（拡張子でExcel/CSVを自動判定）"""
+        if file_path.endswith('.csv'):
+            return InputService.load_csv_data(file_path)
+        return InputService.load_excel_data(file_path)
+
     @staticmethod
     def parse_deliverables_json(deliverables_data: List[Dict[str, str]]) -> List[Dict[str, str]]:
         """Webフォームから送信された成果物JSONを解析"""
@@ -89,3 +84,40 @@ class InputService:
 
         except Exception as e:
             raise ValueError(t('messages.deliverable_parse_failed').replace('{error}', str(e)))
+
+    @staticmethod
+    def _iter_rows(
+        rows: Iterable[Sequence[Any]], min_columns_message: str, max_rows: Optional[int] = None
+    ) -> Iterator[Dict[str, str]]:
+        """ヘッダー行の列数を確認し、A列: 成果物名称, B列: 説明 を成果物として返す
+
+        成果物名称が空の行は読み飛ばし、max_rows 件を超えたら ValueError。
+        """
+        max_rows = max_rows if max_rows is not None else settings.MAX_INPUT_ROWS
+        rows = iter(rows)
+
+        header = next(rows, None)
+        if header is None or len(header) < 2:
+            raise ValueError(min_columns_message)
+
+        count = 0
+        for row in rows:
+            name = InputService._cell_text(row, 0)
+            if not name:  # 成果物名称が空でない場合のみ追加
+                continue
+
+            count += 1
+            if count > max_rows:
+                raise ValueError(t('messages.input_too_many_rows').replace('{max}', str(max_rows)))
+
+            yield {
+                'name': name,
+                'description': InputService._cell_text(row, 1)
+            }
+
+    @staticmethod
+    def _cell_text(row: Sequence[Any], index: int) -> str:
+        """セル値を文字列に変換（空セル・欠けた列は空文字）"""
+        if index >= len(row) or row[index] is None:
+            return ''
+        return str(row[index])
@@ -0,0 +1,275 @@
+"""Background job queue for estimation processing
+
+Jobs are persisted in the ``jobs`` table so queued work survives a restart
+and can be picked up by any worker process. Each process runs a small pool
+of worker threads that poll the table, claim a pending job with an atomic
+compare-and-set UPDATE and run ``TaskService.process_task``.
+
+Job lifecycle follows TaskStatus:
+- PENDING: Queued, waiting for a worker
+- PROCESSING: Claimed by a worker
+- COMPLETED / FAILED: Finished
+"""
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional, List, Dict, Any
+
+from sqlalchemy import String, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.db.database import SessionLocal
+from app.models.job import Job
+from app.models.task import TaskStatus
+from app.services.task_service import TaskService
+
+logger = get_logger(__name__)
+
+
+class JobQueue:
+    """Persistent job queue with a pool of worker threads
+
+    Attributes:
+        session_factory: Callable returning a new DB session for workers
+        workers: Number of worker threads started by start()
+        poll_interval: Seconds an idle worker waits before polling again
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: int = None,
+        poll_interval: float = None
+    ):
+        """Initialize job queue
+
+        Args:
+            session_factory: DB session factory (default: SessionLocal)
+            workers: Number of worker threads (default: settings.TASK_WORKERS)
+            poll_interval: Idle poll interval in seconds (default: settings.TASK_POLL_INTERVAL)
+        """
+        self.session_factory = session_factory
+        self.workers = workers if workers is not None else settings.TASK_WORKERS
+        self.poll_interval = poll_interval if poll_interval is not None else settings.TASK_POLL_INTERVAL
+
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        """True if worker threads are running in this process"""
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self) -> None:
+        """Re-queue stale jobs and start worker threads"""
+        if self.is_running or self.workers <= 0:
+            return
+
+        self._stop_event.clear()
+        self.recover_stale_jobs()
+
+        self._threads = [
+            threading.Thread(target=self._worker_loop, name=f"job-worker-{i + 1}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        logger.info("JobQueue started", max_workers=self.workers)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Signal worker threads to stop and wait for them
+
+        Jobs still running when the timeout elapses stay PROCESSING and are
+        re-queued by recover_stale_jobs() on the next start.
+        """
+        self._stop_event.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        logger.info("JobQueue stopped")
+
+    def enqueue(self, db: Session, task_id: str, request_id: Optional[str] = None) -> Job:
+        """Persist a new PENDING job for the task and wake up a worker
+
+        A task has at most one active (PENDING or PROCESSING) job: the row is
+        inserted only if none exists (INSERT ... SELECT ... WHERE NOT EXISTS,
+        a single statement), so a double submit or client retry gets the
+        job already queued instead of processing the task twice at once.
+
+        Args:
+            db: DB session
+            task_id: Task to process
+            request_id: Request ID for tracing
+
+        Returns:
+            Created Job, or the task's existing active Job
+        """
+        while True:
+            job_id = str(uuid.uuid4())
+            inserted = db.execute(
+                insert(Job).from_select(
+                    ["id", "task_id", "status", "request_id", "attempts"],
+                    select(
+                        literal(job_id), literal(task_id), literal(TaskStatus.PENDING.value),
+                        literal(request_id, String), literal(0)
+                    ).where(~exists().where(self._active_job_filter(task_id))),
+                )
+            ).rowcount
+            db.commit()
+            if inserted:
+                job = db.get(Job, job_id)
+                self._wakeup.set()
+                logger.info("Job enqueued", request_id=request_id, task_id=task_id, job_id=job_id)
+                return job
+
+            job = db.query(Job).filter(self._active_job_filter(task_id)).order_by(Job.created_at).first()
+            if job is not None:
+                logger.info("Task already has an active job", request_id=request_id, task_id=task_id, job_id=job.id)
+                return job
+            # The active job finished in between: try inserting again
+
+    @staticmethod
+    def _active_job_filter(task_id: str):
+        """Filter for the task's PENDING/PROCESSING jobs"""
+        return (Job.task_id == task_id) & Job.status.in_(
+            [TaskStatus.PENDING.value, TaskStatus.PROCESSING.value]
+        )
+
+    def run_job(self, job_id: str, db: Optional[Session] = None) -> Optional[str]:
+        """Claim and run a single job
+
+        Args:
+            job_id: Job to run
+            db: DB session to use (default: new session from session_factory)
+
+        Returns:
+            Final job status, or None if the job was already claimed elsewhere
+        """
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            if not self._claim(db, job_id):
+                return None
+
+            job = db.get(Job, job_id)
+            status = TaskStatus.COMPLETED.value
+            error_message = None
+            try:
+                TaskService(db).process_task(job.task_id, job.request_id)
+            except Exception as e:
+                # process_task has already marked the task FAILED
+                db.rollback()
+                status = TaskStatus.FAILED.value
+                error_message = str(e)
+
+            db.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(status=status, error_message=error_message, finished_at=datetime.utcnow())
+            )
+            db.commit()
+
+            logger.info("Job finished", request_id=job.request_id, task_id=job.task_id, job_id=job_id, status=status)
+            return status
+        finally:
+            if own_session:
+                db.close()
+
+    def recover_stale_jobs(self) -> int:
+        """Re-queue jobs left PROCESSING by a crashed or stopped worker
+
+        Returns:
+            Number of re-queued jobs
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.TASK_JOB_STALE_SECONDS)
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(Job)
+                .where(Job.status == TaskStatus.PROCESSING.value, Job.started_at < cutoff)
+                .values(status=TaskStatus.PENDING.value)
+            )
+            db.commit()
+            if result.rowcount:
+                logger.warning("Re-queued stale jobs", count=result.rowcount)
+            return result.rowcount
+        except Exception as e:
+            db.rollback()
+            logger.error("Failed to recover stale jobs", error=str(e))
+            return 0
+        finally:
+            db.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get queue status
+
+        Returns:
+            Dictionary with worker count, running flag and job counts per status
+        """
+        db = self.session_factory()
+        try:
+            counts = dict(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+        finally:
+            db.close()
+
+        return {
+            "workers": self.workers,
+            "running": self.is_running,
+            "pending": counts.get(TaskStatus.PENDING.value, 0),
+            "processing": counts.get(TaskStatus.PROCESSING.value, 0),
+        }
+
+    def _claim(self, db: Session, job_id: str) -> bool:
+        """Atomically move a job from PENDING to PROCESSING
+
+        The WHERE clause on status makes the claim safe across threads and
+        processes: only one UPDATE can match the PENDING row.
+        """
+        result = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == TaskStatus.PENDING.value)
+            .values(
+                status=TaskStatus.PROCESSING.value,
+                started_at=datetime.utcnow(),
+                attempts=Job.attempts + 1,
+            )
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _next_pending_job_id(self) -> Optional[str]:
+        """Get the oldest PENDING job ID"""
+        db = self.session_factory()
+        try:
+            row = (
+                db.query(Job.id)
+                .filter(Job.status == TaskStatus.PENDING.value)
+                .order_by(Job.created_at)
+                .first()
+            )
+            return row[0] if row else None
+        finally:
+            db.close()
+
+    def _worker_loop(self) -> None:
+        """Poll for pending jobs until stop() is called"""
+        while not self._stop_event.is_set():
+            try:
+                job_id = self._next_pending_job_id()
+                if job_id:
+                    self.run_job(job_id)
+                    continue
+            except Exception as e:
+                logger.error("Job worker error", error=str(e))
+
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+
+# Global job queue instance (started in app startup)
+job_queue = JobQueue()
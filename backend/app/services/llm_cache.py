@@ -0,0 +1,234 @@
+"""LLM response cache
+
+Estimate prompts are fully determined by the deliverable, system requirements,
+Q&A, language and model, so re-submitting the same spreadsheet produces the
+same requests. Responses are cached under a SHA-256 of the exact messages,
+model and sampling parameters.
+
+Two layers:
+- L1: in-process LRU (OrderedDict), checked first
+- L2: SQLite file shared by all worker processes, with TTL and LRU eviction
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.metrics import metrics_collector
+
+logger = get_logger(__name__)
+
+
+class LLMResponseCache:
+    """Two-level (memory + SQLite) LLM response cache with TTL and LRU eviction
+
+    Attributes:
+        db_path: SQLite file path for the shared L2 store
+        ttl_seconds: Entry lifetime in seconds
+        max_entries: Maximum entries kept in SQLite (least recently used evicted)
+        l1_max_entries: Maximum entries kept in memory
+    """
+
+    def __init__(
+        self,
+        db_path: str = None,
+        ttl_seconds: int = None,
+        max_entries: int = None,
+        l1_max_entries: int = None
+    ):
+        """Initialize cache (the SQLite file is opened on first use)
+
+        Args:
+            db_path: SQLite file path (default: settings.LLM_CACHE_DB_PATH)
+            ttl_seconds: Entry TTL (default: settings.LLM_CACHE_TTL_SECONDS)
+            max_entries: SQLite size bound (default: settings.LLM_CACHE_MAX_ENTRIES)
+            l1_max_entries: Memory size bound (default: settings.LLM_CACHE_L1_MAX_ENTRIES)
+        """
+        self.db_path = db_path or settings.LLM_CACHE_DB_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.LLM_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else settings.LLM_CACHE_MAX_ENTRIES
+        self.l1_max_entries = l1_max_entries if l1_max_entries is not None else settings.LLM_CACHE_L1_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._l1: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # SQLite の件数（書き込みのたびに更新し、get_stats では SQLite を読まない）
+        self.entries = 0
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], **params) -> str:
+        """Build the cache key from the exact request
+
+        Args:
+            model: Model name
+            messages: Chat messages sent to the model
+            **params: Sampling parameters (temperature, max_tokens, ...)
+
+        Returns:
+            SHA-256 hex digest
+        """
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response content, or None on miss / expiry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._l1.move_to_end(key)
+                    self.l1_hits += 1
+                    return value
+                del self._l1[key]
+
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                    conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("LLM cache read failed", error=str(e))
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = row
+            self._put_l1(key, value, expires_at)
+            self.l2_hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response
+
+        Args:
+            key: Cache key from make_key()
+            value: Response content
+        """
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._put_l1(key, value, expires_at)
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_access, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, now, now, expires_at),
+                )
+                self._evict(conn, now)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("LLM cache write failed", error=str(e))
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._l1.clear()
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM llm_cache")
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("LLM cache clear failed", error=str(e))
+            self.l1_hits = self.l2_hits = self.misses = self.evictions = self.entries = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics
+
+        Reads counters only (no lock, no SQLite query), since it is part of the
+        metrics summary served by /health. The SQLite entry count is the one
+        seen at this worker's last write.
+
+        Returns:
+            Dictionary with enabled flag, hits per layer, misses, hit rate,
+            evictions and entry counts
+        """
+        hits = self.l1_hits + self.l2_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": settings.LLM_CACHE_ENABLED,
+            "hits": hits,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups * 100, 2) if lookups else 0.0,
+            "evictions": self.evictions,
+            "l1_entries": len(self._l1),
+            "entries": self.entries,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite store on first use (called with _lock held)"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, "
+                "last_access REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+            conn.commit()
+            self.entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def _put_l1(self, key: str, value: str, expires_at: float) -> None:
+        """Insert into L1, evicting the least recently used entry (called with _lock held)"""
+        self._l1[key] = (value, expires_at)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_max_entries:
+            self._l1.popitem(last=False)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries and trim to max_entries by last access (called with _lock held)
+
+        Also refreshes the entry count reported by get_stats().
+        """
+        removed = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            trimmed = conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            ).rowcount
+            removed += trimmed
+            count -= trimmed
+        self.evictions += removed
+        self.entries = count
+
+
+# Global response cache instance
+llm_response_cache = LLMResponseCache()
+metrics_collector.register_stats_provider("llm_cache", llm_response_cache.get_stats)
@@ -0,0 +1,242 @@
+"""Shared OpenAI client registry
+
+Building an ``openai.OpenAI`` client per request (or per call) opens a fresh
+connection pool every time, so each LLM call pays TCP/TLS setup again. This
+module keeps one client per timeout profile for the whole process, each
+backed by a tuned ``httpx`` connection pool with keep-alive (and optionally
+HTTP/2).
+
+Async clients are bound to the event loop that opened their connections, so
+they are kept per event loop. Sync code that needs to drive coroutines
+(e.g. job worker threads) should use ``run_sync`` so each thread reuses one
+loop, and therefore one async pool, across tasks.
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Coroutine, Dict, Optional, Tuple
+
+import httpx
+import openai
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.metrics import metrics_collector
+
+logger = get_logger(__name__)
+
+
+class _PoolStats:
+    """Request / connection counters for one client"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+
+    def on_trace(self, event_name: str) -> None:
+        """Count new TCP connections reported by httpcore's trace extension"""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+
+    def on_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+
+class LLMClientRegistry:
+    """Process-wide registry of pooled OpenAI clients
+
+    Clients are keyed by timeout profile: the model is a per-request
+    parameter and does not affect the connection, so all models with the
+    same timeout share one pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[float, Tuple[openai.OpenAI, httpx.Client, _PoolStats]] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[float, Tuple[openai.AsyncOpenAI, httpx.AsyncClient, _PoolStats]]]" = weakref.WeakKeyDictionary()
+        self._local = threading.local()
+
+    def get_client(self, timeout: Optional[float] = None) -> openai.OpenAI:
+        """Get the shared sync client for a timeout profile
+
+        Args:
+            timeout: Request timeout in seconds (default: settings.OPENAI_TIMEOUT)
+
+        Returns:
+            Shared openai.OpenAI client
+        """
+        timeout = float(timeout if timeout is not None else settings.OPENAI_TIMEOUT)
+        with self._lock:
+            entry = self._clients.get(timeout)
+            if entry is None:
+                stats = _PoolStats()
+                http_client = httpx.Client(
+                    timeout=timeout,
+                    limits=self._limits(),
+                    http2=self._http2_enabled(),
+                    event_hooks={"request": [self._sync_request_hook(stats)]},
+                )
+                client = openai.OpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    timeout=timeout,
+                    http_client=http_client,
+                )
+                entry = (client, http_client, stats)
+                self._clients[timeout] = entry
+                logger.info("OpenAI client created", kind="sync", timeout=timeout)
+            return entry[0]
+
+    def get_async_client(self, timeout: Optional[float] = None) -> openai.AsyncOpenAI:
+        """Get the shared async client for a timeout profile on the current event loop
+
+        Outside a running loop the calling thread's run_sync() loop is used,
+        since that is where the client will be awaited.
+
+        Args:
+            timeout: Request timeout in seconds (default: settings.OPENAI_TIMEOUT)
+
+        Returns:
+            Shared openai.AsyncOpenAI client
+        """
+        timeout = float(timeout if timeout is not None else settings.OPENAI_TIMEOUT)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = self._thread_loop()
+
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            entry = clients.get(timeout)
+            if entry is None:
+                stats = _PoolStats()
+                http_client = httpx.AsyncClient(
+                    timeout=timeout,
+                    limits=self._limits(),
+                    http2=self._http2_enabled(),
+                    event_hooks={"request": [self._async_request_hook(stats)]},
+                )
+                client = openai.AsyncOpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    timeout=timeout,
+                    http_client=http_client,
+                )
+                entry = (client, http_client, stats)
+                clients[timeout] = entry
+                logger.info("OpenAI client created", kind="async", timeout=timeout)
+            return entry[0]
+
+    def run_sync(self, coro: Coroutine) -> Any:
+        """Run a coroutine to completion on this thread's persistent event loop
+
+        Unlike asyncio.run(), the loop is kept open so async clients created
+        on it keep their pooled connections for the next call.
+        """
+        return self._thread_loop().run_until_complete(coro)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool occupancy and connection reuse statistics
+
+        Returns:
+            Dictionary with client count, pooled/idle/active connections,
+            request count, connections opened and reuse rate
+        """
+        with self._lock:
+            entries = list(self._clients.values())
+            for clients in self._async_clients.values():
+                entries.extend(clients.values())
+
+        requests = sum(stats.requests for _, _, stats in entries)
+        opened = sum(stats.connections_opened for _, _, stats in entries)
+        pooled = idle = 0
+        for _, http_client, _ in entries:
+            for connection in self._pool_connections(http_client):
+                pooled += 1
+                if connection.is_idle():
+                    idle += 1
+
+        return {
+            "clients": len(entries),
+            "max_connections": settings.OPENAI_POOL_MAX_CONNECTIONS,
+            "pooled_connections": pooled,
+            "idle_connections": idle,
+            "active_connections": pooled - idle,
+            "requests": requests,
+            "connections_opened": opened,
+            "connection_reuse_rate": round((requests - opened) / requests * 100, 2) if requests else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Close sync clients and forget all clients (new ones are created on next use)
+
+        Async clients are dropped without awaiting close; their connections
+        are released with their event loop.
+        """
+        with self._lock:
+            for _, http_client, _ in self._clients.values():
+                http_client.close()
+            self._clients.clear()
+            self._async_clients.clear()
+
+    def _thread_loop(self) -> asyncio.AbstractEventLoop:
+        """Get (or create) the persistent event loop for the calling thread"""
+        loop = getattr(self._local, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            self._local.loop = loop
+        return loop
+
+    @staticmethod
+    def _limits() -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.OPENAI_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.OPENAI_POOL_KEEPALIVE_EXPIRY,
+        )
+
+    @staticmethod
+    def _http2_enabled() -> bool:
+        """HTTP/2 needs the optional h2 package (pip install httpx[http2])"""
+        if not settings.OPENAI_HTTP2:
+            return False
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("OPENAI_HTTP2 is enabled but h2 is not installed, using HTTP/1.1")
+            return False
+
+    @staticmethod
+    def _sync_request_hook(stats: _PoolStats):
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            stats.on_trace(event_name)
+
+        def hook(request: httpx.Request) -> None:
+            stats.on_request()
+            request.extensions["trace"] = trace
+
+        return hook
+
+    @staticmethod
+    def _async_request_hook(stats: _PoolStats):
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            stats.on_trace(event_name)
+
+        async def hook(request: httpx.Request) -> None:
+            stats.on_request()
+            request.extensions["trace"] = trace
+
+        return hook
+
+    @staticmethod
+    def _pool_connections(http_client) -> list:
+        """Connections currently held by the client's httpcore pool"""
+        pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+        return list(getattr(pool, "connections", []) or [])
+
+
+# Global client registry instance
+llm_clients = LLMClientRegistry()
+metrics_collector.register_stats_provider("llm_connection_pool", llm_clients.get_stats)
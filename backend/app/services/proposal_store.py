@@ -0,0 +1,210 @@
+"""Chat adjustment proposal store
+
+``ChatService`` generates adjustment proposals in one request and applies
+the one the user picked in a later request, which may be handled by a
+different uvicorn worker. Proposals are therefore kept in one SQLite file
+(WAL mode) shared by all workers instead of a per-process dict, one row
+per task holding that task's latest proposals as JSON.
+
+The store is bounded:
+- entries expire after ``ttl_seconds``
+- beyond ``max_entries`` tasks or ``max_bytes`` of JSON, the least recently
+  used tasks are evicted
+- a task's entry is removed when the task is deleted (``delete_task``)
+"""
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.metrics import metrics_collector
+
+logger = get_logger(__name__)
+
+
+class ProposalStore:
+    """Cross-process proposal store with TTL, LRU and size bounds
+
+    Attributes:
+        db_path: SQLite file path shared by all worker processes
+        ttl_seconds: Entry lifetime in seconds
+        max_entries: Maximum number of tasks with stored proposals
+        max_bytes: Maximum total size of stored proposal JSON
+    """
+
+    def __init__(
+        self,
+        db_path: str = None,
+        ttl_seconds: int = None,
+        max_entries: int = None,
+        max_bytes: int = None
+    ):
+        """Initialize store (the SQLite file is opened on first use)
+
+        Args:
+            db_path: SQLite file path (default: settings.PROPOSAL_STORE_DB_PATH)
+            ttl_seconds: Entry TTL (default: settings.PROPOSAL_STORE_TTL_SECONDS)
+            max_entries: Task count bound (default: settings.PROPOSAL_STORE_MAX_ENTRIES)
+            max_bytes: Size bound (default: settings.PROPOSAL_STORE_MAX_BYTES)
+        """
+        self.db_path = db_path or settings.PROPOSAL_STORE_DB_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.PROPOSAL_STORE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else settings.PROPOSAL_STORE_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else settings.PROPOSAL_STORE_MAX_BYTES
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.evictions = 0
+        # 件数・合計サイズ（書き込みのたびに更新し、get_stats では SQLite を読まない）
+        self.entries = 0
+        self.total_bytes = 0
+
+    def set(self, task_id: str, proposals: List[Dict[str, Any]]) -> None:
+        """Store a task's proposals, replacing any earlier ones
+
+        Args:
+            task_id: Task ID
+            proposals: Proposals as returned to the client (JSON-serializable)
+        """
+        payload = json.dumps(proposals, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO proposals (task_id, payload, size, last_access, expires_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (task_id, payload, len(payload.encode("utf-8")), now, now + self.ttl_seconds),
+                    )
+                    self._evict(conn, now)
+                    totals = self._read_totals(conn)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                self.entries, self.total_bytes = totals
+            except sqlite3.Error as e:
+                logger.warning("Proposal store write failed", task_id=task_id, error=str(e))
+
+    def get(self, task_id: str) -> List[Dict[str, Any]]:
+        """Get a task's proposals
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Stored proposals, or [] if none / expired / evicted
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT payload FROM proposals WHERE task_id = ? AND expires_at > ?",
+                    (task_id, now),
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE proposals SET last_access = ? WHERE task_id = ?", (now, task_id))
+            except sqlite3.Error as e:
+                logger.warning("Proposal store read failed", task_id=task_id, error=str(e))
+                return []
+        return json.loads(row[0]) if row is not None else []
+
+    def delete_task(self, task_id: str) -> bool:
+        """Remove a task's proposals (called when the task is deleted)
+
+        Returns:
+            True if proposals were stored for the task
+        """
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "DELETE FROM proposals WHERE task_id = ? RETURNING size", (task_id,)
+                ).fetchone()
+                if row is None:
+                    return False
+                self.entries = max(0, self.entries - 1)
+                self.total_bytes = max(0, self.total_bytes - row[0])
+                return True
+            except sqlite3.Error as e:
+                logger.warning("Proposal store delete failed", task_id=task_id, error=str(e))
+                return False
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._connect().execute("DELETE FROM proposals")
+            self.evictions = self.entries = self.total_bytes = 0
+
+    def close(self) -> None:
+        """Close the connection (reopened on next use)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size
+
+        Reads counters only (no lock, no SQLite query), since it is part of the
+        metrics summary served by /health. Sizes are the ones seen at this
+        worker's last write.
+
+        Returns:
+            Dictionary with entry count, total bytes, bounds and evictions
+        """
+        return {
+            "entries": self.entries,
+            "bytes": self.total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite file on first use (called with _lock held)"""
+        if self._conn is None:
+            # Autocommit mode: writes that need a transaction open it with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS proposals ("
+                "task_id TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, "
+                "last_access REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_proposals_last_access ON proposals (last_access)")
+            self.entries, self.total_bytes = self._read_totals(conn)
+            self._conn = conn
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then the least recently used beyond the bounds (called in a transaction)"""
+        removed = conn.execute("DELETE FROM proposals WHERE expires_at <= ?", (now,)).rowcount
+        removed += conn.execute(
+            "DELETE FROM proposals WHERE task_id IN ("
+            " SELECT task_id FROM ("
+            "  SELECT task_id,"
+            "   ROW_NUMBER() OVER (ORDER BY last_access DESC) AS position,"
+            "   SUM(size) OVER (ORDER BY last_access DESC ROWS UNBOUNDED PRECEDING) AS running_bytes"
+            "  FROM proposals)"
+            " WHERE position > ? OR running_bytes > ?)",
+            (self.max_entries, self.max_bytes),
+        ).rowcount
+        if removed:
+            self.evictions += removed
+
+    @staticmethod
+    def _read_totals(conn: sqlite3.Connection) -> Tuple[int, int]:
+        """Entry count and total size (write path only; get_stats() never queries)"""
+        return tuple(conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM proposals").fetchone())
+
+
+# Global proposal store instance
+proposal_store = ProposalStore()
+metrics_collector.register_stats_provider("proposal_store", proposal_store.get_stats)
@@ -0,0 +1,211 @@
+"""Speculative question generation at task creation
+
+GET /tasks/{task_id}/questions used to make the user wait on an LLM
+round-trip when the question screen opened. With QUESTION_PREFETCH_ENABLED,
+create_task starts question generation in a background thread while the
+user is still on the upload confirmation screen, and the result is stored
+on the task (``task_questions`` table). get_questions then returns the
+stored questions, or waits on the in-flight generation.
+
+In-flight futures are per process. A request served by another worker
+process finds the questions once they are stored; before that it generates
+them itself, as without prefetching. Failed generations are not stored, so
+the request path still falls back to default questions on its own.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.metrics import metrics_collector
+from app.db.database import SessionLocal
+from app.services.question_service import QuestionService
+from app.services.task_service import TaskService
+
+logger = get_logger(__name__)
+
+
+class QuestionPrefetcher:
+    """Background question generation with per-task in-flight futures
+
+    Attributes:
+        session_factory: Callable returning a new DB session for background threads
+        workers: Maximum concurrent generations in this process
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: int = None
+    ):
+        """Initialize prefetcher (threads are started on first use)
+
+        Args:
+            session_factory: DB session factory (default: SessionLocal)
+            workers: Thread count (default: settings.QUESTION_PREFETCH_WORKERS)
+        """
+        self.session_factory = session_factory
+        self.workers = workers if workers is not None else settings.QUESTION_PREFETCH_WORKERS
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+
+        self.started = 0
+        self.failed = 0
+        self.served = 0  # requests answered with prefetched questions
+        self.waited = 0  # of which had to wait on the in-flight generation
+
+    def start(
+        self, task_id: str, deliverables: List[Dict[str, str]], system_requirements: str,
+        request_id: Optional[str] = None
+    ) -> Future:
+        """Start generating a task's questions in the background
+
+        Args:
+            task_id: Task ID
+            deliverables: Deliverables as returned by TaskService.get_deliverables
+            system_requirements: System requirements text
+            request_id: Request ID for tracing
+
+        Returns:
+            Future resolving to the stored questions (the running one if already started)
+        """
+        with self._lock:
+            future = self._inflight.get(task_id)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.workers), thread_name_prefix="question-prefetch"
+                )
+            future = self._executor.submit(
+                self._generate, task_id, deliverables, system_requirements, request_id
+            )
+            self._inflight[task_id] = future
+            self.started += 1
+        future.add_done_callback(lambda f: self._forget(task_id, f))
+
+        logger.info("Question prefetch started", request_id=request_id, task_id=task_id)
+        return future
+
+    async def get_questions(
+        self, task_service: TaskService, task_id: str, timeout: float = None
+    ) -> Optional[List[str]]:
+        """Get prefetched questions, waiting on an in-flight generation if needed
+
+        Args:
+            task_service: TaskService bound to the request's DB session
+            task_id: Task ID
+            timeout: Max seconds to wait (default: settings.QUESTION_PREFETCH_WAIT_SECONDS)
+
+        Returns:
+            Questions, or None if none were prefetched, generation failed or timed out
+        """
+        # Look up the future before reading the table: a generation that finishes in
+        # between has already stored its questions when it leaves _inflight
+        with self._lock:
+            future = self._inflight.get(task_id)
+
+        questions = task_service.get_questions(task_id)
+        if questions:
+            self._count_served(waited=False)
+            return questions
+        if future is None:
+            return None
+
+        timeout = timeout if timeout is not None else settings.QUESTION_PREFETCH_WAIT_SECONDS
+        try:
+            questions = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Question prefetch still running, generating on request", task_id=task_id, timeout=timeout)
+            return None
+        except Exception:
+            return None  # logged in _generate
+
+        self._count_served(waited=True)
+        return questions
+
+    def shutdown(self) -> None:
+        """Stop accepting work and cancel queued generations"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefetch statistics
+
+        Returns:
+            Dictionary with enabled flag, started/failed/served/waited counts and in-flight count
+        """
+        with self._lock:
+            return {
+                "enabled": settings.QUESTION_PREFETCH_ENABLED,
+                "started": self.started,
+                "failed": self.failed,
+                "served": self.served,
+                "waited": self.waited,
+                "in_flight": len(self._inflight),
+            }
+
+    def _generate(
+        self, task_id: str, deliverables: List[Dict[str, str]], system_requirements: str,
+        request_id: Optional[str]
+    ) -> List[str]:
+        """Generate and store questions (runs in a background thread)"""
+        start = time.perf_counter()
+        try:
+            questions = QuestionService().generate_questions(
+                deliverables, system_requirements, request_id, fallback=False
+            )
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logger.warning(
+                "Question prefetch failed, questions will be generated on request",
+                request_id=request_id, task_id=task_id, error=str(e)
+            )
+            raise
+
+        db = self.session_factory()
+        try:
+            if not TaskService(db).save_questions(task_id, questions):
+                # Task deleted while generating: nothing is stored (no orphan rows after a GDPR delete)
+                logger.info("Task deleted during question prefetch, not storing", request_id=request_id, task_id=task_id)
+        except Exception as e:
+            db.rollback()
+            logger.warning("Failed to store prefetched questions", request_id=request_id, task_id=task_id, error=str(e))
+        finally:
+            db.close()
+
+        logger.info(
+            "Question prefetch completed",
+            request_id=request_id,
+            task_id=task_id,
+            question_count=len(questions),
+            duration=round(time.perf_counter() - start, 3)
+        )
+        return questions
+
+    def _forget(self, task_id: str, future: Future) -> None:
+        """Drop a finished future from the in-flight table"""
+        with self._lock:
+            if self._inflight.get(task_id) is future:
+                del self._inflight[task_id]
+
+    def _count_served(self, waited: bool) -> None:
+        with self._lock:
+            self.served += 1
+            if waited:
+                self.waited += 1
+
+
+# Global prefetcher instance
+question_prefetcher = QuestionPrefetcher()
+metrics_collector.register_stats_provider("question_prefetch", question_prefetcher.get_stats)
@@ -1,12 +1,12 @@
 """Question generation service"""
-import openai
 import time
 from typing import List, Dict, Optional
 from app.core.config import settings
 from app.prompts.question_prompts import get_question_generation_prompt, get_system_prompt
 from app.core.i18n import t
-from app.services.retry_service import retry_with_exponential_backoff
+from app.services.retry_service import retry_with_exponential_backoff, async_retry_with_exponential_backoff
 from app.services.circuit_breaker import openai_circuit_breaker
+from app.services.llm_client import llm_clients
 from app.core.logging_config import get_logger
 from app.core.metrics import metrics_collector
 
@@ -17,17 +17,22 @@ class QuestionService:
     """Question generation service"""
 
     def __init__(self):
-        self.client = openai.OpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            timeout=settings.OPENAI_TIMEOUT
-        )
+        self.client = llm_clients.get_client()
         self.model = settings.OPENAI_MODEL
 
+    @property
+    def async_client(self):
+        """Shared AsyncOpenAI client for the current event loop"""
+        return llm_clients.get_async_client()
+
     def generate_questions(
         self, deliverables: List[Dict[str, str]], system_requirements: str,
-        request_id: Optional[str] = None
+        request_id: Optional[str] = None, fallback: bool = True
     ) -> List[str]:
-        """Generate 3 questions to improve estimation accuracy from deliverables and system requirements"""
+        """Generate 3 questions to improve estimation accuracy from deliverables and system requirements
+
+        With fallback=False, LLM failures are raised instead of returning default questions.
+        """
 
         logger.info(
             "Starting question generation",
@@ -54,6 +59,8 @@ class QuestionService:
                 f"Question generation failed: {e}",
                 request_id=request_id
             )
+            if not fallback:
+                raise
             # Use default questions as fallback
             logger.warning(
                 "Using default questions as fallback",
@@ -61,89 +68,161 @@ class QuestionService:
             )
             return self._get_default_questions()
 
+    async def generate_questions_async(
+        self, deliverables: List[Dict[str, str]], system_requirements: str,
+        request_id: Optional[str] = None
+    ) -> List[str]:
+        """Async version of generate_questions (does not block the event loop)"""
+
+        logger.info(
+            "Starting question generation",
+            request_id=request_id,
+            deliverable_count=len(deliverables)
+        )
+
+        try:
+            questions = await openai_circuit_breaker.call_async(
+                self._call_llm_with_retry_async,
+                deliverables,
+                system_requirements,
+                request_id
+            )
+            logger.info(
+                "Question generation completed",
+                request_id=request_id,
+                question_count=len(questions)
+            )
+            return questions
+        except Exception as e:
+            logger.error(
+                f"Question generation failed: {e}",
+                request_id=request_id
+            )
+            logger.warning(
+                "Using default questions as fallback",
+                request_id=request_id
+            )
+            return self._get_default_questions()
+
     @retry_with_exponential_backoff()
     def _call_llm_with_retry(
         self, deliverables: List[Dict[str, str]], system_requirements: str,
         request_id: Optional[str] = None
     ) -> List[str]:
         """Call LLM with retry logic (exponential backoff)"""
-        # Format deliverable list
-        deliverable_list = "\n".join(
-            [f"- {item['name']}: {item['description']}" for item in deliverables]
-        )
-
-        prompt = get_question_generation_prompt(deliverable_list, system_requirements)
+        messages = self._build_messages(deliverables, system_requirements)
 
         # Measure OpenAI API call duration
         start_time = time.perf_counter()
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": get_system_prompt(),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                messages=messages,
                 max_tokens=500,
                 temperature=0.7,
                 timeout=settings.OPENAI_TIMEOUT
             )
-            duration = time.perf_counter() - start_time
+            self._record_llm_success(response, time.perf_counter() - start_time, request_id)
+            return self._parse_questions(response)
+        except Exception as e:
+            self._record_llm_failure(e, time.perf_counter() - start_time, request_id)
+            raise
 
-            # Record successful OpenAI API call metrics (TODO-9: added input/output tokens for cost tracking)
-            metrics_collector.record_openai_call(
-                model=self.model,
-                tokens=response.usage.total_tokens,
-                duration=duration,
-                success=True,
-                request_id=request_id or "unknown",
-                operation="question",
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens
-            )
+    @async_retry_with_exponential_backoff()
+    async def _call_llm_with_retry_async(
+        self, deliverables: List[Dict[str, str]], system_requirements: str,
+        request_id: Optional[str] = None
+    ) -> List[str]:
+        """Call LLM asynchronously with retry logic (exponential backoff)"""
+        messages = self._build_messages(deliverables, system_requirements)
 
-            logger.debug(
-                "OpenAI API call successful",
-                request_id=request_id,
+        start_time = time.perf_counter()
+        try:
+            response = await self.async_client.chat.completions.create(
                 model=self.model,
-                tokens=response.usage.total_tokens,
-                duration=round(duration, 3)
+                messages=messages,
+                max_tokens=500,
+                temperature=0.7,
+                timeout=settings.OPENAI_TIMEOUT
             )
+            self._record_llm_success(response, time.perf_counter() - start_time, request_id)
+            return self._parse_questions(response)
+        except Exception as e:
+            self._record_llm_failure(e, time.perf_counter() - start_time, request_id)
+            raise
 
-            questions_text = response.choices[0].message.content.strip()
-            questions = [q.strip() for q in questions_text.split("\n") if q.strip()]
+    def _build_messages(
+        self, deliverables: List[Dict[str, str]], system_requirements: str
+    ) -> List[Dict[str, str]]:
+        """Build chat messages for question generation"""
+        # Format deliverable list
+        deliverable_list = "\n".join(
+            [f"- {item['name']}: {item['description']}" for item in deliverables]
+        )
 
-            # Ensure 3 questions
-            if len(questions) < 3:
-                questions.extend(self._get_default_questions()[len(questions):])
+        prompt = get_question_generation_prompt(deliverable_list, system_requirements)
+        return [
+            {
+                "role": "system",
+                "content": get_system_prompt(),
+            },
+            {"role": "user", "content": prompt},
+        ]
 
-            return questions[:3]
+    def _parse_questions(self, response) -> List[str]:
+        """Extract exactly 3 questions from the LLM response"""
+        questions_text = response.choices[0].message.content.strip()
+        questions = [q.strip() for q in questions_text.split("\n") if q.strip()]
+
+        # Ensure 3 questions
+        if len(questions) < 3:
+            questions.extend(self._get_default_questions()[len(questions):])
+
+        return questions[:3]
+
+    def _record_llm_success(self, response, duration: float, request_id: Optional[str]) -> None:
+        """Record metrics and log a successful OpenAI API call"""
+        # Record successful OpenAI API call metrics (TODO-9: added input/output tokens for cost tracking)
+        metrics_collector.record_openai_call(
+            model=self.model,
+            tokens=response.usage.total_tokens,
+            duration=duration,
+            success=True,
+            request_id=request_id or "unknown",
+            operation="question",
+            input_tokens=response.usage.prompt_tokens,
+            output_tokens=response.usage.completion_tokens
+        )
 
-        except Exception as e:
-            duration = time.perf_counter() - start_time
+        logger.debug(
+            "OpenAI API call successful",
+            request_id=request_id,
+            model=self.model,
+            tokens=response.usage.total_tokens,
+            duration=round(duration, 3)
+        )
 
-            # Record failed OpenAI API call metrics (TODO-9: added input/output tokens for cost tracking)
-            metrics_collector.record_openai_call(
-                model=self.model,
-                tokens=0,
-                duration=duration,
-                success=False,
-                request_id=request_id or "unknown",
-                operation="question",
-                input_tokens=0,
-                output_tokens=0
-            )
+    def _record_llm_failure(self, error: Exception, duration: float, request_id: Optional[str]) -> None:
+        """Record metrics and log a failed OpenAI API call"""
+        # Record failed OpenAI API call metrics (TODO-9: added input/output tokens for cost tracking)
+        metrics_collector.record_openai_call(
+            model=self.model,
+            tokens=0,
+            duration=duration,
+            success=False,
+            request_id=request_id or "unknown",
+            operation="question",
+            input_tokens=0,
+            output_tokens=0
+        )
 
-            logger.error(
-                "OpenAI API call failed",
-                request_id=request_id,
-                model=self.model,
-                error=str(e),
-                duration=round(duration, 3)
-            )
-            raise
+        logger.error(
+            "OpenAI API call failed",
+            request_id=request_id,
+            model=self.model,
+            error=str(error),
+            duration=round(duration, 3)
+        )
 
     def _get_default_questions(self) -> List[str]:
         """Return default questions"""
@@ -3,6 +3,7 @@
 This module provides a decorator for retrying operations with exponential backoff,
 primarily designed for OpenAI API calls and other external service interactions.
 """
+import asyncio
 import time
 import logging
 from functools import wraps
@@ -74,6 +75,70 @@ def retry_with_exponential_backoff(
     return decorator
 
 
+def async_retry_with_exponential_backoff(
+    max_retries: int = None,
+    initial_delay: float = None,
+    backoff_factor: float = None,
+    exceptions: Tuple[Type[Exception], ...] = (Exception,)
+) -> Callable:
+    """Async version of retry_with_exponential_backoff for coroutine functions
+
+    Waits with asyncio.sleep so other coroutines keep running during backoff.
+
+    Args:
+        max_retries: Maximum number of retry attempts (default: settings.OPENAI_MAX_RETRIES)
+        initial_delay: Initial delay in seconds (default: settings.OPENAI_RETRY_INITIAL_DELAY)
+        backoff_factor: Exponential backoff factor (default: settings.OPENAI_RETRY_BACKOFF_FACTOR)
+        exceptions: Tuple of exception types to catch and retry
+
+    Returns:
+        Decorated coroutine function with retry logic
+
+    Example:
+        @async_retry_with_exponential_backoff(max_retries=3)
+        async def call_api():
+            return await async_client.chat.completions.create(...)
+    """
+    max_retries = max_retries if max_retries is not None else settings.OPENAI_MAX_RETRIES
+    initial_delay = initial_delay if initial_delay is not None else settings.OPENAI_RETRY_INITIAL_DELAY
+    backoff_factor = backoff_factor if backoff_factor is not None else settings.OPENAI_RETRY_BACKOFF_FACTOR
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            last_exception = None
+
+            for attempt in range(max_retries):
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as e:
+                    last_exception = e
+
+                    # If this is the last attempt, raise the exception
+                    if attempt == max_retries - 1:
+                        logger.error(
+                            f"{func.__name__} failed after {max_retries} attempts: {e}"
+                        )
+                        raise
+
+                    # Calculate delay with exponential backoff
+                    delay = initial_delay * (backoff_factor ** attempt)
+
+                    logger.warning(
+                        f"{func.__name__} retry {attempt + 1}/{max_retries} "
+                        f"after {delay:.1f}s: {e}"
+                    )
+
+                    await asyncio.sleep(delay)
+
+            # This should never be reached, but raise if it does
+            if last_exception:
+                raise last_exception
+
+        return wrapper
+    return decorator
+
+
 def retry_with_custom_backoff(
     backoff_delays: list[float],
     exceptions: Tuple[Type[Exception], ...] = (Exception,)
@@ -0,0 +1,131 @@
+"""Safety verdict cache
+
+The same text is often checked more than once: system requirements when a
+task is created and again on a retry, or an identical re-submission. The
+verdict only depends on the text and the rules that judged it, so verdicts
+are kept in a bounded in-process LRU with a TTL, keyed by a SHA-256 of the
+normalized text and a ruleset version (injection patterns, guard
+configuration and state, message language). Changing any of those yields
+new keys, so stale verdicts are never reused; they simply age out.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics_collector
+
+
+class SafetyVerdictCache:
+    """In-process LRU + TTL cache of (is_safe, message) verdicts
+
+    Attributes:
+        max_entries: Maximum cached verdicts (least recently used evicted)
+        ttl_seconds: Verdict lifetime in seconds
+    """
+
+    def __init__(
+        self,
+        max_entries: int = None,
+        ttl_seconds: int = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Size bound (default: settings.SAFETY_CACHE_MAX_ENTRIES)
+            ttl_seconds: Entry TTL (default: settings.SAFETY_CACHE_TTL_SECONDS)
+            clock: Time source (injectable for tests)
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.SAFETY_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.SAFETY_CACHE_TTL_SECONDS
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[bool, str, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text before checking and hashing (line endings, surrounding whitespace)"""
+        return (text or "").replace("\r\n", "\n").strip()
+
+    @staticmethod
+    def make_key(normalized_text: str, ruleset_version: str) -> str:
+        """
+        Build the cache key
+
+        Args:
+            normalized_text: Output of normalize()
+            ruleset_version: Identifies the rules that produce the verdict
+
+        Returns:
+            SHA-256 hex digest
+        """
+        digest = hashlib.sha256(ruleset_version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalized_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bool, str]]:
+        """
+        Get a cached verdict
+
+        Returns:
+            (is_safe, message), or None on miss / expiry
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                is_safe, message, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return is_safe, message
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, is_safe: bool, message: str) -> None:
+        """Store a verdict, evicting the least recently used entries beyond max_entries"""
+        expires_at = self.clock() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (is_safe, message, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss statistics
+
+        Returns:
+            Dictionary with enabled flag, hits, misses, hit rate, evictions and entry count
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": settings.SAFETY_CACHE_ENABLED,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+
+# Global verdict cache instance
+safety_verdict_cache = SafetyVerdictCache()
+metrics_collector.register_stats_provider("safety_cache", safety_verdict_cache.get_stats)
@@ -4,32 +4,54 @@ SafetyService: Integrated safety checking and rejection handling
 This service provides:
 - Input safety validation (combining Guardrails and Security checks)
 - Output safety validation
+- Batch input validation with per-field verdicts
+- Verdict caching, so retried and duplicate inputs skip the checks
 - Rejection handling with user-friendly error messages
 - Comprehensive logging for security auditing
 """
 
-from typing import Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 import logging
 from fastapi import HTTPException
 from app.services.guardrails_service import GuardrailsService
+from app.services.safety_cache import SafetyVerdictCache, safety_verdict_cache
 from app.services.security_service import SecurityService
-from app.core.i18n import t
+from app.core.config import settings
+from app.core.i18n import i18n, t
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SafetyVerdict:
+    """Safety check result for one input field"""
+    field: str
+    is_safe: bool
+    message: str  # "OK" if safe, error message if not
+
+
 class SafetyService:
     """Safety checking and rejection handling service"""
 
-    def __init__(self):
-        """Initialize with Guardrails and Security services"""
+    def __init__(self, cache: Optional[SafetyVerdictCache] = None):
+        """
+        Initialize with Guardrails and Security services
+
+        Args:
+            cache: Verdict cache (default: the process-wide safety_verdict_cache)
+        """
         self.guardrails = GuardrailsService()
         self.security = SecurityService()
+        self.cache = cache or safety_verdict_cache
 
     def check_input_safety(self, content: str, content_type: str = "input") -> Tuple[bool, str]:
         """
         Check input safety using both Guardrails and Security services
 
+        The text is normalized (line endings, surrounding whitespace) before
+        checking; a cached verdict for the same text and ruleset is reused.
+
         Args:
             content: Input text to validate
             content_type: Type of content (for logging purposes)
@@ -42,6 +64,12 @@ class SafetyService:
         Raises:
             No exceptions raised - returns status tuple instead
         """
+        content = self.cache.normalize(content)
+        cache_key = self._cache_keys([content])[0]
+        cached = self._cached_verdict(cache_key, content_type)
+        if cached is not None:
+            return cached
+
         try:
             # 1. Security check (prompt injection)
             self.security.check_prompt_injection(content)
@@ -50,17 +78,96 @@ class SafetyService:
             self.guardrails.validate_input(content)
 
             logger.info(f"Safety check passed for {content_type}")
+            self._store_verdict(cache_key, True, "OK")
             return True, "OK"
 
         except ValueError as e:
             error_msg = str(e)
             logger.warning(f"Safety check failed ({content_type}): {error_msg}")
+            self._store_verdict(cache_key, False, error_msg)
             return False, error_msg
         except Exception as e:
             error_msg = str(e)
             logger.error(f"Unexpected error in safety check ({content_type}): {error_msg}")
             return False, error_msg
 
+    def check_inputs_safety(self, fields: Dict[str, str]) -> List[SafetyVerdict]:
+        """
+        Check several inputs at once (e.g. all answers of a submission)
+
+        Fields with a cached verdict are answered from the cache. For the
+        rest, prompt injection rules are run on each field (scan_many);
+        fields that pass are then checked by the shared Guardrails input guard.
+
+        Args:
+            fields: Field name -> input text, in reporting order
+
+        Returns:
+            One SafetyVerdict per field, in the same order
+
+        Raises:
+            No exceptions raised - verdicts carry the error messages instead
+        """
+        names = list(fields)
+        texts = [self.cache.normalize(text) for text in fields.values()]
+        cache_keys = self._cache_keys(texts)
+        cached = [self._cached_verdict(key, name) for key, name in zip(cache_keys, names)]
+
+        pending = [i for i, verdict in enumerate(cached) if verdict is None]
+        matches = dict(zip(pending, self.security.scan_many([texts[i] for i in pending])))
+
+        verdicts = []
+        for i, name in enumerate(names):
+            if cached[i] is not None:
+                verdicts.append(SafetyVerdict(name, *cached[i]))
+                continue
+            try:
+                self.security.raise_for_match(matches[i])
+                self.guardrails.validate_input(texts[i])
+                verdicts.append(SafetyVerdict(name, True, "OK"))
+                self._store_verdict(cache_keys[i], True, "OK")
+            except ValueError as e:
+                logger.warning(f"Safety check failed ({name}): {e}")
+                verdicts.append(SafetyVerdict(name, False, str(e)))
+                self._store_verdict(cache_keys[i], False, str(e))
+            except Exception as e:
+                logger.error(f"Unexpected error in safety check ({name}): {e}")
+                verdicts.append(SafetyVerdict(name, False, str(e)))
+
+        passed = sum(1 for verdict in verdicts if verdict.is_safe)
+        logger.info(f"Safety check passed for {passed}/{len(verdicts)} fields")
+        return verdicts
+
+    def ruleset_version(self) -> str:
+        """
+        Identify everything a verdict depends on besides the text
+
+        Injection rule table, Guardrails configuration and state, and the
+        message language (verdicts carry translated messages).
+        """
+        return f"{self.security.ruleset_version()}|{self.guardrails.fingerprint()}|{i18n.language}"
+
+    def _cache_keys(self, texts: List[str]) -> List[Optional[str]]:
+        """Cache key per normalized text (None when the cache is disabled)"""
+        if not settings.SAFETY_CACHE_ENABLED:
+            return [None] * len(texts)
+        version = self.ruleset_version()
+        return [self.cache.make_key(text, version) for text in texts]
+
+    def _cached_verdict(self, cache_key: Optional[str], content_type: str) -> Optional[Tuple[bool, str]]:
+        """Look up a verdict (None on miss or when the cache is disabled)"""
+        if cache_key is None:
+            return None
+        verdict = self.cache.get(cache_key)
+        if verdict is not None:
+            logger.info(f"Safety check cache hit for {content_type} (safe={verdict[0]})")
+        return verdict
+
+    def _store_verdict(self, cache_key: Optional[str], is_safe: bool, message: str) -> None:
+        """Cache a verdict (unexpected errors are not cached, so they are retried)"""
+        if cache_key is not None:
+            self.cache.set(cache_key, is_safe, message)
+
     def check_output_safety(self, content: str) -> Tuple[bool, str]:
         """
         Check output safety using Guardrails service
@@ -147,3 +254,22 @@ class SafetyService:
         is_safe, message = self.check_input_safety(content, content_type)
         if not is_safe:
             self.handle_rejection(message, content_type)
+
+    def validate_many_and_reject(self, fields: Dict[str, str]) -> List[SafetyVerdict]:
+        """
+        Convenience method: validate several inputs and reject if any is unsafe
+
+        Args:
+            fields: Field name -> input text, in reporting order
+
+        Returns:
+            Per-field verdicts (all safe)
+
+        Raises:
+            HTTPException: 400 Bad Request for the first unsafe field
+        """
+        verdicts = self.check_inputs_safety(fields)
+        for verdict in verdicts:
+            if not verdict.is_safe:
+                self.handle_rejection(verdict.message, verdict.field)
+        return verdicts
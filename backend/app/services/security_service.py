@@ -1,9 +1,45 @@
-"""Security service for detecting malicious inputs and prompt injection attacks"""
+"""Security service for detecting malicious inputs and prompt injection attacks
+
+Patterns are compiled once per process into an ordered rule table
+(``SecurityService.compiled_rules()``) instead of being passed to
+``re.search`` on every call. A leading ``.*`` is dropped at compile time:
+for a search it does not change what matches, but it made each search
+quadratic in the length of a line.
+"""
+import hashlib
 import re
-from typing import List
+from dataclasses import dataclass
+from typing import List, Optional, Pattern
 from app.core.i18n import t
 
 
+@dataclass(frozen=True)
+class InjectionRule:
+    """A compiled detection pattern"""
+    category: str  # prompt_injection / command_injection / sql_injection
+    source: str    # pattern list the rule came from (EN / JA / COMMAND / SQL)
+    pattern: str   # pattern as listed in SecurityService
+    regex: Pattern
+
+
+@dataclass(frozen=True)
+class InjectionMatch:
+    """The rule that matched and where"""
+    category: str
+    source: str
+    pattern: str
+    start: int
+    end: int
+
+
+# Error message per category
+_CATEGORY_MESSAGES = {
+    "prompt_injection": "messages.prompt_injection_detected",
+    "command_injection": "messages.command_injection_detected",
+    "sql_injection": "messages.sql_injection_detected",
+}
+
+
 class SecurityService:
     """
     Service for detecting and preventing security threats including:
@@ -66,6 +102,72 @@ class SecurityService:
         r";\s*UPDATE\s+",
     ]
 
+    _compiled_rules: Optional[List[InjectionRule]] = None
+    _ruleset_version: Optional[str] = None
+
+    @classmethod
+    def compiled_rules(cls) -> List[InjectionRule]:
+        """
+        Get the compiled rule table (built on first use, shared by all instances)
+
+        Rules are ordered by check priority: prompt injection (EN, JA),
+        command injection, then SQL injection.
+        """
+        if cls.__dict__.get("_compiled_rules") is None:
+            groups = [
+                ("prompt_injection", "EN", cls.INJECTION_PATTERNS_EN, re.IGNORECASE),
+                ("prompt_injection", "JA", cls.INJECTION_PATTERNS_JA, 0),
+                ("command_injection", "COMMAND", cls.COMMAND_PATTERNS, re.IGNORECASE),
+                ("sql_injection", "SQL", cls.SQL_PATTERNS, re.IGNORECASE),
+            ]
+            cls._compiled_rules = [
+                InjectionRule(category, source, pattern, re.compile(cls._search_form(pattern), flags))
+                for category, source, patterns, flags in groups
+                for pattern in patterns
+            ]
+        return cls._compiled_rules
+
+    @classmethod
+    def ruleset_version(cls) -> str:
+        """
+        Short hash of the rule table
+
+        Changes whenever a pattern is added, removed, edited or reordered,
+        so cached verdicts from an older rule set are not reused.
+        """
+        if cls.__dict__.get("_ruleset_version") is None:
+            digest = hashlib.sha256()
+            for rule in cls.compiled_rules():
+                digest.update(f"{rule.category}\0{rule.regex.pattern}\0{rule.regex.flags}\n".encode("utf-8"))
+            cls._ruleset_version = digest.hexdigest()[:16]
+        return cls._ruleset_version
+
+    @staticmethod
+    def _search_form(pattern: str) -> str:
+        """Drop a leading '.*' (redundant for re.search, but quadratic to evaluate)"""
+        while pattern.startswith(".*"):
+            pattern = pattern[2:]
+        return pattern
+
+    def scan(self, text: str) -> Optional[InjectionMatch]:
+        """
+        Find the first matching rule in priority order
+
+        Args:
+            text: User input text
+
+        Returns:
+            InjectionMatch for the first rule that matches, or None
+        """
+        if not text:
+            return None
+
+        for rule in self.compiled_rules():
+            match = rule.regex.search(text)
+            if match:
+                return InjectionMatch(rule.category, rule.source, rule.pattern, match.start(), match.end())
+        return None
+
     def check_prompt_injection(self, text: str) -> None:
         """
         Check for prompt injection attacks
@@ -79,32 +181,39 @@ class SecurityService:
         Raises:
             ValueError: If a malicious pattern is detected
         """
-        if not text:
+        self.raise_for_match(self.scan(text))
+
+    def scan_many(self, texts: List[str]) -> List[Optional[InjectionMatch]]:
+        """
+        Scan several inputs (e.g. all Q&A answers)
+
+        Each input is scanned on its own: several rules are anchored with
+        ^/$ and would only see the start/end of a joined string, and the
+        precompiled rules are cheap enough per input.
+
+        Args:
+            texts: User input texts
+
+        Returns:
+            InjectionMatch or None for each text, in order
+        """
+        return [self.scan(text) for text in texts]
+
+    def raise_for_match(self, match: Optional[InjectionMatch]) -> None:
+        """
+        Reject input for a scan() result
+
+        Args:
+            match: Result of scan() / scan_many()
+
+        Raises:
+            ValueError: If match is not None
+        """
+        if match is None:
             return
 
-        # Check English prompt injection patterns
-        for pattern in self.INJECTION_PATTERNS_EN:
-            if re.search(pattern, text, re.IGNORECASE):
-                print(f"[SECURITY] Prompt injection detected (EN): {pattern}")
-                raise ValueError(t('messages.prompt_injection_detected'))
-
-        # Check Japanese prompt injection patterns
-        for pattern in self.INJECTION_PATTERNS_JA:
-            if re.search(pattern, text):
-                print(f"[SECURITY] Prompt injection detected (JA): {pattern}")
-                raise ValueError(t('messages.prompt_injection_detected'))
-
-        # Check command injection patterns
-        for pattern in self.COMMAND_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                print(f"[SECURITY] Command injection detected: {pattern}")
-                raise ValueError(t('messages.command_injection_detected'))
-
-        # Check SQL injection patterns
-        for pattern in self.SQL_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                print(f"[SECURITY] SQL injection detected: {pattern}")
-                raise ValueError(t('messages.sql_injection_detected'))
+        print(f"[SECURITY] {match.category} detected ({match.source}): {match.pattern}")
+        raise ValueError(t(_CATEGORY_MESSAGES[match.category]))
 
     def is_suspicious(self, text: str) -> bool:
         """
@@ -0,0 +1,240 @@
+"""File storage for uploads and estimate results
+
+Layout under ``settings.UPLOAD_DIR``::
+
+    blobs/ab/<sha256><ext>    uploaded input files, content-addressed
+    tasks/<task_id>/*.xlsx    result workbooks, one directory per task
+    tmp/                      in-flight writes
+
+Every file is first written under a unique temporary name and moved into
+place with ``os.replace`` once complete, so concurrent requests never
+overwrite each other and readers never see a partial file. Identical
+uploads hash to the same blob and are stored once. A blob is removed only
+after the deleting transaction has committed, when no task references it
+any more and it has not been reused (deduplicated onto, which refreshes its
+mtime) within ``UPLOAD_BLOB_GRACE_SECONDS``. The grace period covers a
+concurrent upload that has deduplicated onto the blob but not yet committed
+its task; blobs skipped for that reason are collected by sweep_blobs().
+"""
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.models.task import Task
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the size limit"""
+    pass
+
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """Yield a temporary path next to ``path`` and move it into place on success
+
+    The temporary name keeps the original extension so writers that check
+    it (e.g. openpyxl) still work. On error the temporary file is removed.
+    """
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{uuid.uuid4().hex}-{name}")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class FileStorage:
+    """Content-addressed upload store and per-task result directories
+
+    Attributes:
+        root: Base directory (default: settings.UPLOAD_DIR)
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self._root = root
+
+    @property
+    def root(self) -> str:
+        # Resolved lazily so tests and deployments can change UPLOAD_DIR
+        return self._root or settings.UPLOAD_DIR
+
+    async def save_upload(self, file: UploadFile, max_bytes: int) -> str:
+        """Stream an upload into the blob store
+
+        Args:
+            file: Uploaded file
+            max_bytes: Size limit in bytes
+
+        Returns:
+            Blob path (shared by every upload with the same content)
+
+        Raises:
+            UploadTooLargeError: If the upload exceeds max_bytes
+        """
+        suffix = os.path.splitext(file.filename or "")[1].lower()
+        tmp_path = self.temp_path(suffix)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as buffer:
+                while chunk := await file.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                    digest.update(chunk)
+                    buffer.write(chunk)
+            return self._commit_blob(tmp_path, digest.hexdigest(), suffix)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def store_file(self, tmp_path: str) -> str:
+        """Move a file written to temp_path() into the blob store
+
+        Returns:
+            Blob path
+        """
+        digest = hashlib.sha256()
+        with open(tmp_path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        return self._commit_blob(tmp_path, digest.hexdigest(), os.path.splitext(tmp_path)[1])
+
+    def temp_path(self, suffix: str = "") -> str:
+        """Unique path in the temporary directory"""
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        return os.path.join(tmp_dir, f"{uuid.uuid4().hex}{suffix}")
+
+    def task_dir(self, task_id: str) -> str:
+        """Per-task directory for result files (created on demand)"""
+        path = os.path.join(self.root, "tasks", task_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def discard(self, path: Optional[str]) -> bool:
+        """Remove a file if it exists
+
+        Returns:
+            True if a file was removed
+        """
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            os.remove(path)
+            return True
+        except OSError as e:
+            logger.warning("Failed to delete file", file_path=path, error=str(e))
+            return False
+
+    def remove_task_files(
+        self, db: Session, task_id: str, upload_path: Optional[str] = None,
+        result_file_path: Optional[str] = None
+    ) -> int:
+        """Remove a task's result directory and, if unreferenced, its upload blob
+
+        Call after the task deletion has been committed, so a failed commit
+        never loses files of a task that still exists and the reference check
+        only sees committed tasks.
+
+        Args:
+            db: DB session
+            task_id: Deleted task ID
+            upload_path: The task's excel_file_path
+            result_file_path: The task's result_file_path (results written before per-task directories)
+
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+
+        task_dir = os.path.join(self.root, "tasks", task_id)
+        if os.path.isdir(task_dir):
+            removed += len(os.listdir(task_dir))
+            shutil.rmtree(task_dir, ignore_errors=True)
+        elif self.discard(result_file_path):
+            removed += 1
+
+        if self.release_blob(db, upload_path):
+            removed += 1
+
+        logger.info("Deleted task files", task_id=task_id, deleted_files=removed)
+        return removed
+
+    def release_blob(self, db: Session, path: Optional[str], grace_seconds: Optional[float] = None) -> bool:
+        """Remove an upload blob if no task references it and it was not reused recently
+
+        Returns:
+            True if the blob was removed
+        """
+        if not path or not os.path.exists(path):
+            return False
+        if db.query(Task.id).filter(Task.excel_file_path == path).first():
+            return False
+        grace = settings.UPLOAD_BLOB_GRACE_SECONDS if grace_seconds is None else grace_seconds
+        try:
+            if time.time() - os.path.getmtime(path) < grace:
+                # Possibly just deduplicated onto by a task not yet committed; left to sweep_blobs()
+                logger.info("Blob reused recently, deferring deletion", file_path=path)
+                return False
+        except OSError:
+            return False
+        return self.discard(path)
+
+    def sweep_blobs(self, db: Session, grace_seconds: Optional[float] = None) -> int:
+        """Remove every upload blob no task references (past the grace period)
+
+        Returns:
+            Number of blobs removed
+        """
+        blob_root = os.path.join(self.root, "blobs")
+        if not os.path.isdir(blob_root):
+            return 0
+        referenced = {path for (path,) in db.query(Task.excel_file_path).filter(Task.excel_file_path.isnot(None))}
+        removed = 0
+        for directory, _, names in os.walk(blob_root):
+            for name in names:
+                path = os.path.join(directory, name)
+                if path not in referenced and self.release_blob(db, path, grace_seconds):
+                    removed += 1
+        if removed:
+            logger.info("Swept unreferenced upload blobs", deleted_files=removed)
+        return removed
+
+    def _commit_blob(self, tmp_path: str, sha256: str, suffix: str) -> str:
+        """Atomically move a fully written temp file to its content address"""
+        blob_dir = os.path.join(self.root, "blobs", sha256[:2])
+        os.makedirs(blob_dir, exist_ok=True)
+        blob_path = os.path.join(blob_dir, f"{sha256}{suffix}")
+
+        if os.path.exists(blob_path):
+            os.remove(tmp_path)
+            try:
+                # Mark the blob as in use so a concurrent delete of its last task keeps it
+                os.utime(blob_path)
+            except OSError:
+                pass
+            logger.info("Upload deduplicated", sha256=sha256)
+        else:
+            # Two identical concurrent uploads both replace with the same bytes
+            os.replace(tmp_path, blob_path)
+        return blob_path
+
+
+# Global file storage instance
+file_storage = FileStorage()
@@ -0,0 +1,53 @@
+"""タスクイベントサービス（見積り進捗の記録と読み出し）
+
+イベントは task_events テーブルに保存するため、見積りを実行するワーカーと
+SSE を配信するプロセスが別でも届く。
+"""
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.core.logging_config import get_logger
+from app.models.task_event import TaskEvent
+
+logger = get_logger(__name__)
+
+# ストリームを終了させるイベント
+TERMINAL_EVENTS = ("completed", "failed")
+
+
+class TaskEventService:
+    """タスクイベントサービス"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def publish(self, task_id: str, event_type: str, data: Dict[str, Any], commit: bool = True) -> None:
+        """イベントを記録
+
+        進捗通知の失敗で見積り処理自体を止めないよう、例外はログのみ。
+        commit=False の場合は呼び出し側のコミット（タスク状態の更新など）と同じトランザクションで保存される。
+        """
+        try:
+            self.db.add(TaskEvent(
+                task_id=task_id,
+                event_type=event_type,
+                data=json.dumps(data, ensure_ascii=False, default=str),
+            ))
+            if commit:
+                self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning("Failed to publish task event", task_id=task_id, event_type=event_type, error=str(e))
+
+    def get_events(self, task_id: str, after_id: int = 0, limit: int = 100) -> List[TaskEvent]:
+        """after_id より後のイベントを古い順に取得"""
+        return (
+            self.db.query(TaskEvent)
+            .filter(TaskEvent.task_id == task_id, TaskEvent.id > after_id)
+            .order_by(TaskEvent.id)
+            .limit(limit)
+            .all()
+        )
+
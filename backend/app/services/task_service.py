@@ -1,4 +1,5 @@
 """タスク管理サービス"""
+from sqlalchemy import exists, insert, literal, select
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any
 import uuid
@@ -8,10 +9,14 @@ from app.models.task import Task, TaskStatus
 from app.models.deliverable import Deliverable
 from app.models.estimate import Estimate
 from app.models.qa_pair import QAPair
+from app.models.task_question import TaskQuestion
 from app.services.input_service import InputService
 from app.services.question_service import QuestionService
 from app.services.estimator_service import EstimatorService
 from app.services.export_service import ExportService
+from app.services.llm_client import llm_clients
+from app.services.storage_service import file_storage
+from app.services.task_event_service import TaskEventService
 from app.core.config import settings
 from app.core.logging_config import get_logger
 
@@ -25,9 +30,20 @@ class TaskService:
         self.db = db
 
     def create_task(
-        self, excel_file_path: str, system_requirements: Optional[str]
+        self,
+        excel_file_path: str,
+        system_requirements: Optional[str],
+        deliverables: Optional[List[Dict[str, str]]] = None,
     ) -> Task:
-        """タスクを作成"""
+        """タスクを作成
+
+        成果物はここで一度だけ解析して deliverables テーブルに保存し、
+        以降の質問生成・見積り・Excel出力はすべて保存済みのデータを使う。
+        deliverables を渡した場合（Webフォーム等）はファイルを解析しない。
+        """
+        if deliverables is None:
+            deliverables = InputService.load_deliverables(excel_file_path)
+
         task = Task(
             id=str(uuid.uuid4()),
             excel_file_path=excel_file_path,
@@ -35,7 +51,8 @@ class TaskService:
             status=TaskStatus.PENDING.value,
         )
         self.db.add(task)
-        self.db.commit()
+        self.db.flush()  # 成果物の外部キーより先にタスクを挿入する
+        self.save_deliverables(task.id, deliverables)
         self.db.refresh(task)
         return task
 
@@ -58,16 +75,75 @@ class TaskService:
         self, task_id: str, deliverables: List[Dict[str, str]]
     ) -> None:
         """成果物を保存"""
-        for deliverable_data in deliverables:
+        for i, deliverable_data in enumerate(deliverables):
             deliverable = Deliverable(
                 id=str(uuid.uuid4()),
                 task_id=task_id,
                 name=deliverable_data["name"],
                 description=deliverable_data.get("description"),
+                order=i,
             )
             self.db.add(deliverable)
         self.db.commit()
 
+    def get_deliverables(self, task_id: str) -> List[Dict[str, str]]:
+        """タスクの成果物一覧を入力順で取得
+
+        成果物を保存していない古いタスクは、初回のみファイルを解析して保存する。
+        """
+        rows = (
+            self.db.query(Deliverable)
+            .filter(Deliverable.task_id == task_id)
+            .order_by(Deliverable.order)
+            .all()
+        )
+        if not rows:
+            task = self.get_task(task_id)
+            if not task or not task.excel_file_path:
+                return []
+            deliverables = InputService.load_deliverables(task.excel_file_path)
+            self.save_deliverables(task_id, deliverables)
+            return deliverables
+
+        return [{"name": d.name, "description": d.description or ""} for d in rows]
+
+    def save_questions(self, task_id: str, questions: List[str]) -> bool:
+        """生成済みの質問を保存（既存の質問は置き換える）
+
+        バックグラウンド生成中にタスクが削除されることがあるため、各行は
+        タスクが存在する場合のみ挿入する（INSERT ... SELECT ... WHERE EXISTS）。
+        SQLiteでは外部キー制約が有効とは限らないため、制約には頼らない。
+
+        Returns:
+            保存した場合 True、タスクが存在しない場合 False
+        """
+        self.db.query(TaskQuestion).filter(TaskQuestion.task_id == task_id).delete()
+        task_exists = exists().where(Task.id == task_id)
+        for i, question in enumerate(questions):
+            inserted = self.db.execute(
+                insert(TaskQuestion).from_select(
+                    ["id", "task_id", "question", "order"],
+                    select(
+                        literal(str(uuid.uuid4())), literal(task_id), literal(question), literal(i)
+                    ).where(task_exists),
+                )
+            ).rowcount
+            if not inserted:
+                self.db.rollback()
+                return False
+        self.db.commit()
+        return True
+
+    def get_questions(self, task_id: str) -> List[str]:
+        """保存済みの質問を順に取得（未生成なら空リスト）"""
+        rows = (
+            self.db.query(TaskQuestion)
+            .filter(TaskQuestion.task_id == task_id)
+            .order_by(TaskQuestion.order)
+            .all()
+        )
+        return [row.question for row in rows]
+
     def save_qa_pairs(
         self, task_id: str, questions: List[str], answers: List[str]
     ) -> None:
@@ -147,17 +223,9 @@ class TaskService:
             self.update_task_status(task_id, TaskStatus.PROCESSING)
             logger.info("Task status updated", request_id=request_id, task_id=task_id, status="processing")
 
-            # ファイルから成果物を読み込み（Excel/CSV自動判定）
-            input_service = InputService()
-            if task.excel_file_path.endswith('.csv'):
-                deliverables = input_service.load_csv_data(task.excel_file_path)
-                logger.info("Loaded deliverables from CSV", request_id=request_id, task_id=task_id, count=len(deliverables))
-            else:
-                deliverables = input_service.load_excel_data(task.excel_file_path)
-                logger.info("Loaded deliverables from Excel", request_id=request_id, task_id=task_id, count=len(deliverables))
-
-            # 成果物を保存
-            self.save_deliverables(task_id, deliverables)
+            # タスク作成時に保存した成果物を使う（ファイルは再解析しない）
+            deliverables = self.get_deliverables(task_id)
+            logger.info("Loaded deliverables", request_id=request_id, task_id=task_id, count=len(deliverables))
 
             # Q&Aペアを取得
             qa_pairs_db = self.get_task_qa_pairs(task_id)
@@ -165,12 +233,29 @@ class TaskService:
                 {"question": qa.question, "answer": qa.answer} for qa in qa_pairs_db
             ]
 
-            # 見積り実行
+            # 見積り実行（成果物ごとの確定を進捗イベントとして配信）
             estimator = EstimatorService()
+            events = TaskEventService(self.db)
+            events.publish(task_id, "status", {"status": TaskStatus.PROCESSING.value, "total": len(deliverables)})
+            done: List[Dict[str, Any]] = []
+
+            def on_estimate(index: int, estimate: Dict[str, Any]) -> None:
+                done.append(estimate)
+                events.publish(task_id, "estimate", {
+                    "index": index,
+                    "estimate": estimate,
+                    "completed": len(done),
+                    "total": len(deliverables),
+                    "totals": estimator.calculate_totals(done),
+                })
+
             logger.info("Starting estimation", request_id=request_id, task_id=task_id)
-            estimates = estimator.generate_estimates(
-                deliverables, task.system_requirements or "", qa_pairs, request_id
-            )
+            # ワーカースレッド上で実行されるため、スレッド専用のイベントループで回す
+            # （ループを使い回すことで共有クライアントの接続プールも再利用される）
+            estimates = llm_clients.run_sync(estimator.generate_estimates_async(
+                deliverables, task.system_requirements or "", qa_pairs, request_id,
+                on_estimate=on_estimate
+            ))
             logger.info("Estimation completed", request_id=request_id, task_id=task_id, estimate_count=len(estimates))
 
             # 見積りを保存
@@ -183,18 +268,27 @@ class TaskService:
             # Excel出力
             export_service = ExportService()
             result_file_path = export_service.write_excel_output(
-                task.excel_file_path, estimates, totals, qa_pairs, settings.UPLOAD_DIR
+                deliverables, estimates, totals, qa_pairs, file_storage.task_dir(task_id)
             )
             logger.info("Excel file written", request_id=request_id, task_id=task_id, file_path=result_file_path)
 
-            # タスク更新
+            # タスク更新（再処理時は前回の結果ファイルを削除）
+            if task.result_file_path != result_file_path:
+                file_storage.discard(task.result_file_path)
             task.result_file_path = result_file_path
             task.status = TaskStatus.COMPLETED
             task.updated_at = datetime.utcnow()
+            # 完了イベントはステータス更新と同じトランザクションで保存する
+            events.publish(task_id, "completed", {
+                "totals": totals,
+                "download_url": f"{settings.API_V1_STR}/tasks/{task_id}/download",
+            }, commit=False)
             self.db.commit()
             logger.info("Task processing completed", request_id=request_id, task_id=task_id, status="completed")
 
         except Exception as e:
             logger.error("Task processing failed", request_id=request_id, task_id=task_id, error=str(e))
+            self.db.rollback()
+            TaskEventService(self.db).publish(task_id, "failed", {"error_message": str(e)}, commit=False)
             self.update_task_status(task_id, TaskStatus.FAILED, str(e))
             raise
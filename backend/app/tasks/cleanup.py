@@ -6,7 +6,6 @@ to comply with data retention policies.
 Usage:
     python -m app.tasks.cleanup
 """
-import os
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -19,9 +18,14 @@ from app.db.database import SessionLocal
 from app.models.task import Task
 from app.models.deliverable import Deliverable
 from app.models.qa_pair import QAPair
+from app.models.task_question import TaskQuestion
 from app.models.estimate import Estimate
 from app.models.message import Message
+from app.models.job import Job
+from app.models.task_event import TaskEvent
 from app.core.config import settings
+from app.services.storage_service import file_storage
+from app.services.proposal_store import proposal_store
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -59,6 +63,7 @@ def cleanup_old_tasks():
 
         deleted_count = 0
         file_deleted_count = 0
+        deleted_tasks = []
 
         for task in old_tasks:
             task_id = task.id
@@ -71,41 +76,26 @@ def cleanup_old_tasks():
             # Delete related data (cascade deletion)
             db.query(Deliverable).filter(Deliverable.task_id == task_id).delete()
             db.query(QAPair).filter(QAPair.task_id == task_id).delete()
+            db.query(TaskQuestion).filter(TaskQuestion.task_id == task_id).delete()
             db.query(Estimate).filter(Estimate.task_id == task_id).delete()
             db.query(Message).filter(Message.task_id == task_id).delete()
-
-            # Delete files (if exist)
-            if task.excel_file_path and os.path.exists(task.excel_file_path):
-                try:
-                    os.remove(task.excel_file_path)
-                    file_deleted_count += 1
-                    logger.info(f"Deleted file: {task.excel_file_path}", task_id=task_id)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to delete file: {task.excel_file_path}",
-                        task_id=task_id,
-                        error=str(e)
-                    )
-
-            if task.result_file_path and os.path.exists(task.result_file_path):
-                try:
-                    os.remove(task.result_file_path)
-                    file_deleted_count += 1
-                    logger.info(f"Deleted file: {task.result_file_path}", task_id=task_id)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to delete file: {task.result_file_path}",
-                        task_id=task_id,
-                        error=str(e)
-                    )
+            db.query(Job).filter(Job.task_id == task_id).delete()
+            db.query(TaskEvent).filter(TaskEvent.task_id == task_id).delete()
 
             # Delete task
+            deleted_tasks.append((task_id, task.excel_file_path, task.result_file_path))
             db.delete(task)
             deleted_count += 1
 
         # Commit all deletions
         db.commit()
 
+        # Delete files after commit (result directories, and upload blobs no task references any more)
+        for task_id, upload_path, result_file_path in deleted_tasks:
+            file_deleted_count += file_storage.remove_task_files(db, task_id, upload_path, result_file_path)
+            proposal_store.delete_task(task_id)
+        file_deleted_count += file_storage.sweep_blobs(db)
+
         logger.info(
             f"Auto cleanup completed",
             deleted_tasks=deleted_count,
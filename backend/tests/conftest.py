@@ -32,6 +32,51 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def disable_llm_cache(monkeypatch):
+    """Keep LLM responses from being cached across tests"""
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+
+
+@pytest.fixture(autouse=True)
+def disable_safety_cache(monkeypatch):
+    """Keep safety verdicts from being reused across tests (many tests mock the checks)"""
+    monkeypatch.setattr(settings, "SAFETY_CACHE_ENABLED", False)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cost_ledger(tmp_path, monkeypatch):
+    """Give each test its own shared cost ledger file"""
+    from app.core.cost_ledger import CostLedger
+    from app.core.metrics import metrics_collector
+
+    ledger = CostLedger(str(tmp_path / "cost_ledger.db"))
+    monkeypatch.setattr(metrics_collector, "cost_ledger", ledger)
+    yield ledger
+    ledger.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_proposal_store(tmp_path, monkeypatch):
+    """Give each test its own shared proposal store file"""
+    from app.services.proposal_store import proposal_store
+
+    proposal_store.close()
+    monkeypatch.setattr(proposal_store, "db_path", str(tmp_path / "proposals.db"))
+    yield proposal_store
+    proposal_store.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limiter(monkeypatch):
+    """Give each test an empty in-memory rate limit table"""
+    from app.core.rate_limiter import MemoryRateLimitBackend, get_rate_limiter
+
+    limiter = get_rate_limiter(settings.RATE_LIMIT_MAX_REQUESTS, settings.RATE_LIMIT_WINDOW_SECONDS)
+    monkeypatch.setattr(limiter, "backend", MemoryRateLimitBackend())
+    yield limiter
+
+
 @pytest.fixture(scope="function")
 def db():
     """Test database session"""
@@ -135,6 +180,19 @@ def mock_openai(monkeypatch, mock_openai_response):
             self.chat = MockChat(mock_openai_response)
             self.timeout = timeout
 
+    class MockAsyncCompletions(MockCompletions):
+        async def create(self, **kwargs):
+            return MockCompletions.create(self, **kwargs)
+
+    class MockAsyncChat:
+        def __init__(self, response_data):
+            self.completions = MockAsyncCompletions(response_data)
+
+    class MockAsyncOpenAI:
+        def __init__(self, api_key=None, timeout=None, **kwargs):
+            self.chat = MockAsyncChat(mock_openai_response)
+            self.timeout = timeout
+
     # Mock openai.OpenAI
     import sys
     if 'openai' not in sys.modules:
@@ -144,8 +202,13 @@ def mock_openai(monkeypatch, mock_openai_response):
         return MockOpenAI(api_key=api_key, timeout=timeout, **kwargs)
 
     monkeypatch.setattr("openai.OpenAI", mock_openai_constructor)
+    monkeypatch.setattr("openai.AsyncOpenAI", MockAsyncOpenAI)
 
-    return MockOpenAI
+    # Shared clients are cached by the registry; drop them so the mocks are used
+    from app.services.llm_client import llm_clients
+    llm_clients.clear()
+    yield MockOpenAI
+    llm_clients.clear()
 
 
 @pytest.fixture
@@ -83,6 +83,33 @@ class TestAPIEndpoints:
         questions = response.json()
         assert isinstance(questions, list)
 
+    @pytest.mark.parametrize("use_file", [True, False])
+    def test_failed_task_creation_releases_blob(self, client, sample_excel_file, tmp_path, monkeypatch, use_file):
+        """Test the stored upload blob is released when task creation fails"""
+        import os
+        from app.core.config import settings
+        from app.services.task_service import TaskService
+
+        monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+        monkeypatch.setattr(settings, "UPLOAD_BLOB_GRACE_SECONDS", 0)
+
+        def failing_create_task(self, *args, **kwargs):
+            raise ValueError("parse error")
+
+        monkeypatch.setattr(TaskService, "create_task", failing_create_task)
+
+        if use_file:
+            with open(sample_excel_file, "rb") as f:
+                files = {"file": ("test.xlsx", f, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+                response = client.post("/api/v1/tasks", files=files, data={"system_requirements": "Test system"})
+        else:
+            deliverables = [{"name": "Test", "description": "Test doc"}]
+            response = client.post("/api/v1/tasks", data={"deliverables_json": json.dumps(deliverables)})
+
+        assert response.status_code == 500
+        blobs = [name for _, _, names in os.walk(tmp_path / "blobs") for name in names]
+        assert blobs == []
+
     def test_get_task_status(self, client, mock_openai):
         """Test getting task status"""
         import json
@@ -103,6 +130,61 @@ class TestAPIEndpoints:
         assert "status" in data
         assert data["status"] in ["pending", "processing", "completed", "failed"]
 
+    def test_task_events_stream(self, client, db, mock_openai):
+        """Test SSE endpoint replays progress events and ends on completion"""
+        import uuid
+        from app.models.task import Task, TaskStatus
+        from app.services.task_event_service import TaskEventService
+
+        task_id = str(uuid.uuid4())
+        db.add(Task(id=task_id, status=TaskStatus.PROCESSING.value))
+        db.commit()
+
+        events = TaskEventService(db)
+        events.publish(task_id, "estimate", {"index": 0, "completed": 1, "total": 1})
+        events.publish(task_id, "completed", {"download_url": f"/api/v1/tasks/{task_id}/download"})
+
+        response = client.get(f"/api/v1/tasks/{task_id}/events")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [f for f in response.text.split("\n\n") if f.strip()]
+        assert [f.split("\n")[1] for f in frames] == ["event: estimate", "event: completed"]
+
+        # Last-Event-ID resumes after the given event
+        first_id = frames[0].split("\n")[0].split(": ")[1]
+        response = client.get(f"/api/v1/tasks/{task_id}/events", headers={"Last-Event-ID": first_id})
+        assert "event: estimate" not in response.text
+        assert "event: completed" in response.text
+
+    def test_task_events_poll_off_event_loop(self, client, db, monkeypatch):
+        """Test the SSE poll queries the database outside the event loop thread"""
+        import asyncio
+        import uuid
+        from app.models.task import Task, TaskStatus
+        from app.services.task_event_service import TaskEventService
+
+        task_id = str(uuid.uuid4())
+        db.add(Task(id=task_id, status=TaskStatus.PROCESSING.value))
+        db.commit()
+        TaskEventService(db).publish(task_id, "completed", {})
+
+        on_loop = []
+        get_events = TaskEventService.get_events
+
+        def recording_get_events(self, *args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return get_events(self, *args, **kwargs)
+
+        monkeypatch.setattr(TaskEventService, "get_events", recording_get_events)
+
+        response = client.get(f"/api/v1/tasks/{task_id}/events")
+        assert "event: completed" in response.text
+        assert on_loop == [False]
+
     def test_get_questions(self, client, mock_openai):
         """Test getting questions for a task"""
         import json
@@ -151,6 +233,29 @@ class TestAPIEndpoints:
         data = response.json()
         assert "message" in data
 
+    def test_submit_answers_twice_reuses_active_job(self, client, db, monkeypatch):
+        """Test a repeated answer submission does not queue a second job for the task"""
+        import uuid
+        from app.models.job import Job
+        from app.models.task import Task, TaskStatus
+        from app.services.job_queue import job_queue
+
+        task_id = str(uuid.uuid4())
+        db.add(Task(id=task_id, status=TaskStatus.PENDING.value))
+        db.commit()
+        running = job_queue.enqueue(db, task_id)
+        job_queue._claim(db, running.id)  # first submission is being processed
+
+        for is_running in (True, False):
+            monkeypatch.setattr(type(job_queue), "is_running", property(lambda self: is_running))
+            response = client.post(
+                f"/api/v1/tasks/{task_id}/answers", json=[{"question": "Users?", "answer": "100"}]
+            )
+
+            assert response.status_code == 202
+            assert response.json()["job_id"] == running.id
+        assert db.query(Job).filter(Job.task_id == task_id).count() == 1
+
     def test_get_estimate_result(self, client, mock_openai):
         """Test getting estimate results"""
         import json
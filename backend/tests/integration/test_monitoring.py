@@ -24,7 +24,9 @@ class TestMonitoringEndpoints:
         """Test basic health check endpoint"""
         response = client.get("/health")
         assert response.status_code == 200
-        assert response.json() == {"status": "healthy"}
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert set(data["guards"]) == {"ready", "state", "init_seconds", "error"}
 
     def test_detailed_health_check(self, client):
         """Test detailed health check with metrics"""
@@ -58,6 +60,23 @@ class TestMonitoringEndpoints:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
 
+    def test_openmetrics_endpoint(self, client):
+        """Test OpenMetrics exposition endpoint"""
+        client.get("/api/v1/tasks/not-a-task")
+
+        response = client.get("/api/v1/metrics/openmetrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/openmetrics-text")
+
+        text = response.text
+        assert text.endswith("# EOF\n")
+        # Route template, not the raw path, is used as the label
+        assert 'route="/api/v1/tasks/{task_id}"' in text
+        assert "not-a-task" not in text
+        assert "ai_estimator_http_request_duration_seconds_bucket" in text
+        assert "ai_estimator_circuit_breaker_state" in text
+        assert "ai_estimator_resource_limiter_queue_depth" in text
+
     def test_metrics_reset_endpoint(self, client):
         """Test metrics reset endpoint"""
         # Make some requests first
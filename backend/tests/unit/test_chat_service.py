@@ -1,5 +1,7 @@
 """Unit tests for ChatService"""
+import json
 import pytest
+import time
 import uuid
 from app.services.chat_service import ChatService
 from app.models.estimate import Estimate
@@ -144,3 +146,314 @@ class TestChatService:
         assert messages[0].content == "Please reduce budget"
         assert messages[1].role == "assistant"
         assert messages[1].content == "Budget reduced by 20%"
+
+
+class TestConcurrentAdjustment:
+    """Test the concurrent intent analysis / adjustment pipeline"""
+
+    DELAY = 0.2
+
+    @pytest.fixture
+    def task_id(self, db):
+        task_id = str(uuid.uuid4())
+        db.add(Task(id=task_id, status=TaskStatus.COMPLETED.value))
+        db.commit()
+        db.add_all([
+            Estimate(id=str(uuid.uuid4()), task_id=task_id, deliverable_name="Admin Dashboard",
+                     person_days=10.0, amount=400000.0),
+            Estimate(id=str(uuid.uuid4()), task_id=task_id, deliverable_name="Payment Integration",
+                     person_days=5.0, amount=200000.0),
+        ])
+        db.commit()
+        return task_id
+
+    @pytest.fixture
+    def llm_calls(self, monkeypatch):
+        """Slow fake intent and adjustment LLM calls; records adjustment prompts"""
+        from app.services import chat_service
+        monkeypatch.setattr(chat_service, "_OPENAI_AVAILABLE", True)
+        monkeypatch.setattr(chat_service.settings, "OPENAI_API_KEY", "sk-test")
+        prompts = []
+        delay = self.DELAY
+
+        def fake_intent(self, message, estimates):
+            time.sleep(delay)
+            return {"target_items": ["Admin Dashboard"], "adjustment_type": "reduce", "reduction_ratio": 0.7}
+
+        def fake_adjustment(self, prompt, request_id=None):
+            time.sleep(delay)
+            prompts.append(prompt["content"])
+            return json.dumps({
+                "reply_md": "adjusted",
+                "estimates": [
+                    {"deliverable_name": "Admin Dashboard", "person_days": 6.0, "amount": 240000.0},
+                    {"deliverable_name": "Payment Integration", "person_days": 5.0, "amount": 200000.0},
+                ],
+            })
+
+        monkeypatch.setattr(ChatService, "_analyze_intent_with_ai", fake_intent)
+        monkeypatch.setattr(ChatService, "_call_adjustment_llm_with_retry", fake_adjustment)
+        return prompts
+
+    def _run(self, db, task_id, message, concurrent, monkeypatch):
+        from app.services import chat_service
+        monkeypatch.setattr(chat_service.settings, "CHAT_CONCURRENT_ADJUSTMENT", concurrent)
+        start = time.perf_counter()
+        result = ChatService(db).process(task_id, message, None, None)
+        return result, time.perf_counter() - start
+
+    def test_calls_overlap(self, db, task_id, llm_calls, monkeypatch):
+        """Test both LLM calls run at the same time"""
+        _, sequential = self._run(db, task_id, "Make the admin dashboard simpler", False, monkeypatch)
+        _, concurrent = self._run(db, task_id, "Make the admin dashboard simpler", True, monkeypatch)
+
+        assert sequential >= 2 * self.DELAY
+        assert concurrent < 1.75 * self.DELAY
+
+    @pytest.mark.parametrize("message", [
+        "Make the admin dashboard simpler",  # keyword and AI intent pick the same item
+        "Make the payment part simpler",  # keyword matching picks another item than AI intent
+    ])
+    def test_same_result_as_sequential(self, db, task_id, llm_calls, monkeypatch, message):
+        """Test the reconciled result matches the sequential pipeline"""
+        sequential, _ = self._run(db, task_id, message, False, monkeypatch)
+        concurrent, _ = self._run(db, task_id, message, True, monkeypatch)
+
+        assert concurrent["estimates"] == sequential["estimates"]
+        assert concurrent["totals"] == sequential["totals"]
+
+    def test_matching_speculation_uses_sequential_prompt(self, db, task_id, llm_calls, monkeypatch):
+        """Test the speculative prompt equals the sequential one when keyword and AI intent agree"""
+        monkeypatch.setattr(ChatService, "_analyze_intent_with_ai", lambda self, message, estimates: None)
+
+        self._run(db, task_id, "Please review the estimate", False, monkeypatch)
+        self._run(db, task_id, "Please review the estimate", True, monkeypatch)
+
+        assert len(llm_calls) == 2
+        assert llm_calls[0] == llm_calls[1]
+
+
+    def test_speculation_miss_reissues_adjustment(self, db, task_id, llm_calls, monkeypatch):
+        """Test a speculation miss re-sends the adjustment built from the AI intent result"""
+        message = "Make the payment part simpler"  # keyword matching picks another item than AI intent
+        self._run(db, task_id, message, False, monkeypatch)
+        sequential_prompt = llm_calls[-1]
+        llm_calls.clear()
+
+        self._run(db, task_id, message, True, monkeypatch)
+
+        assert len(llm_calls) == 2  # speculative call + re-issued call
+        assert sequential_prompt in llm_calls
+        assert llm_calls[0] != llm_calls[1]
+
+    def test_logs_prompt_actually_sent(self, db, task_id, llm_calls, monkeypatch, capsys):
+        """Test the logged prompt is the one sent to the adjustment LLM"""
+        self._run(db, task_id, "Make the payment part simpler", True, monkeypatch)
+
+        logged = capsys.readouterr().out
+        assert any(f"[AI] {prompt[:500]}\n" in logged for prompt in llm_calls)
+
+class TestRuleFastPath:
+    """Test the local-only path for requests the rule engine fully resolves"""
+
+    @pytest.fixture
+    def task_id(self, db):
+        task_id = str(uuid.uuid4())
+        db.add(Task(id=task_id, status=TaskStatus.COMPLETED.value))
+        db.commit()
+        db.add_all([
+            Estimate(id=str(uuid.uuid4()), task_id=task_id, deliverable_name="Unit Testing",
+                     person_days=10.0, amount=400000.0),
+            Estimate(id=str(uuid.uuid4()), task_id=task_id, deliverable_name="Payment Integration",
+                     person_days=5.0, amount=200000.0),
+        ])
+        db.commit()
+        return task_id
+
+    @pytest.fixture
+    def llm_calls(self, monkeypatch):
+        """Fake LLM calls that record whether they were made"""
+        from app.services import chat_service
+        monkeypatch.setattr(chat_service, "_OPENAI_AVAILABLE", True)
+        monkeypatch.setattr(chat_service.settings, "OPENAI_API_KEY", "sk-test")
+        calls = []
+
+        def fake_intent(self, message, estimates):
+            calls.append("intent")
+            return None
+
+        def fake_adjustment(self, prompt, request_id=None):
+            calls.append("adjustment")
+            raise RuntimeError("LLM unavailable")
+
+        monkeypatch.setattr(ChatService, "_analyze_intent_with_ai", fake_intent)
+        monkeypatch.setattr(ChatService, "_call_adjustment_llm_with_retry", fake_adjustment)
+        return calls
+
+    @pytest.mark.parametrize("message", [
+        "Reduce testing by 20%",
+        "テストを20%削減してください",
+        "決済は不要なので除外",
+        "全体を10%下げてください",
+    ])
+    def test_unambiguous_requests_score_high(self, db, message):
+        """Test a single target with an explicit amount reaches full confidence"""
+        service = ChatService(db)
+        confidence, _ = service._score_rule_intent(message, service._parse_rule_intent(message))
+
+        assert confidence >= 0.9
+
+    @pytest.mark.parametrize("message", [
+        "Make testing simpler",  # vague amount
+        "Reduce testing and payment by 20%",  # several targets
+        "Reduce by 20%",  # no target
+        "Increase testing by 20%",  # not a reduction
+        "Can we reduce testing by 20%?",  # question
+        "検索以外を20%削減してください",  # exclusion: everything but search
+        "Reduce everything except search by 20%",  # exclusion
+        "Reduce the rest by 20%",  # relative target ("rest" is also an API keyword)
+        "テストを20%に削減",  # target percentage, not a 20% cut
+        "Cut testing to 20%",  # target percentage
+        "Reduce the restaurant page by 20%",  # keyword only inside another word
+        "Reduce install docs by 20%",  # "all" only inside another word
+    ])
+    def test_ambiguous_requests_score_low(self, db, message):
+        """Test vague, multi-target or out-of-scope requests stay below the threshold"""
+        service = ChatService(db)
+        confidence, _ = service._score_rule_intent(message, service._parse_rule_intent(message))
+
+        assert confidence < 0.9
+
+    def test_fast_path_skips_llm(self, db, task_id, llm_calls):
+        """Test an unambiguous request is applied without any LLM call"""
+        result = ChatService(db).process(task_id, "Reduce testing by 20%", None, None)
+
+        assert llm_calls == []
+        assert result["resolution"] == "rule_fast_path"
+        by_name = {e["deliverable_name"]: e for e in result["estimates"]}
+        assert by_name["Unit Testing"]["person_days"] == 8.0
+        assert by_name["Payment Integration"]["person_days"] == 5.0
+
+    def test_low_confidence_uses_llm(self, db, task_id, llm_calls):
+        """Test an ambiguous request still goes through the LLM"""
+        result = ChatService(db).process(task_id, "Make testing simpler", None, None)
+
+        assert "adjustment" in llm_calls
+        assert result["resolution"] == "llm"
+
+    def test_disabled_fast_path_uses_llm(self, db, task_id, llm_calls, monkeypatch):
+        """Test CHAT_RULE_FAST_PATH_ENABLED=false always uses the LLM"""
+        from app.services import chat_service
+        monkeypatch.setattr(chat_service.settings, "CHAT_RULE_FAST_PATH_ENABLED", False)
+
+        result = ChatService(db).process(task_id, "Reduce testing by 20%", None, None)
+
+        assert "adjustment" in llm_calls
+        assert result["resolution"] == "llm"
+
+
+class TestAdjustmentDelta:
+    """Test the compact delta protocol for AI adjustments"""
+
+    @pytest.fixture
+    def estimates(self):
+        return [
+            {"deliverable_name": "Admin Dashboard", "deliverable_description": "Admin UI", "person_days": 10.0,
+             "amount": 400000.0, "reasoning": "", "reasoning_breakdown": "long breakdown " * 50,
+             "reasoning_notes": "long notes " * 50},
+            {"deliverable_name": "Payment Integration", "deliverable_description": "Stripe", "person_days": 5.0,
+             "amount": 200000.0, "reasoning": "", "reasoning_breakdown": "breakdown", "reasoning_notes": ""},
+        ]
+
+    def test_prompt_sends_only_names_and_numbers(self, db, estimates):
+        """Test the prompt omits reasoning text and asks for changed items only"""
+        prompt = ChatService(db)._build_adjustment_prompt(estimates, "Make the admin dashboard simpler", [])
+
+        content = prompt["content"]
+        assert "long breakdown" not in content
+        assert "long notes" not in content
+        assert '{"id":1,"name":"Admin Dashboard","person_days":10.0,"amount":400000}' in content
+        assert "changes" in content
+
+    def test_merge_applies_only_changed_items(self, db, estimates):
+        """Test changes are merged by id and other items are kept as is"""
+        merged, changed = ChatService(db)._merge_adjustment_delta(estimates, {
+            "changes": [{"id": 1, "deliverable_name": "Admin Dashboard", "person_days": 7.0, "amount": 280000}],
+        })
+
+        assert changed == 1
+        assert len(merged) == 2
+        assert merged[0]["person_days"] == 7.0
+        assert merged[0]["amount"] == 280000.0
+        assert merged[0]["reasoning_breakdown"] == estimates[0]["reasoning_breakdown"]
+        assert merged[0]["deliverable_description"] == "Admin UI"
+        assert merged[1] == estimates[1]
+
+    def test_merge_matches_by_name_and_ignores_unknown_items(self, db, estimates):
+        """Test name fallback, unknown items and amounts derived from person-days"""
+        from app.services import chat_service
+        merged, changed = ChatService(db)._merge_adjustment_delta(estimates, {
+            "changes": [
+                {"deliverable_name": "payment integration", "person_days": "4.0"},
+                {"id": 99, "deliverable_name": "Unknown", "person_days": 1.0},
+            ],
+        })
+
+        assert changed == 1
+        assert merged[1]["person_days"] == 4.0
+        assert merged[1]["amount"] == 4.0 * chat_service.settings.get_daily_unit_cost()
+        assert merged[0] == estimates[0]
+
+    def test_merge_skips_conflicting_id_and_name(self, db, estimates):
+        """Test a change whose id and name point at different items is not applied"""
+        merged, changed = ChatService(db)._merge_adjustment_delta(estimates, {
+            "changes": [
+                {"id": 1, "deliverable_name": "Payment Integration", "person_days": 2.0},
+                {"id": 2, "deliverable_name": "Renamed by the model", "person_days": 4.0},
+            ],
+        })
+
+        assert changed == 1
+        assert merged[0] == estimates[0]
+        assert merged[1]["person_days"] == 4.0
+
+    def test_full_list_response_is_treated_as_delta(self, db, estimates):
+        """Test a response with a partial estimates array is merged instead of rejected"""
+        merged, changed = ChatService(db)._merge_adjustment_delta(estimates, {
+            "estimates": [{"deliverable_name": "Admin Dashboard", "person_days": 8.0, "amount": 320000}],
+        })
+
+        assert changed == 1
+        assert len(merged) == 2
+        assert merged[0]["person_days"] == 8.0
+
+    def test_process_adopts_partial_response(self, db, monkeypatch):
+        """Test a response listing fewer items than the estimate is adopted"""
+        from app.services import chat_service
+        monkeypatch.setattr(chat_service, "_OPENAI_AVAILABLE", True)
+        monkeypatch.setattr(chat_service.settings, "OPENAI_API_KEY", "sk-test")
+        monkeypatch.setattr(ChatService, "_analyze_intent_with_ai", lambda self, message, estimates: None)
+        monkeypatch.setattr(
+            ChatService, "_call_adjustment_llm_with_retry",
+            lambda self, prompt, request_id=None: json.dumps({
+                "reply_md": "adjusted",
+                "changes": [{"id": 2, "deliverable_name": "Payment Integration", "person_days": 3.0, "amount": 120000}],
+            }),
+        )
+        task_id = str(uuid.uuid4())
+        db.add(Task(id=task_id, status=TaskStatus.COMPLETED.value))
+        db.commit()
+        db.add_all([
+            Estimate(id=str(uuid.uuid4()), task_id=task_id, deliverable_name="Admin Dashboard",
+                     person_days=10.0, amount=400000.0),
+            Estimate(id=str(uuid.uuid4()), task_id=task_id, deliverable_name="Payment Integration",
+                     person_days=5.0, amount=200000.0),
+        ])
+        db.commit()
+
+        result = ChatService(db).process(task_id, "Please review the estimate", None, None)
+
+        by_name = {e["deliverable_name"]: e for e in result["estimates"]}
+        assert len(result["estimates"]) == 2
+        assert by_name["Payment Integration"]["person_days"] == 3.0
+        assert by_name["Admin Dashboard"]["person_days"] == 10.0
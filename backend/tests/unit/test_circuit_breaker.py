@@ -220,3 +220,26 @@ class TestCircuitBreaker:
         # Should use settings from config
         assert cb.failure_threshold > 0
         assert cb.timeout > 0
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_call_async(self):
+        """Test async calls share state with sync calls"""
+        cb = CircuitBreaker(name="Test", failure_threshold=2, timeout=60)
+
+        async def successful_func(value):
+            return value
+
+        async def failing_func():
+            raise Exception("Error")
+
+        assert await cb.call_async(successful_func, "ok") == "ok"
+
+        for _ in range(2):
+            with pytest.raises(Exception, match="Error"):
+                await cb.call_async(failing_func)
+
+        assert cb.state == "OPEN"
+
+        # Sync callers are rejected by the same breaker
+        with pytest.raises(Exception):
+            cb.call(lambda: "never called")
@@ -0,0 +1,96 @@
+"""Unit tests for AdaptiveConcurrencyLimiter"""
+import asyncio
+
+import pytest
+
+from app.core.concurrency_limiter import AdaptiveConcurrencyLimiter
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test class for AdaptiveConcurrencyLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_queues_beyond_limit(self):
+        """Test requests beyond the limit wait and are admitted in order on release"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1, max_limit=10)
+        assert await limiter.acquire() == 0.0
+        assert await limiter.acquire() == 0.0
+
+        waiter = asyncio.create_task(limiter.acquire(timeout=5))
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+        assert not waiter.done()
+
+        limiter.release()
+        wait = await waiter
+        assert wait >= 0.0
+        assert limiter.inflight == 2
+        assert limiter.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout(self):
+        """Test a waiter that times out leaves the queue and holds no slot"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1, max_limit=10)
+        await limiter.acquire()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await limiter.acquire(timeout=0.01)
+
+        assert limiter.queue_depth == 0
+        assert limiter.inflight == 1
+        assert limiter.get_status()["rejected"] == 1
+
+    def test_limit_grows_while_latency_is_stable(self):
+        """Test additive increase when latency stays near the baseline and slots are used"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=10)
+        for _ in range(40):
+            limiter.inflight = 4
+            limiter.release(latency=1.0)
+
+        assert limiter.limit > 6
+
+    def test_limit_does_not_grow_when_idle(self):
+        """Test the limit stays put when it is not being used"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=10)
+        for _ in range(40):
+            limiter.inflight = 1
+            limiter.release(latency=1.0)
+
+        assert limiter.limit == 4
+
+    def test_limit_shrinks_on_slow_or_failed_requests(self):
+        """Test multiplicative decrease on latency above tolerance and on drops"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, min_limit=2, max_limit=20, tolerance=2.0)
+        limiter.inflight = 10
+        limiter.release(latency=1.0)  # baseline
+
+        limiter.inflight = 10
+        limiter.release(latency=5.0)
+        assert limiter.limit == pytest.approx(9.0)
+
+        limiter.inflight = 10
+        limiter.release(dropped=True)
+        assert limiter.limit == pytest.approx(8.1)
+
+        for _ in range(50):
+            limiter.release(dropped=True)
+        assert limiter.limit == 2
+
+
+class TestResourceLimiterMiddlewareRouting:
+    """Test route classification in ResourceLimiterMiddleware"""
+
+    def test_only_expensive_routes_are_limited(self):
+        """Test reads bypass the limiter and costly writes go through it"""
+        from app.middleware.resource_limiter import ResourceLimiterMiddleware
+
+        middleware = ResourceLimiterMiddleware(
+            app=None,
+            max_concurrent=5,
+            limited_paths=["/api/v1/tasks"],
+            route_costs={"POST /api/v1/tasks/*/answers": 5, "GET /api/v1/tasks/*/status": 1}
+        )
+
+        assert middleware._route_class("POST", "/api/v1/tasks/abc/answers") == "POST /api/v1/tasks/*/answers"
+        assert middleware._route_class("GET", "/api/v1/tasks/abc/status") is None
+        assert middleware._route_class("GET", "/api/v1/tasks/abc/result") is None
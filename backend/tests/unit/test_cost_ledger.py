@@ -0,0 +1,102 @@
+"""Unit tests for the shared cost ledger"""
+import multiprocessing
+from datetime import datetime
+
+import pytest
+
+from app.core.cost_ledger import CostLedger
+from app.core.metrics import MetricsCollector
+
+
+def _add_costs(db_path: str, count: int):
+    """Worker process: add 0.01 USD `count` times"""
+    ledger = CostLedger(db_path)
+    for _ in range(count):
+        ledger.add(0.01)
+    ledger.close()
+
+
+class TestCostLedger:
+    """Test class for CostLedger"""
+
+    def test_add_returns_totals(self, tmp_path):
+        """Test add returns the running daily and monthly totals"""
+        ledger = CostLedger(str(tmp_path / "ledger.db"))
+
+        assert ledger.add(1.5) == (1.5, 1.5)
+        assert ledger.add(0.5) == (2.0, 2.0)
+        assert ledger.totals() == (2.0, 2.0)
+
+    def test_new_period_starts_at_zero(self, tmp_path):
+        """Test a new day keeps the month total but starts a new daily total"""
+        ledger = CostLedger(str(tmp_path / "ledger.db"))
+        ledger.add(1.0, now=datetime(2026, 10, 16, 23, 59))
+
+        assert ledger.add(2.0, now=datetime(2026, 10, 17, 0, 1)) == (2.0, 3.0)
+        assert ledger.totals(now=datetime(2026, 11, 1)) == (0.0, 0.0)
+
+    def test_instances_share_totals(self, tmp_path):
+        """Test two ledgers on the same file (e.g. two workers) see combined totals"""
+        path = str(tmp_path / "ledger.db")
+        worker_a = CostLedger(path)
+        worker_b = CostLedger(path)
+
+        worker_a.add(1.0)
+        assert worker_b.add(2.0) == (3.0, 3.0)
+        assert worker_a.totals() == (3.0, 3.0)
+
+    def test_concurrent_processes(self, tmp_path):
+        """Test concurrent writers from several processes lose no updates"""
+        path = str(tmp_path / "ledger.db")
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=_add_costs, args=(path, 50)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        daily, monthly = CostLedger(path).totals()
+        assert daily == pytest.approx(2.0)
+        assert monthly == pytest.approx(2.0)
+
+
+class TestMetricsCollectorSharedCost:
+    """Test MetricsCollector cost limits use the shared ledger"""
+
+    def test_cost_from_other_workers_counts(self, isolated_cost_ledger):
+        """Test another worker's spend is included in the totals"""
+        isolated_cost_ledger.add(1.25)
+        collector = MetricsCollector()
+
+        collector.record_openai_call(
+            model="gpt-4o-mini",
+            tokens=1500,
+            duration=1.0,
+            success=True,
+            request_id="req-1",
+            operation="estimate",
+            input_tokens=1000,
+            output_tokens=500
+        )
+
+        own_cost = collector._calculate_cost(1000, 500)
+        assert collector.daily_cost == pytest.approx(1.25 + own_cost)
+        assert collector.get_cost_summary()["monthly_cost_usd"] == round(1.25 + own_cost, 4)
+
+    def test_monthly_limit_applies_across_workers(self, isolated_cost_ledger, monkeypatch):
+        """Test the monthly limit is enforced on the combined spend"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "MONTHLY_COST_LIMIT", 1.0)
+        isolated_cost_ledger.add(1.5)
+
+        with pytest.raises(Exception):
+            MetricsCollector().record_openai_call(
+                model="gpt-4o-mini",
+                tokens=10,
+                duration=1.0,
+                success=True,
+                request_id="req-2",
+                input_tokens=5,
+                output_tokens=5
+            )
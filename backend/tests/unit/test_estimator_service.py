@@ -1,4 +1,5 @@
 """Unit tests for EstimatorService"""
+import asyncio
 import pytest
 from unittest.mock import Mock, patch
 from app.services.estimator_service import EstimatorService
@@ -91,3 +92,243 @@ class TestEstimatorService:
         expected_amount = estimate["person_days"] * service.daily_unit_cost
         # Allow for small floating point differences
         assert abs(estimate["amount"] - expected_amount) < 0.01
+
+    @pytest.mark.asyncio
+    async def test_generate_estimates_async_preserves_order(self, monkeypatch, sample_deliverables, sample_qa_pairs):
+        """Test async fan-out returns estimates in input order"""
+        service = EstimatorService()
+
+        async def mock_estimate(deliverable, system_requirements, qa_pairs, request_id=None):
+            # Finish in reverse order to exercise result ordering
+            await asyncio.sleep(0.01 * (len(sample_deliverables) - sample_deliverables.index(deliverable)))
+            return {"name": deliverable["name"], "person_days": 1.0, "amount": service.daily_unit_cost}
+
+        monkeypatch.setattr(service, "_estimate_single_deliverable_async", mock_estimate)
+
+        result = await service.generate_estimates_async(sample_deliverables, "Test system", sample_qa_pairs)
+
+        assert [e["name"] for e in result] == [d["name"] for d in sample_deliverables]
+
+    @pytest.mark.asyncio
+    async def test_generate_estimates_async_reports_each_estimate(self, monkeypatch, sample_deliverables, sample_qa_pairs):
+        """Test on_estimate is called per deliverable in completion order"""
+        service = EstimatorService()
+
+        async def mock_estimate(deliverable, system_requirements, qa_pairs, request_id=None):
+            await asyncio.sleep(0.01 * (len(sample_deliverables) - sample_deliverables.index(deliverable)))
+            return {"name": deliverable["name"], "person_days": 1.0, "amount": 1.0}
+
+        monkeypatch.setattr(service, "_estimate_single_deliverable_async", mock_estimate)
+        reported = []
+
+        await service.generate_estimates_async(
+            sample_deliverables, "Test system", sample_qa_pairs,
+            on_estimate=lambda idx, est: reported.append((idx, est["name"]))
+        )
+
+        assert [idx for idx, _ in reported] == list(reversed(range(len(sample_deliverables))))
+        assert all(sample_deliverables[idx]["name"] == name for idx, name in reported)
+
+    @pytest.mark.asyncio
+    async def test_generate_estimates_async_limits_concurrency(self, monkeypatch, sample_qa_pairs):
+        """Test semaphore caps concurrent LLM calls at MAX_PARALLEL_ESTIMATES"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "MAX_PARALLEL_ESTIMATES", 2)
+
+        service = EstimatorService()
+        deliverables = [{"name": f"D{i}", "description": ""} for i in range(6)]
+        active = {"now": 0, "peak": 0}
+
+        async def mock_estimate(deliverable, system_requirements, qa_pairs, request_id=None):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return {"name": deliverable["name"], "person_days": 1.0, "amount": 1.0}
+
+        monkeypatch.setattr(service, "_estimate_single_deliverable_async", mock_estimate)
+
+        result = await service.generate_estimates_async(deliverables, "Test system", sample_qa_pairs)
+
+        assert len(result) == 6
+        assert active["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_generate_estimates_async_api_error_fallback(self, monkeypatch, sample_deliverables, sample_qa_pairs):
+        """Test async path falls back to keyword-based estimate when API fails"""
+        from app.services.circuit_breaker import openai_circuit_breaker
+
+        async def mock_create_error(**kwargs):
+            raise Exception("API Error")
+
+        service = EstimatorService()
+        monkeypatch.setattr(service.async_client.chat.completions, "create", mock_create_error)
+
+        async def no_sleep(delay):
+            return None
+
+        # Skip retry backoff delays
+        monkeypatch.setattr("app.services.retry_service.asyncio.sleep", no_sleep)
+
+        try:
+            result = await service.generate_estimates_async(sample_deliverables, "Test system", sample_qa_pairs)
+        finally:
+            openai_circuit_breaker.reset()
+
+        requirements_estimate = next(e for e in result if "要件" in e["name"])
+        assert requirements_estimate["person_days"] == 10.0
+
+    def test_repeat_estimate_served_from_cache(self, monkeypatch, tmp_path, sample_qa_pairs):
+        """Test identical requests hit the response cache instead of the API"""
+        from app.core.config import settings
+        from app.services.llm_cache import LLMResponseCache
+        monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+        monkeypatch.setattr("app.services.estimator_service.llm_response_cache", cache)
+
+        calls = []
+
+        class MockResponse:
+            class usage:
+                total_tokens = 30
+                prompt_tokens = 20
+                completion_tokens = 10
+
+            class _Choice:
+                class message:
+                    content = '{"person_days": 7.5, "reasoning_breakdown": "- Build: 7.5", "reasoning_notes": "note"}'
+
+            choices = [_Choice]
+
+        def mock_create(**kwargs):
+            calls.append(kwargs)
+            return MockResponse
+
+        service = EstimatorService()
+        monkeypatch.setattr(service.client.chat.completions, "create", mock_create)
+        deliverables = [{"name": "API", "description": "REST API"}]
+
+        first = service.generate_estimates(deliverables, "Web system", sample_qa_pairs)
+        second = service.generate_estimates(deliverables, "Web system", sample_qa_pairs)
+
+        assert len(calls) == 1
+        assert first[0]["person_days"] == second[0]["person_days"] == 7.5
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.parametrize("content", [
+        "I cannot estimate this deliverable.",  # no JSON
+        '{"person_days": "about a week"}',  # invalid person_days
+    ])
+    def test_unparseable_response_is_not_cached(self, monkeypatch, tmp_path, sample_qa_pairs, content):
+        """Test fallback estimates are not pinned in the response cache"""
+        from app.core.config import settings
+        from app.services.llm_cache import LLMResponseCache
+        monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+        monkeypatch.setattr("app.services.estimator_service.llm_response_cache", cache)
+
+        calls = []
+        response = Mock()
+        response.usage.total_tokens = 30
+        response.usage.prompt_tokens = 20
+        response.usage.completion_tokens = 10
+        response.choices = [Mock()]
+        response.choices[0].message.content = content
+
+        def mock_create(**kwargs):
+            calls.append(kwargs)
+            return response
+
+        service = EstimatorService()
+        monkeypatch.setattr(service.client.chat.completions, "create", mock_create)
+        deliverables = [{"name": "API", "description": "REST API"}]
+
+        first = service.generate_estimates(deliverables, "Web system", sample_qa_pairs)
+        service.generate_estimates(deliverables, "Web system", sample_qa_pairs)
+
+        assert first[0]["person_days"] == 5.0
+        assert len(calls) == 2
+        assert cache.get_stats()["entries"] == 0
+
+
+class TestBatchedEstimation:
+    """Test class for batched multi-deliverable estimation"""
+
+    def test_plan_batches_respects_max_items(self, monkeypatch, sample_qa_pairs):
+        """Test batches never exceed ESTIMATE_BATCH_MAX_ITEMS"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "ESTIMATE_BATCH_MAX_ITEMS", 4)
+        monkeypatch.setattr(settings, "ESTIMATE_BATCH_TOKEN_BUDGET", 1_000_000)
+
+        service = EstimatorService()
+        deliverables = [{"name": f"D{i}", "description": "doc"} for i in range(10)]
+
+        batches = service._plan_batches(deliverables, "Web system", sample_qa_pairs)
+
+        assert [len(b) for b in batches] == [4, 4, 2]
+        assert [i for b in batches for i in b] == list(range(10))
+
+    def test_plan_batches_adapts_to_token_budget(self, monkeypatch, sample_qa_pairs):
+        """Test a smaller token budget produces smaller batches"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "ESTIMATE_BATCH_MAX_ITEMS", 50)
+
+        service = EstimatorService()
+        deliverables = [{"name": f"D{i}", "description": "x" * 300} for i in range(20)]
+
+        monkeypatch.setattr(settings, "ESTIMATE_BATCH_TOKEN_BUDGET", 100_000)
+        large = service._plan_batches(deliverables, "Web system", sample_qa_pairs)
+        monkeypatch.setattr(settings, "ESTIMATE_BATCH_TOKEN_BUDGET", 5_000)
+        small = service._plan_batches(deliverables, "Web system", sample_qa_pairs)
+
+        assert len(large) == 1
+        assert len(small) > 1
+        assert all(len(b) >= 1 for b in small)
+
+    def test_parse_batch_content_partial(self):
+        """Test invalid, duplicate and truncated items are skipped"""
+        service = EstimatorService()
+        batch = [{"name": f"D{i}", "description": ""} for i in range(4)]
+        content = (
+            '{"estimates": ['
+            '{"id": 0, "person_days": 3.0, "reasoning_breakdown": "- a", "reasoning_notes": "n"},'
+            '{"id": 1, "person_days": "n/a"},'
+            '{"id": 0, "person_days": 9.0},'
+            '{"id": 2, "person_days": 4.5, "reasoning_breakdown": "- b", "reasoning_notes": "n"},'
+            '{"id": 3, "person_days": 2.'
+        )
+
+        parsed = service._parse_batch_content(content, batch)
+
+        assert sorted(parsed) == [0, 2]
+        assert parsed[0]["person_days"] == 3.0
+        assert parsed[2]["name"] == "D2"
+        assert parsed[2]["amount"] == 4.5 * service.daily_unit_cost
+
+    @pytest.mark.asyncio
+    async def test_batch_falls_back_per_item(self, monkeypatch, sample_qa_pairs):
+        """Test items missing from the batch response use the single-deliverable path"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "ESTIMATE_BATCH_ENABLED", True)
+
+        service = EstimatorService()
+        deliverables = [{"name": f"D{i}", "description": ""} for i in range(3)]
+        batch_calls = []
+        single_calls = []
+
+        async def mock_batch_call(messages, max_tokens, request_id=None):
+            batch_calls.append(messages)
+            return '{"estimates": [{"id": 0, "person_days": 2.0}, {"id": 2, "person_days": 6.0}]}'
+
+        async def mock_single(deliverable, system_requirements, qa_pairs, request_id=None):
+            single_calls.append(deliverable["name"])
+            return {"name": deliverable["name"], "person_days": 1.0, "amount": 1.0}
+
+        monkeypatch.setattr(service, "_call_batch_llm_with_retry_async", mock_batch_call)
+        monkeypatch.setattr(service, "_estimate_single_deliverable_async", mock_single)
+
+        result = await service.generate_estimates_async(deliverables, "Web system", sample_qa_pairs)
+
+        assert len(batch_calls) == 1
+        assert single_calls == ["D1"]
+        assert [e["person_days"] for e in result] == [2.0, 1.0, 6.0]
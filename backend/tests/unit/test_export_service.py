@@ -3,6 +3,7 @@ import pytest
 import pandas as pd
 from openpyxl import load_workbook
 from app.services.export_service import ExportService
+from app.services.input_service import InputService
 
 
 class TestExportService:
@@ -32,7 +33,7 @@ class TestExportService:
         service = ExportService()
         output_path = str(tmp_path / "test_export.xlsx")
         result_path = service.write_excel_output(
-            sample_excel_file,
+            InputService.load_excel_data(sample_excel_file),
             estimates,
             totals,
             qa_pairs,
@@ -63,7 +64,7 @@ class TestExportService:
 
         service = ExportService()
         result_path = service.write_excel_output(
-            sample_excel_file,
+            InputService.load_excel_data(sample_excel_file),
             estimates,
             totals,
             qa_pairs,
@@ -88,7 +89,7 @@ class TestExportService:
 
         service = ExportService()
         result_path = service.write_excel_output(
-            sample_excel_file,
+            InputService.load_excel_data(sample_excel_file),
             estimates,
             totals,
             qa_pairs,
@@ -98,3 +99,46 @@ class TestExportService:
         # Verify file exists
         import os
         assert os.path.exists(result_path)
+
+    def test_export_uses_stored_deliverables(self, tmp_path, mock_language_ja):
+        """Test export writes rows from the given deliverables without an input file"""
+        deliverables = [
+            {"name": "要件定義書", "description": "要件定義"},
+            {"name": "基本設計書", "description": "基本設計"},
+        ]
+        estimates = [
+            {"name": "基本設計書", "description": "基本設計", "person_days": 10.0, "amount": 1000000.0, "reasoning": ""}
+        ]
+        totals = {"subtotal": 1000000.0, "tax": 100000.0, "total": 1100000.0}
+
+        result_path = ExportService().write_excel_output(deliverables, estimates, totals, [], str(tmp_path))
+
+        ws = load_workbook(result_path).active
+        assert [ws.cell(row=r, column=1).value for r in (2, 3)] == ["要件定義書", "基本設計書"]
+        assert ws.cell(row=2, column=4).value == 0
+        assert ws.cell(row=3, column=4).value == 1000000
+
+    def test_export_applies_named_styles(self, tmp_path, mock_language_ja):
+        """Test write-only export formats cells through named styles"""
+        deliverables = [{"name": "要件定義書", "description": "要件定義"}]
+        estimates = [{"name": "要件定義書", "person_days": 5.0, "amount": 500000.0, "reasoning_breakdown": "内訳"}]
+        totals = {"subtotal": 500000.0, "tax": 50000.0, "total": 550000.0}
+
+        result_path = ExportService().write_excel_output(deliverables, estimates, totals, [], str(tmp_path))
+
+        wb = load_workbook(result_path)
+        ws = wb.active
+        assert "estimate_amount" in wb.named_styles
+        assert ws["A1"].font.b
+        # ヘッダーは従来（pandas.to_excel + 太字・中央揃え）と同じ見た目
+        assert ws["A1"].alignment.horizontal == "center"
+        assert [ws["F1"].border.left.style, ws["F1"].border.right.style,
+                ws["F1"].border.top.style, ws["F1"].border.bottom.style] == ["thin"] * 4
+        assert ws["A2"].border.top.style is None
+        assert ws["C2"].number_format == "0.0"
+        assert ws["D2"].number_format == "#,##0"
+        assert ws["E2"].alignment.wrap_text
+        # 合計行（データ1行 + 空行1行の後）
+        assert ws["C6"].value == "総額"
+        assert ws["D6"].value == 550000
+        assert ws["D6"].border.top.style == "thin"
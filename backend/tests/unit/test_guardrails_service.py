@@ -1,6 +1,8 @@
 """Unit tests for GuardrailsService"""
+import threading
 import pytest
-from app.services.guardrails_service import GuardrailsService
+from unittest.mock import patch
+from app.services.guardrails_service import GuardrailsService, GuardRegistry
 
 
 class TestGuardrailsService:
@@ -350,3 +352,64 @@ class TestGuardrailsService:
 
         assert "日本語" in validated
         assert "特殊文字" in validated
+
+
+class TestGuardRegistry:
+    """Test cases for the process-wide guard registry"""
+
+    def test_builds_guards_once(self):
+        """Test that guards are built once and shared by every service instance"""
+        registry = GuardRegistry()
+        with patch.object(GuardRegistry, "_build", autospec=True,
+                          side_effect=lambda r: setattr(r, "state", "unavailable")) as build:
+            services = [GuardrailsService(registry) for _ in range(5)]
+            for service in services:
+                service.validate_input("Build an e-commerce website")
+                service.validate_output("Estimated 10 person-days")
+
+        assert build.call_count == 1
+        assert registry.ready is True
+
+    def test_concurrent_warm_up_builds_once(self):
+        """Test that callers arriving during warm-up wait instead of building again"""
+        registry = GuardRegistry()
+        calls = []
+
+        def slow_build(r):
+            calls.append(1)
+            threading.Event().wait(0.05)
+            r.state = "ready"
+
+        with patch.object(GuardRegistry, "_build", autospec=True, side_effect=slow_build):
+            threads = [threading.Thread(target=registry.warm_up) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(calls) == 1
+        assert registry.state == "ready"
+
+    def test_status_before_and_after_warm_up(self):
+        """Test readiness reporting"""
+        registry = GuardRegistry()
+        assert registry.get_status()["ready"] is False
+        assert registry.get_status()["state"] == "cold"
+
+        registry.start_warm_up().join(timeout=30)
+
+        status = registry.get_status()
+        assert status["ready"] is True
+        assert status["state"] in ("ready", "unavailable", "failed")
+        assert status["init_seconds"] is not None
+
+    def test_missing_library_falls_back_without_retrying(self):
+        """Test that a missing Guardrails library is not retried per request"""
+        registry = GuardRegistry()
+        with patch.dict("sys.modules", {"guardrails": None}):
+            assert registry.warm_up() is False
+        assert registry.state == "unavailable"
+
+        service = GuardrailsService(registry)
+        assert service.validate_input("  some input  ") == "some input"
+        assert service.input_guard is None
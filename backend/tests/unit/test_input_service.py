@@ -177,3 +177,28 @@ class TestInputService:
         assert result[0]["name"] == "要件定義書"
         assert result[0]["description"] == ""
         assert result[1]["name"] == "基本設計書"
+
+    def test_load_excel_row_limit(self, tmp_path, monkeypatch):
+        """Test ValueError when the file has more rows than MAX_INPUT_ROWS"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "MAX_INPUT_ROWS", 2)
+        file_path = tmp_path / "too_many.xlsx"
+        df = pd.DataFrame({"成果物名称": ["A", "B", "C"], "説明": ["1", "2", "3"]})
+        df.to_excel(file_path, index=False, engine='openpyxl')
+
+        with pytest.raises(ValueError, match="最大2件"):
+            InputService.load_excel_data(str(file_path))
+
+    def test_iter_csv_deliverables_streams_rows(self, tmp_path):
+        """Test CSV rows are yielded lazily and the limit stops reading early"""
+        file_path = tmp_path / "large.csv"
+        with open(file_path, "w", encoding="utf-8-sig") as f:
+            f.write("成果物名称,説明\n")
+            for i in range(1000):
+                f.write(f"成果物{i},説明{i}\n")
+
+        rows = InputService.iter_csv_deliverables(str(file_path), max_rows=10)
+
+        assert next(rows) == {"name": "成果物0", "description": "説明0"}  # BOM does not leak into data
+        with pytest.raises(ValueError, match="最大10件"):
+            list(rows)
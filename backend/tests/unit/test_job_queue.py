@@ -0,0 +1,132 @@
+"""Unit tests for JobQueue"""
+import pytest
+import uuid
+from datetime import datetime, timedelta
+
+from app.models.job import Job
+from app.models.task import Task, TaskStatus
+from app.services.job_queue import JobQueue
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def task(db):
+    """Pending task"""
+    task = Task(id=str(uuid.uuid4()), status=TaskStatus.PENDING.value)
+    db.add(task)
+    db.commit()
+    return task
+
+
+@pytest.fixture
+def queue():
+    """Job queue bound to the test database"""
+    queue = JobQueue(session_factory=TestingSessionLocal, workers=1, poll_interval=0.05)
+    yield queue
+    queue.stop()
+
+
+class TestJobQueue:
+    """Test class for JobQueue"""
+
+    def test_enqueue_creates_pending_job(self, db, task, queue):
+        """Test enqueue persists a PENDING job"""
+        job = queue.enqueue(db, task.id, "req-1")
+
+        stored = db.query(Job).filter(Job.id == job.id).first()
+        assert stored.status == TaskStatus.PENDING.value
+        assert stored.task_id == task.id
+        assert stored.request_id == "req-1"
+        assert stored.attempts == 0
+
+    def test_enqueue_returns_active_job(self, db, task, queue):
+        """Test a second enqueue for a task with a PENDING/PROCESSING job reuses that job"""
+        first = queue.enqueue(db, task.id, "req-1")
+        assert queue.enqueue(db, task.id, "req-2").id == first.id
+
+        queue._claim(db, first.id)
+        assert queue.enqueue(db, task.id, "req-3").id == first.id
+        assert db.query(Job).filter(Job.task_id == task.id).count() == 1
+
+    def test_enqueue_after_job_finished_creates_new_job(self, db, task, queue, monkeypatch):
+        """Test a finished job does not block re-processing the task"""
+        monkeypatch.setattr(
+            "app.services.job_queue.TaskService.process_task",
+            lambda self, task_id, request_id=None: None
+        )
+        first = queue.enqueue(db, task.id)
+        queue.run_job(first.id, db)
+
+        second = queue.enqueue(db, task.id)
+
+        assert second.id != first.id
+        assert second.status == TaskStatus.PENDING.value
+
+    def test_run_job_completes(self, db, task, queue, monkeypatch):
+        """Test run_job processes the task and marks the job COMPLETED"""
+        processed = []
+        monkeypatch.setattr(
+            "app.services.job_queue.TaskService.process_task",
+            lambda self, task_id, request_id=None: processed.append(task_id)
+        )
+        job = queue.enqueue(db, task.id)
+
+        status = queue.run_job(job.id, db)
+
+        assert status == TaskStatus.COMPLETED.value
+        assert processed == [task.id]
+        db.refresh(job)
+        assert job.status == TaskStatus.COMPLETED.value
+        assert job.attempts == 1
+        assert job.finished_at is not None
+
+    def test_run_job_failure_marks_failed(self, db, task, queue, monkeypatch):
+        """Test run_job records the error when processing fails"""
+        def fail(self, task_id, request_id=None):
+            raise ValueError("boom")
+
+        monkeypatch.setattr("app.services.job_queue.TaskService.process_task", fail)
+        job = queue.enqueue(db, task.id)
+
+        status = queue.run_job(job.id, db)
+
+        assert status == TaskStatus.FAILED.value
+        db.refresh(job)
+        assert job.status == TaskStatus.FAILED.value
+        assert job.error_message == "boom"
+
+    def test_job_is_claimed_once(self, db, task, queue, monkeypatch):
+        """Test a job cannot be run twice"""
+        monkeypatch.setattr(
+            "app.services.job_queue.TaskService.process_task",
+            lambda self, task_id, request_id=None: None
+        )
+        job = queue.enqueue(db, task.id)
+
+        assert queue.run_job(job.id, db) == TaskStatus.COMPLETED.value
+        assert queue.run_job(job.id, db) is None
+
+    def test_recover_stale_jobs(self, db, task, queue):
+        """Test jobs stuck in PROCESSING are re-queued"""
+        job = Job(
+            id=str(uuid.uuid4()),
+            task_id=task.id,
+            status=TaskStatus.PROCESSING.value,
+            started_at=datetime.utcnow() - timedelta(days=1),
+        )
+        db.add(job)
+        db.commit()
+
+        assert queue.recover_stale_jobs() == 1
+        db.refresh(job)
+        assert job.status == TaskStatus.PENDING.value
+
+    def test_get_status(self, db, task, queue):
+        """Test get_status counts pending jobs"""
+        queue.enqueue(db, task.id)
+
+        status = queue.get_status()
+
+        assert status["workers"] == 1
+        assert status["running"] is False
+        assert status["pending"] == 1
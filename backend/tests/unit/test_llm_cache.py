@@ -0,0 +1,109 @@
+"""Unit tests for LLMResponseCache"""
+import pytest
+import threading
+import time
+
+from app.core.metrics import metrics_collector
+from app.services.llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache backed by a temporary SQLite file"""
+    return LLMResponseCache(db_path=str(tmp_path / "llm_cache.db"), ttl_seconds=60, max_entries=3, l1_max_entries=2)
+
+
+class TestLLMResponseCache:
+    """Test class for LLMResponseCache"""
+
+    def test_make_key_depends_on_request(self):
+        """Test keys differ by model, messages and sampling parameters"""
+        messages = [{"role": "user", "content": "estimate"}]
+        key = LLMResponseCache.make_key("gpt-4o-mini", messages, temperature=0.3)
+
+        assert key == LLMResponseCache.make_key("gpt-4o-mini", messages, temperature=0.3)
+        assert key != LLMResponseCache.make_key("gpt-4o", messages, temperature=0.3)
+        assert key != LLMResponseCache.make_key("gpt-4o-mini", messages, temperature=0.7)
+        assert key != LLMResponseCache.make_key("gpt-4o-mini", [{"role": "user", "content": "other"}], temperature=0.3)
+
+    def test_get_miss_then_hit(self, cache):
+        """Test miss before set and L1 hit after"""
+        assert cache.get("k") is None
+        cache.set("k", "value")
+
+        assert cache.get("k") == "value"
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["l1_hits"] == 1
+
+    def test_shared_sqlite_layer(self, cache):
+        """Test another cache instance on the same file sees the entry (L2 hit)"""
+        cache.set("k", "value")
+        other = LLMResponseCache(db_path=cache.db_path)
+
+        assert other.get("k") == "value"
+        assert other.get_stats()["l2_hits"] == 1
+
+    def test_expired_entry_is_miss(self, cache):
+        """Test entries past their TTL are not returned"""
+        cache.ttl_seconds = -1
+        cache.set("k", "value")
+
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self, cache):
+        """Test least recently used entries are evicted beyond max_entries"""
+        for key in ["a", "b", "c"]:
+            cache.set(key, key)
+            time.sleep(0.01)
+        cache._l1.clear()
+        cache.get("a")  # refresh "a"
+        time.sleep(0.01)
+        cache.set("d", "d")
+        cache._l1.clear()
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "a"
+        assert cache.get_stats()["entries"] == 3
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_l1_is_bounded(self, cache):
+        """Test memory layer keeps at most l1_max_entries"""
+        for key in ["a", "b", "c"]:
+            cache.set(key, key)
+
+        assert list(cache._l1.keys()) == ["b", "c"]
+
+    def test_clear(self, cache):
+        """Test clear removes entries and counters"""
+        cache.set("k", "value")
+        cache.get("k")
+        cache.clear()
+
+        assert cache.get("k") is None
+        assert cache.get_stats()["hits"] == 0
+
+    def test_stats_do_not_touch_sqlite(self, cache):
+        """Test get_stats reports counters without the lock or a SQLite query (/health stays constant-time)"""
+        for key in ["a", "b"]:
+            cache.set(key, key)
+        other = LLMResponseCache(db_path=cache.db_path)
+        other.get("a")  # opening the file loads the current count once
+        assert other.get_stats()["entries"] == 2
+
+        results = []
+        with cache._lock:
+            thread = threading.Thread(target=lambda: results.append(cache.get_stats()))
+            thread.start()
+            thread.join(timeout=1)
+
+        assert results and results[0]["entries"] == 2
+        cache.clear()
+        assert cache.get_stats()["entries"] == 0
+
+    def test_stats_reported_through_metrics(self):
+        """Test cache counters appear in the metrics summary"""
+        summary = metrics_collector.get_summary()
+
+        assert "hits" in summary["llm_cache"]
+        assert "misses" in summary["llm_cache"]
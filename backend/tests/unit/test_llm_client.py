@@ -0,0 +1,99 @@
+"""Unit tests for LLMClientRegistry"""
+import asyncio
+import pytest
+import httpx
+
+from app.core.metrics import metrics_collector
+from app.services.llm_client import LLMClientRegistry
+
+
+@pytest.fixture
+def registry():
+    """Fresh client registry"""
+    registry = LLMClientRegistry()
+    yield registry
+    registry.clear()
+
+
+class TestLLMClientRegistry:
+    """Test class for LLMClientRegistry"""
+
+    def test_client_is_shared_per_timeout(self, registry):
+        """Test the same client is returned for the same timeout profile"""
+        assert registry.get_client() is registry.get_client()
+        assert registry.get_client(timeout=10) is registry.get_client(timeout=10)
+        assert registry.get_client(timeout=10) is not registry.get_client()
+
+    def test_async_client_is_shared_per_loop(self, registry):
+        """Test async clients are shared within a loop but not across loops"""
+        async def get():
+            return registry.get_async_client()
+
+        first = registry.run_sync(get())
+        second = registry.run_sync(get())
+        assert first is second
+
+        other_loop = asyncio.new_event_loop()
+        try:
+            assert other_loop.run_until_complete(get()) is not first
+        finally:
+            other_loop.close()
+
+    def test_pool_settings_applied(self, registry, monkeypatch):
+        """Test connection pool limits come from settings"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "OPENAI_POOL_MAX_CONNECTIONS", 7)
+        monkeypatch.setattr(settings, "OPENAI_POOL_MAX_KEEPALIVE", 3)
+
+        registry.get_client()
+        _, http_client, _ = next(iter(registry._clients.values()))
+        pool = http_client._transport._pool
+
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+
+    def test_http2_falls_back_without_h2(self, registry, monkeypatch):
+        """Test HTTP/2 is disabled when the h2 package is missing"""
+        import builtins
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "OPENAI_HTTP2", True)
+
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name == "h2":
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+
+        assert registry._http2_enabled() is False
+
+    def test_stats_count_connection_reuse(self, registry):
+        """Test requests over one keep-alive connection are reported as reused"""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200))
+        from app.services.llm_client import _PoolStats
+
+        stats = _PoolStats()
+        hook = registry._sync_request_hook(stats)
+        with httpx.Client(transport=transport, event_hooks={"request": [hook]}) as client:
+            for _ in range(3):
+                client.get("https://example.invalid/")
+        # MockTransport never opens TCP connections; simulate one
+        stats.on_trace("connection.connect_tcp.complete")
+
+        registry._clients[99.0] = (None, httpx.Client(), stats)
+        result = registry.get_stats()
+
+        assert result["requests"] == 3
+        assert result["connections_opened"] == 1
+        assert result["connection_reuse_rate"] == pytest.approx(66.67)
+
+    def test_stats_reported_through_metrics(self):
+        """Test pool stats appear in the metrics summary"""
+        import app.services.llm_client  # noqa: F401 - registers the provider
+
+        summary = metrics_collector.get_summary()
+
+        assert "llm_connection_pool" in summary
+        assert "connection_reuse_rate" in summary["llm_connection_pool"]
@@ -1,10 +1,14 @@
 """Unit tests for metrics collection system"""
 import pytest
+from collections import deque
+
 from app.core.metrics import (
     MetricsCollector,
     APICallMetric,
     OpenAICallMetric,
     ErrorMetric,
+    Histogram,
+    QuantileSketch,
     metrics_collector
 )
 
@@ -344,6 +348,122 @@ class TestMetricsCollector:
         # Should have 500 total calls (5 threads * 100 calls)
         assert len(collector.api_calls) == 500
 
+    def test_recent_buffers_are_bounded(self, collector, monkeypatch):
+        """Test only the most recent records are kept, while totals cover all calls"""
+        monkeypatch.setattr(collector, "api_calls", deque(maxlen=10))
+        monkeypatch.setattr(collector, "errors", deque(maxlen=10))
+
+        for i in range(50):
+            collector.record_api_call(
+                endpoint="/api/v1/tasks",
+                method="GET",
+                status_code=200 if i % 2 == 0 else 500,
+                duration=1.0,
+                request_id=f"req-{i}"
+            )
+            collector.record_error(error_type="E", message=f"error {i}", request_id=f"req-{i}")
+
+        assert len(collector.api_calls) == 10
+        assert collector.api_calls[0].request_id == "req-40"
+
+        summary = collector.get_summary()
+        assert summary["total_api_calls"] == 50
+        assert summary["success_rate"] == 50.0
+        assert summary["total_errors"] == 50
+        assert summary["avg_response_time"] == 1.0
+
+        recent = collector.get_recent_errors(limit=3)
+        assert [e["message"] for e in recent] == ["error 47", "error 48", "error 49"]
+
+    def test_render_openmetrics(self, collector):
+        """Test OpenMetrics output for API and OpenAI histograms and counters"""
+        collector.record_api_call(
+            endpoint="/api/v1/tasks/abc",
+            method="GET",
+            status_code=200,
+            duration=0.2,
+            request_id="req-1",
+            route="/api/v1/tasks/{task_id}"
+        )
+        collector.record_openai_call(
+            model="gpt-4o-mini",
+            tokens=150,
+            duration=3.0,
+            success=True,
+            request_id="req-1",
+            operation="estimate",
+            input_tokens=100,
+            output_tokens=50
+        )
+
+        text = collector.render_openmetrics()
+
+        assert 'ai_estimator_http_requests_total{method="GET",route="/api/v1/tasks/{task_id}",status="200"} 1' in text
+        assert 'ai_estimator_http_request_duration_seconds_bucket{method="GET",route="/api/v1/tasks/{task_id}",le="0.1"} 0' in text
+        assert 'ai_estimator_http_request_duration_seconds_bucket{method="GET",route="/api/v1/tasks/{task_id}",le="0.25"} 1' in text
+        assert 'ai_estimator_openai_request_duration_seconds_count{operation="estimate",model="gpt-4o-mini"} 1' in text
+        assert 'ai_estimator_openai_tokens_total{operation="estimate",model="gpt-4o-mini",type="input"} 100' in text
+        assert 'ai_estimator_openai_tokens_total{operation="estimate",model="gpt-4o-mini",type="output"} 50' in text
+        assert text.endswith("# EOF\n")
+
+    def test_register_gauge(self, collector):
+        """Test registered gauges are read at render time"""
+        depth = {"value": 3}
+        collector.register_gauge("test_queue_depth", "Test gauge", lambda: depth["value"])
+        collector.register_gauge("test_labelled", "Test gauge", lambda: [({"name": 'a"b'}, 1)])
+
+        try:
+            text = collector.render_openmetrics()
+            assert "# TYPE ai_estimator_test_queue_depth gauge" in text
+            assert "ai_estimator_test_queue_depth 3" in text
+            assert 'ai_estimator_test_labelled{name="a\\"b"} 1' in text
+        finally:
+            collector._gauges.pop("test_queue_depth")
+            collector._gauges.pop("test_labelled")
+
+
+class TestHistogram:
+    """Test Histogram"""
+
+    def test_cumulative_buckets(self):
+        """Test buckets are cumulative and +Inf equals the count"""
+        histogram = Histogram((1.0, 5.0))
+        for value in (0.5, 1.0, 3.0, 10.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [("1.0", 2), ("5.0", 3), ("+Inf", 4)]
+        assert histogram.sum == 14.5
+
+
+class TestQuantileSketch:
+    """Test QuantileSketch"""
+
+    def test_empty(self):
+        """Test empty sketch returns 0"""
+        assert QuantileSketch().quantile(0.95) == 0.0
+
+    def test_relative_accuracy(self):
+        """Test quantiles are within the configured relative error"""
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        values = [0.001 * (i + 1) for i in range(10000)]
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            expected = values[int(len(values) * q)]
+            assert abs(sketch.quantile(q) - expected) <= expected * 0.01
+
+    def test_zero_values(self):
+        """Test zero durations are counted without a log bucket"""
+        sketch = QuantileSketch()
+        for _ in range(10):
+            sketch.add(0.0)
+        sketch.add(2.0)
+
+        assert sketch.count == 11
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(2.0, rel=0.01)
+
 
 class TestGlobalMetricsCollector:
     """Test global metrics_collector instance"""
@@ -331,3 +331,35 @@ class TestMessageModel:
         retrieved = db.query(Message).filter(Message.id == message.id).first()
         assert retrieved.created_at is not None
         assert isinstance(retrieved.created_at, datetime)
+
+
+class TestSQLiteMigration:
+    """Test upgrading a SQLite database created before the order column"""
+
+    def test_adds_missing_order_column(self, tmp_path):
+        """Test an old deliverables table gets the order column, idempotently"""
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.orm import sessionmaker
+        from app.db.database import Base, migrate_sqlite
+        from app.services.task_service import TaskService
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE deliverables (id VARCHAR(36) PRIMARY KEY, task_id VARCHAR(36) NOT NULL, "
+                "name VARCHAR(200) NOT NULL, description TEXT)"
+            ))
+            conn.execute(text("INSERT INTO deliverables VALUES ('d1', 't1', 'Old item', 'desc')"))
+        Base.metadata.create_all(bind=engine)
+
+        migrate_sqlite(engine)
+        migrate_sqlite(engine)
+
+        db = sessionmaker(bind=engine)()
+        try:
+            db.add(Task(id="t1", status=TaskStatus.COMPLETED.value))
+            db.commit()
+            assert TaskService(db).get_deliverables("t1") == [{"name": "Old item", "description": "desc"}]
+        finally:
+            db.close()
+            engine.dispose()
@@ -0,0 +1,138 @@
+"""Unit tests for ProposalStore"""
+import pytest
+import threading
+import time
+import uuid
+
+from app.models.task import Task, TaskStatus
+from app.services.chat_service import ChatService
+from app.services.proposal_store import ProposalStore
+
+
+def make_proposals(task_id, size=10):
+    """Proposals shaped like ChatService._generate_proposals output"""
+    return [
+        {
+            "id": f"proposal_{task_id}_1",
+            "description": "Reduce testing scope",
+            "new_estimates": [{"deliverable_name": "Item 1", "person_days": 5.0, "amount": 500000.0, "reasoning": "x" * size}],
+        }
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store backed by a temporary SQLite file"""
+    return ProposalStore(db_path=str(tmp_path / "proposals.db"), ttl_seconds=60, max_entries=3, max_bytes=100000)
+
+
+class TestProposalStore:
+    """Test class for ProposalStore"""
+
+    def test_set_and_get(self, store):
+        """Test proposals round-trip and unknown tasks return []"""
+        proposals = make_proposals("t1")
+        store.set("t1", proposals)
+
+        assert store.get("t1") == proposals
+        assert store.get("missing") == []
+
+    def test_set_replaces_previous_proposals(self, store):
+        """Test a task keeps only its latest proposals"""
+        store.set("t1", make_proposals("t1", size=1))
+        store.set("t1", make_proposals("t1", size=2))
+
+        assert store.get("t1") == make_proposals("t1", size=2)
+        assert store.get_stats()["entries"] == 1
+
+    def test_stats_track_writes_without_querying(self, store):
+        """Test entry and byte counters follow set/delete and get_stats needs neither the lock nor SQLite"""
+        store.set("t1", make_proposals("t1", size=100))
+        store.set("t2", make_proposals("t2", size=200))
+        store.delete_task("t1")
+        expected = store._connect().execute("SELECT COUNT(*), SUM(size) FROM proposals").fetchone()
+
+        results = []
+        with store._lock:
+            thread = threading.Thread(target=lambda: results.append(store.get_stats()))
+            thread.start()
+            thread.join(timeout=1)
+
+        assert results
+        assert (results[0]["entries"], results[0]["bytes"]) == tuple(expected)
+        store.clear()
+        assert store.get_stats()["bytes"] == 0
+
+    def test_shared_between_instances(self, store):
+        """Test another instance on the same file (another worker) sees the proposals"""
+        store.set("t1", make_proposals("t1"))
+        other = ProposalStore(db_path=store.db_path)
+
+        assert other.get("t1") == make_proposals("t1")
+
+    def test_expired_entry_is_not_returned(self, store):
+        """Test entries past their TTL are not returned"""
+        store.ttl_seconds = -1
+        store.set("t1", make_proposals("t1"))
+
+        assert store.get("t1") == []
+
+    def test_lru_eviction_by_count(self, store):
+        """Test least recently used tasks are evicted beyond max_entries"""
+        for task_id in ["a", "b", "c"]:
+            store.set(task_id, make_proposals(task_id))
+            time.sleep(0.01)
+        store.get("a")  # refresh "a"
+        time.sleep(0.01)
+        store.set("d", make_proposals("d"))
+
+        assert store.get("b") == []
+        assert store.get("a") != []
+        assert store.get_stats()["evictions"] == 1
+
+    def test_eviction_by_size(self, store):
+        """Test the total size bound evicts the oldest entries"""
+        store.max_bytes = 5000
+        for task_id in ["a", "b", "c"]:
+            store.set(task_id, make_proposals(task_id, size=2000))
+            time.sleep(0.01)
+
+        stats = store.get_stats()
+        assert stats["bytes"] <= 5000
+        assert store.get("a") == []
+        assert store.get("c") != []
+
+    def test_delete_task(self, store):
+        """Test a task's proposals are removed on deletion"""
+        store.set("t1", make_proposals("t1"))
+
+        assert store.delete_task("t1") is True
+        assert store.get("t1") == []
+        assert store.delete_task("t1") is False
+
+
+class TestProposalStoreIntegration:
+    """Test proposal storage through ChatService and task deletion"""
+
+    def test_apply_proposal_from_another_instance(self, db, isolated_proposal_store):
+        """Test a proposal cached by one ChatService can be applied by another"""
+        task_id = str(uuid.uuid4())
+        proposals = make_proposals(task_id)
+        ChatService(db)._cache_proposals(task_id, proposals)
+        isolated_proposal_store.close()  # a fresh connection, as in another worker
+
+        new_estimates = ChatService(db)._apply_proposal(task_id, proposals[0]["id"])
+
+        assert new_estimates == proposals[0]["new_estimates"]
+
+    def test_task_deletion_drops_proposals(self, client, db, isolated_proposal_store):
+        """Test DELETE /tasks/{id} removes the task's proposals"""
+        task_id = str(uuid.uuid4())
+        db.add(Task(id=task_id, status=TaskStatus.COMPLETED.value))
+        db.commit()
+        isolated_proposal_store.set(task_id, make_proposals(task_id))
+
+        response = client.delete(f"/api/v1/tasks/{task_id}")
+
+        assert response.status_code == 200
+        assert isolated_proposal_store.get(task_id) == []
@@ -0,0 +1,180 @@
+"""Unit tests for QuestionPrefetcher"""
+import asyncio
+import json
+import threading
+import pytest
+import uuid
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.models.task import Task, TaskStatus
+from app.models.task_question import TaskQuestion
+from app.services.question_prefetch import QuestionPrefetcher
+from app.services.question_service import QuestionService
+from app.services.task_service import TaskService
+from tests.conftest import TestingSessionLocal
+
+QUESTIONS = ["Q1?", "Q2?", "Q3?"]
+DELIVERABLES = [{"name": "Requirements Document", "description": "Define requirements"}]
+
+
+@pytest.fixture
+def task(db):
+    """Pending task"""
+    task = Task(id=str(uuid.uuid4()), status=TaskStatus.PENDING.value)
+    db.add(task)
+    db.commit()
+    return task
+
+
+@pytest.fixture
+def prefetcher():
+    """Prefetcher bound to the test database"""
+    prefetcher = QuestionPrefetcher(session_factory=TestingSessionLocal, workers=1)
+    yield prefetcher
+    prefetcher.shutdown()
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Fake question generation; records calls"""
+    calls = []
+
+    def fake_generate(self, deliverables, system_requirements, request_id=None, fallback=True):
+        calls.append(fallback)
+        return list(QUESTIONS)
+
+    monkeypatch.setattr(QuestionService, "__init__", lambda self: None)
+    monkeypatch.setattr(QuestionService, "generate_questions", fake_generate)
+    return calls
+
+
+class TestQuestionPrefetcher:
+    """Test class for QuestionPrefetcher"""
+
+    def test_start_stores_questions(self, db, task, prefetcher, generated):
+        """Test generated questions are stored on the task without default fallback"""
+        assert prefetcher.start(task.id, DELIVERABLES, "reqs").result(timeout=5) == QUESTIONS
+
+        assert TaskService(db).get_questions(task.id) == QUESTIONS
+        assert generated == [False]
+
+    def test_get_returns_stored_questions(self, db, task, prefetcher, generated):
+        """Test stored questions are returned"""
+        prefetcher.start(task.id, DELIVERABLES, "reqs").result(timeout=5)
+
+        questions = asyncio.run(prefetcher.get_questions(TaskService(db), task.id))
+
+        assert questions == QUESTIONS
+        assert prefetcher.get_stats()["served"] == 1
+
+    def test_get_waits_on_in_flight_generation(self, db, task, prefetcher, monkeypatch):
+        """Test a request arriving mid-generation waits for it"""
+        release = threading.Event()
+
+        def slow_generate(self, deliverables, system_requirements, request_id=None, fallback=True):
+            release.wait(5)
+            return list(QUESTIONS)
+
+        monkeypatch.setattr(QuestionService, "__init__", lambda self: None)
+        monkeypatch.setattr(QuestionService, "generate_questions", slow_generate)
+        prefetcher.start(task.id, DELIVERABLES, "reqs")
+        threading.Timer(0.1, release.set).start()
+
+        questions = asyncio.run(prefetcher.get_questions(TaskService(db), task.id, timeout=5))
+
+        assert questions == QUESTIONS
+        assert prefetcher.get_stats()["waited"] == 1
+
+    def test_wait_timeout_returns_none(self, db, task, prefetcher, monkeypatch):
+        """Test a slow generation is not waited on beyond the timeout"""
+        release = threading.Event()
+        monkeypatch.setattr(QuestionService, "__init__", lambda self: None)
+        monkeypatch.setattr(
+            QuestionService, "generate_questions",
+            lambda self, *args, **kwargs: release.wait(5) and list(QUESTIONS)
+        )
+        prefetcher.start(task.id, DELIVERABLES, "reqs")
+
+        try:
+            assert asyncio.run(prefetcher.get_questions(TaskService(db), task.id, timeout=0.05)) is None
+        finally:
+            release.set()
+
+    def test_failed_generation_is_not_stored(self, db, task, prefetcher, monkeypatch):
+        """Test LLM failures leave the request path to generate questions itself"""
+        def fail(self, *args, **kwargs):
+            raise RuntimeError("LLM unavailable")
+
+        monkeypatch.setattr(QuestionService, "__init__", lambda self: None)
+        monkeypatch.setattr(QuestionService, "generate_questions", fail)
+        future = prefetcher.start(task.id, DELIVERABLES, "reqs")
+
+        assert asyncio.run(prefetcher.get_questions(TaskService(db), task.id, timeout=5)) is None
+        assert isinstance(future.exception(timeout=5), RuntimeError)
+        assert TaskService(db).get_questions(task.id) == []
+        assert prefetcher.get_stats()["failed"] == 1
+
+    def test_unknown_task_returns_none(self, db, prefetcher):
+        """Test tasks without prefetched questions return None"""
+        assert asyncio.run(prefetcher.get_questions(TaskService(db), "missing")) is None
+
+    def test_deleted_task_gets_no_questions(self, db, task, prefetcher, monkeypatch):
+        """Test a task deleted mid-generation is not left with orphan questions"""
+        release = threading.Event()
+        monkeypatch.setattr(QuestionService, "__init__", lambda self: None)
+        monkeypatch.setattr(
+            QuestionService, "generate_questions",
+            lambda self, *args, **kwargs: release.wait(5) and list(QUESTIONS)
+        )
+        future = prefetcher.start(task.id, DELIVERABLES, "reqs")
+        db.delete(task)
+        db.commit()
+        release.set()
+
+        assert future.result(timeout=5) == QUESTIONS
+        assert db.query(TaskQuestion).filter(TaskQuestion.task_id == task.id).count() == 0
+
+
+    def test_save_questions_without_foreign_keys(self, db):
+        """Test questions for a missing task are not stored even when SQLite does not enforce foreign keys"""
+        db.execute(text("PRAGMA foreign_keys=OFF"))
+        try:
+            assert TaskService(db).save_questions("missing-task", QUESTIONS) is False
+            assert db.query(TaskQuestion).count() == 0
+        finally:
+            db.execute(text("PRAGMA foreign_keys=ON"))
+
+class TestQuestionPrefetchEndpoints:
+    """Test prefetching through POST /tasks and GET /tasks/{id}/questions"""
+
+    def test_questions_are_prefetched_at_task_creation(self, client, db, prefetcher, generated, monkeypatch):
+        """Test the question screen gets the prefetched questions without another LLM call"""
+        async def not_called(self, *args, **kwargs):
+            raise AssertionError("questions should have been prefetched")
+
+        monkeypatch.setattr(settings, "QUESTION_PREFETCH_ENABLED", True)
+        monkeypatch.setattr("app.api.v1.tasks.question_prefetcher", prefetcher)
+        monkeypatch.setattr(QuestionService, "generate_questions_async", not_called)
+
+        response = client.post("/api/v1/tasks", data={
+            "system_requirements": "Web-based estimation system",
+            "deliverables_json": json.dumps(DELIVERABLES),
+        })
+        assert response.status_code == 200
+        task_id = response.json()["id"]
+
+        response = client.get(f"/api/v1/tasks/{task_id}/questions")
+
+        assert response.status_code == 200
+        assert response.json() == QUESTIONS
+        assert generated == [False]
+
+    def test_task_deletion_drops_questions(self, client, db, task):
+        """Test DELETE /tasks/{id} removes stored questions"""
+        TaskService(db).save_questions(task.id, QUESTIONS)
+
+        response = client.delete(f"/api/v1/tasks/{task.id}")
+
+        assert response.status_code == 200
+        assert TaskService(db).get_questions(task.id) == []
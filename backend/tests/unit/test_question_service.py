@@ -56,3 +56,28 @@ class TestQuestionService:
         for question in result:
             assert isinstance(question, str)
             assert len(question) > 0
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_async_success(self, mock_openai, sample_deliverables, monkeypatch):
+        """Test async question generation uses the AsyncOpenAI client"""
+        class MockResponse:
+            class usage:
+                total_tokens = 30
+                prompt_tokens = 20
+                completion_tokens = 10
+
+            class _Choice:
+                class message:
+                    content = "Q1\nQ2\nQ3\nQ4"
+
+            choices = [_Choice]
+
+        async def mock_create(**kwargs):
+            return MockResponse
+
+        service = QuestionService()
+        monkeypatch.setattr(service.async_client.chat.completions, "create", mock_create)
+
+        result = await service.generate_questions_async(sample_deliverables, "Web system")
+
+        assert result == ["Q1", "Q2", "Q3"]
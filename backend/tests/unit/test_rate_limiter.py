@@ -1,8 +1,20 @@
 """Unit tests for rate limiter (TODO-9)"""
 import pytest
+import asyncio
+import multiprocessing
+import threading
+import sqlite3
 import time
 from datetime import datetime, timedelta
-from app.core.rate_limiter import RateLimiter
+from app.core.rate_limiter import (
+    MemoryRateLimitBackend, RateLimitBackend, RateLimiter, SQLiteRateLimitBackend, create_rate_limit_backend
+)
+
+
+def _check_many(db_path: str, count: int, results):
+    """Worker process: run `count` checks against a shared SQLite backend"""
+    limiter = RateLimiter(max_requests=50, window_seconds=3600, backend=SQLiteRateLimitBackend(db_path))
+    results.put(sum(limiter.check_limit("shared_client")[0] for _ in range(count)))
 
 
 class TestRateLimiter:
@@ -98,3 +110,170 @@ class TestRateLimiter:
         # Client 2 should still be allowed
         is_allowed, _ = limiter.check_limit(client2)
         assert is_allowed is True
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestGCRARateLimiter:
+    """Test GCRA behaviour (refill, cost, eviction)"""
+
+    def test_capacity_refills_gradually(self):
+        """Test one request of capacity returns every window / max_requests seconds"""
+        clock = FakeClock()
+        limiter = RateLimiter(max_requests=4, window_seconds=60, clock=clock)
+
+        for _ in range(4):
+            assert limiter.check_limit("client")[0] is True
+        is_allowed, retry_after = limiter.check_limit("client")
+        assert is_allowed is False
+        assert retry_after == 15
+
+        clock.now += 15
+        assert limiter.get_remaining("client") == 1
+        assert limiter.check_limit("client")[0] is True
+        assert limiter.check_limit("client")[0] is False
+
+    def test_request_cost(self):
+        """Test a request with a cost consumes several requests of capacity"""
+        clock = FakeClock()
+        limiter = RateLimiter(max_requests=10, window_seconds=60, clock=clock)
+
+        assert limiter.check_limit("client", cost=5) == (True, None)
+        assert limiter.get_remaining("client") == 5
+        assert limiter.check_limit("client", cost=5)[0] is True
+
+        # Rejected requests consume nothing
+        assert limiter.check_limit("client", cost=5)[0] is False
+        clock.now += 6
+        assert limiter.check_limit("client", cost=5)[0] is False
+        assert limiter.check_limit("client", cost=1)[0] is True
+
+    def test_cost_capped_at_max_requests(self):
+        """Test a cost above max_requests is still allowed with full capacity"""
+        limiter = RateLimiter(max_requests=2, window_seconds=60, clock=FakeClock())
+
+        assert limiter.check_limit("client", cost=5)[0] is True
+        assert limiter.get_remaining("client") == 0
+
+    def test_idle_clients_evicted(self):
+        """Test clients with a fully refilled allowance are dropped"""
+        clock = FakeClock()
+        limiter = RateLimiter(max_requests=10, window_seconds=60, clock=clock)
+        for i in range(100):
+            limiter.check_limit(f"client_{i}")
+        assert limiter.get_status()["active_clients"] == 100
+
+        clock.now += 6
+        assert limiter.get_status()["active_clients"] == 0
+        assert limiter.get_remaining("client_0") == 10
+
+
+class TestRateLimitMiddlewareRouteCost:
+    """Test per-route cost lookup in RateLimitMiddleware"""
+
+    def test_route_cost(self):
+        """Test method + path glob matching with default cost 1"""
+        from app.middleware.rate_limit import RateLimitMiddleware
+
+        middleware = RateLimitMiddleware(app=None, route_costs={
+            "POST /api/v1/tasks": 3,
+            "POST /api/v1/tasks/*/answers": 5,
+        })
+
+        assert middleware._route_cost("POST", "/api/v1/tasks") == 3
+        assert middleware._route_cost("POST", "/api/v1/tasks/abc/answers") == 5
+        assert middleware._route_cost("GET", "/api/v1/tasks/abc/status") == 1
+        assert middleware._route_cost("GET", "/api/v1/tasks") == 1
+
+    def test_blocking_backend_called_off_event_loop(self):
+        """Test a blocking backend (e.g. SQLite) is not called on the event loop thread"""
+        from app.middleware.rate_limit import RateLimitMiddleware
+
+        class RecordingBackend(MemoryRateLimitBackend):
+            def consume(self, *args):
+                self.thread = threading.get_ident()
+                return super().consume(*args)
+
+        middleware = RateLimitMiddleware(app=None, route_costs={})
+        backend = RecordingBackend()
+        middleware.rate_limiter = RateLimiter(max_requests=5, window_seconds=60, backend=backend)
+
+        asyncio.run(middleware._call_limiter(middleware.rate_limiter.check_limit, "client", 1))
+        assert backend.thread == threading.get_ident()
+
+        backend.blocking = True
+        asyncio.run(middleware._call_limiter(middleware.rate_limiter.check_limit, "client", 1))
+        assert backend.thread != threading.get_ident()
+
+
+class TestSQLiteRateLimitBackend:
+    """Test the SQLite backend shared by worker processes"""
+
+    def test_backend_interface_is_abstract(self):
+        """Test backends must implement every storage method"""
+        class PartialBackend(RateLimitBackend):
+            def consume(self, client_id, now, increment, limit):
+                return True, now
+
+        with pytest.raises(TypeError):
+            RateLimitBackend()
+        with pytest.raises(TypeError):
+            PartialBackend()
+        assert SQLiteRateLimitBackend.blocking is True
+        assert MemoryRateLimitBackend.blocking is False
+
+    def test_limit_shared_between_limiters(self, tmp_path):
+        """Test two limiters (e.g. two workers) share one allowance"""
+        path = str(tmp_path / "rate_limit.db")
+        worker_a = RateLimiter(max_requests=3, window_seconds=60, backend=SQLiteRateLimitBackend(path))
+        worker_b = RateLimiter(max_requests=3, window_seconds=60, backend=SQLiteRateLimitBackend(path))
+
+        assert worker_a.check_limit("client")[0] is True
+        assert worker_b.check_limit("client")[0] is True
+        assert worker_a.check_limit("client")[0] is True
+        assert worker_b.check_limit("client")[0] is False
+        assert worker_a.get_remaining("client") == 0
+
+        worker_b.reset_client("client")
+        assert worker_a.get_remaining("client") == 3
+        assert worker_a.get_status()["backend"] == "sqlite"
+
+    def test_concurrent_processes_enforce_limit(self, tmp_path):
+        """Test the limit holds exactly across processes"""
+        path = str(tmp_path / "rate_limit.db")
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [context.Process(target=_check_many, args=(path, 30, results)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        allowed = sum(results.get(timeout=60) for _ in processes)
+        for process in processes:
+            process.join(timeout=60)
+
+        assert allowed == 50
+
+    def test_fails_open_on_storage_error(self, tmp_path):
+        """Test a backend error lets the request through"""
+        class BrokenBackend(SQLiteRateLimitBackend):
+            def consume(self, *args):
+                raise sqlite3.OperationalError("database is locked")
+
+        limiter = RateLimiter(max_requests=1, window_seconds=60, backend=BrokenBackend(str(tmp_path / "x.db")))
+
+        assert limiter.check_limit("client") == (True, None)
+
+    def test_create_backend(self, tmp_path, monkeypatch):
+        """Test backend selection from settings"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "RATE_LIMIT_DB_PATH", str(tmp_path / "rate_limit.db"))
+
+        assert create_rate_limit_backend("sqlite").name == "sqlite"
+        assert create_rate_limit_backend("memory").name == "memory"
@@ -1,9 +1,11 @@
 """Unit tests for RetryService"""
+import asyncio
 import pytest
 import time
 from unittest.mock import Mock, patch
 from app.services.retry_service import (
     retry_with_exponential_backoff,
+    async_retry_with_exponential_backoff,
     retry_with_custom_backoff
 )
 
@@ -198,3 +200,58 @@ class TestRetryService:
 
         result = function_with_args(1, 2, z=4)
         assert result == 7
+
+    @pytest.mark.asyncio
+    async def test_async_retry_success_after_retries(self):
+        """Test async retry succeeds after transient failures"""
+        call_count = 0
+
+        @async_retry_with_exponential_backoff(max_retries=3, initial_delay=0.01, backoff_factor=2.0)
+        async def function_succeeds_on_third_attempt():
+            nonlocal call_count
+            call_count += 1
+            if call_count < 3:
+                raise Exception("Temporary error")
+            return "success"
+
+        result = await function_succeeds_on_third_attempt()
+
+        assert result == "success"
+        assert call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_async_retry_failure_after_max_retries(self):
+        """Test async retry raises after reaching max retries"""
+        call_count = 0
+
+        @async_retry_with_exponential_backoff(max_retries=2, initial_delay=0.01)
+        async def always_failing_function():
+            nonlocal call_count
+            call_count += 1
+            raise ValueError("Permanent error")
+
+        with pytest.raises(ValueError, match="Permanent error"):
+            await always_failing_function()
+
+        assert call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_retry_does_not_block_event_loop(self):
+        """Test backoff delay lets other coroutines run"""
+        ticks = []
+
+        @async_retry_with_exponential_backoff(max_retries=2, initial_delay=0.05)
+        async def fails_once():
+            if not ticks:
+                ticks.append("failed")
+                raise Exception("Temporary error")
+            return "success"
+
+        async def ticker():
+            await asyncio.sleep(0.01)
+            ticks.append("tick")
+
+        result, _ = await asyncio.gather(fails_once(), ticker())
+
+        assert result == "success"
+        assert ticks == ["failed", "tick"]
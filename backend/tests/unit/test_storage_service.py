@@ -0,0 +1,119 @@
+"""Unit tests for FileStorage"""
+import io
+import os
+import time
+import uuid
+
+import pytest
+from fastapi import UploadFile
+
+from app.models.task import Task, TaskStatus
+from app.services.storage_service import FileStorage, UploadTooLargeError, atomic_path
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """File storage rooted in a temporary directory"""
+    return FileStorage(root=str(tmp_path))
+
+
+def make_upload(content: bytes, filename: str = "requirements.xlsx") -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+def age_blob(path: str, seconds: float = 3600) -> None:
+    """Move a blob's mtime into the past (beyond the reuse grace period)"""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestFileStorage:
+    """Test class for FileStorage"""
+
+    @pytest.mark.asyncio
+    async def test_identical_uploads_are_deduplicated(self, storage):
+        """Test the same content is stored once under its SHA-256"""
+        first = await storage.save_upload(make_upload(b"same bytes"), max_bytes=1024)
+        second = await storage.save_upload(make_upload(b"same bytes", "other.xlsx"), max_bytes=1024)
+        third = await storage.save_upload(make_upload(b"different"), max_bytes=1024)
+
+        assert first == second
+        assert first != third
+        assert os.path.basename(first).endswith(".xlsx")
+        assert os.listdir(os.path.join(storage.root, "tmp")) == []
+
+    @pytest.mark.asyncio
+    async def test_upload_too_large(self, storage):
+        """Test oversized uploads are rejected and leave no files behind"""
+        with pytest.raises(UploadTooLargeError):
+            await storage.save_upload(make_upload(b"x" * 100), max_bytes=10)
+
+        assert os.listdir(os.path.join(storage.root, "tmp")) == []
+        assert not os.path.exists(os.path.join(storage.root, "blobs"))
+
+    def test_atomic_path_discards_partial_write(self, tmp_path):
+        """Test a failed write never appears at the final path"""
+        target = tmp_path / "result.xlsx"
+
+        with pytest.raises(RuntimeError):
+            with atomic_path(str(target)) as tmp:
+                with open(tmp, "wb") as f:
+                    f.write(b"partial")
+                raise RuntimeError("boom")
+
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_remove_task_files_keeps_shared_blob(self, db, storage):
+        """Test a blob is removed only when the last referencing task is deleted"""
+        blob = await storage.save_upload(make_upload(b"shared"), max_bytes=1024)
+        age_blob(blob)
+        tasks = [Task(id=str(uuid.uuid4()), excel_file_path=blob, status=TaskStatus.COMPLETED.value) for _ in range(2)]
+        db.add_all(tasks)
+        db.commit()
+        result = os.path.join(storage.task_dir(tasks[0].id), "result.xlsx")
+        open(result, "wb").close()
+
+        db.delete(tasks[0])
+        db.commit()
+        assert storage.remove_task_files(db, tasks[0].id, blob) == 1
+        assert not os.path.exists(result)
+        assert os.path.exists(blob)
+
+        db.delete(tasks[1])
+        db.commit()
+        storage.remove_task_files(db, tasks[1].id, blob)
+        assert not os.path.exists(blob)
+
+    @pytest.mark.asyncio
+    async def test_recently_deduplicated_blob_is_kept(self, db, storage):
+        """Test a blob another upload just deduplicated onto survives its last task's deletion"""
+        blob = await storage.save_upload(make_upload(b"shared"), max_bytes=1024)
+        age_blob(blob)
+        task = Task(id=str(uuid.uuid4()), excel_file_path=blob, status=TaskStatus.COMPLETED.value)
+        db.add(task)
+        db.commit()
+
+        # A concurrent create_task dedups onto the blob but has not committed its task yet
+        assert await storage.save_upload(make_upload(b"shared"), max_bytes=1024) == blob
+        db.delete(task)
+        db.commit()
+        storage.remove_task_files(db, task.id, blob)
+
+        assert os.path.exists(blob)
+
+    @pytest.mark.asyncio
+    async def test_sweep_removes_only_unreferenced_blobs(self, db, storage):
+        """Test the sweeper collects unreferenced blobs past the grace period"""
+        kept = await storage.save_upload(make_upload(b"kept"), max_bytes=1024)
+        orphan = await storage.save_upload(make_upload(b"orphan"), max_bytes=1024)
+        fresh = await storage.save_upload(make_upload(b"fresh"), max_bytes=1024)
+        age_blob(kept)
+        age_blob(orphan)
+        db.add(Task(id=str(uuid.uuid4()), excel_file_path=kept, status=TaskStatus.COMPLETED.value))
+        db.commit()
+
+        assert storage.sweep_blobs(db) == 1
+        assert os.path.exists(kept)
+        assert not os.path.exists(orphan)
+        assert os.path.exists(fresh)
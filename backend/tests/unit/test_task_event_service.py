@@ -0,0 +1,51 @@
+"""Unit tests for TaskEventService"""
+import json
+import uuid
+
+import pytest
+
+from app.models.task import Task, TaskStatus
+from app.services.task_event_service import TaskEventService
+
+
+@pytest.fixture
+def task(db):
+    """Processing task"""
+    task = Task(id=str(uuid.uuid4()), status=TaskStatus.PROCESSING.value)
+    db.add(task)
+    db.commit()
+    return task
+
+
+class TestTaskEventService:
+    """Test class for TaskEventService"""
+
+    def test_publish_and_get_events(self, db, task):
+        """Test events are stored as JSON and returned in order"""
+        service = TaskEventService(db)
+        service.publish(task.id, "status", {"status": "processing", "total": 2})
+        service.publish(task.id, "estimate", {"index": 0, "estimate": {"deliverable_name": "要件定義書"}})
+
+        events = service.get_events(task.id)
+
+        assert [e.event_type for e in events] == ["status", "estimate"]
+        assert json.loads(events[1].data)["estimate"]["deliverable_name"] == "要件定義書"
+
+    def test_get_events_after_id(self, db, task):
+        """Test after_id skips already delivered events"""
+        service = TaskEventService(db)
+        for i in range(3):
+            service.publish(task.id, "estimate", {"index": i})
+
+        first = service.get_events(task.id)[0]
+        rest = service.get_events(task.id, after_id=first.id)
+
+        assert [json.loads(e.data)["index"] for e in rest] == [1, 2]
+
+    def test_publish_without_commit(self, db, task):
+        """Test commit=False leaves the event in the caller's transaction"""
+        service = TaskEventService(db)
+        service.publish(task.id, "completed", {"totals": {}}, commit=False)
+        db.rollback()
+
+        assert service.get_events(task.id) == []
@@ -0,0 +1,53 @@
+"""Unit tests for TaskService"""
+import uuid
+
+import pytest
+
+from app.models.deliverable import Deliverable
+from app.models.task import Task, TaskStatus
+from app.services.input_service import InputService
+from app.services.task_service import TaskService
+
+
+class TestTaskDeliverables:
+    """Test deliverables are parsed once at task creation"""
+
+    def test_create_task_stores_deliverables(self, db, sample_excel_file):
+        """Test create_task persists parsed deliverables in input order"""
+        task = TaskService(db).create_task(sample_excel_file, "Test system")
+
+        rows = db.query(Deliverable).filter(Deliverable.task_id == task.id).order_by(Deliverable.order).all()
+        assert [r.name for r in rows] == ["要件定義書", "基本設計書", "詳細設計書"]
+
+    def test_get_deliverables_does_not_reparse(self, db, sample_excel_file, monkeypatch):
+        """Test later stages read stored deliverables instead of the file"""
+        service = TaskService(db)
+        task = service.create_task(sample_excel_file, "Test system")
+
+        def fail(path):
+            raise AssertionError("input file parsed again")
+
+        monkeypatch.setattr(InputService, "load_excel_data", staticmethod(fail))
+
+        deliverables = service.get_deliverables(task.id)
+        assert [d["name"] for d in deliverables] == ["要件定義書", "基本設計書", "詳細設計書"]
+        assert deliverables[0]["description"] == "システム全体の要件を定義する文書"
+
+    def test_create_task_with_given_deliverables(self, db, monkeypatch):
+        """Test deliverables passed in (web form) are stored without reading the file"""
+        monkeypatch.setattr(InputService, "load_deliverables", staticmethod(lambda path: pytest.fail("parsed")))
+
+        task = TaskService(db).create_task("unused.xlsx", None, deliverables=[{"name": "画面設計書", "description": ""}])
+
+        assert TaskService(db).get_deliverables(task.id) == [{"name": "画面設計書", "description": ""}]
+
+    def test_get_deliverables_backfills_legacy_task(self, db, sample_excel_file):
+        """Test tasks created without stored deliverables are parsed once and saved"""
+        task = Task(id=str(uuid.uuid4()), excel_file_path=sample_excel_file, status=TaskStatus.PENDING.value)
+        db.add(task)
+        db.commit()
+
+        deliverables = TaskService(db).get_deliverables(task.id)
+
+        assert len(deliverables) == 3
+        assert db.query(Deliverable).filter(Deliverable.task_id == task.id).count() == 3
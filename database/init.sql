@@ -20,9 +20,13 @@ CREATE TABLE IF NOT EXISTS estimator.deliverables (
     id VARCHAR(36) PRIMARY KEY,
     task_id VARCHAR(36) NOT NULL REFERENCES estimator.tasks(id) ON DELETE CASCADE,
     name VARCHAR(200) NOT NULL,
-    description TEXT
+    description TEXT,
+    "order" INTEGER NOT NULL DEFAULT 0
 );
 
+-- 既存環境向け: 成果物の並び順カラム（アップロード時に一度だけ解析して保存）
+ALTER TABLE estimator.deliverables ADD COLUMN IF NOT EXISTS "order" INTEGER NOT NULL DEFAULT 0;
+
 -- 見積りテーブル
 CREATE TABLE IF NOT EXISTS estimator.estimates (
     id VARCHAR(36) PRIMARY KEY,
@@ -43,10 +47,45 @@ CREATE TABLE IF NOT EXISTS estimator.qa_pairs (
     "order" INTEGER NOT NULL
 );
 
+-- 生成済み質問テーブル（タスク作成時に先行生成した質問）
+CREATE TABLE IF NOT EXISTS estimator.task_questions (
+    id VARCHAR(36) PRIMARY KEY,
+    task_id VARCHAR(36) NOT NULL REFERENCES estimator.tasks(id) ON DELETE CASCADE,
+    question TEXT NOT NULL,
+    "order" INTEGER NOT NULL
+);
+
+-- ジョブテーブル（見積り処理のバックグラウンドキュー）
+CREATE TABLE IF NOT EXISTS estimator.jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    task_id VARCHAR(36) NOT NULL REFERENCES estimator.tasks(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    request_id VARCHAR(36),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- タスクイベントテーブル（見積り進捗のSSE配信用）
+CREATE TABLE IF NOT EXISTS estimator.task_events (
+    id BIGSERIAL PRIMARY KEY,
+    task_id VARCHAR(36) NOT NULL REFERENCES estimator.tasks(id) ON DELETE CASCADE,
+    event_type VARCHAR(20) NOT NULL,
+    data TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
 -- インデックス作成
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON estimator.tasks(status);
 CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON estimator.tasks(created_at);
 CREATE INDEX IF NOT EXISTS idx_deliverables_task_id ON estimator.deliverables(task_id);
+CREATE INDEX IF NOT EXISTS idx_deliverables_order ON estimator.deliverables(task_id, "order");
 CREATE INDEX IF NOT EXISTS idx_estimates_task_id ON estimator.estimates(task_id);
 CREATE INDEX IF NOT EXISTS idx_qa_pairs_task_id ON estimator.qa_pairs(task_id);
 CREATE INDEX IF NOT EXISTS idx_qa_pairs_order ON estimator.qa_pairs(task_id, "order");
+CREATE INDEX IF NOT EXISTS idx_task_questions_task_id ON estimator.task_questions(task_id, "order");
+CREATE INDEX IF NOT EXISTS idx_jobs_task_id ON estimator.jobs(task_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON estimator.jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_task_events_task_id ON estimator.task_events(task_id, id);